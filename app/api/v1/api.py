@@ -1,11 +1,16 @@
 from fastapi import APIRouter
-from app.api.v1.endpoints import colleges
+from app.api.v1.endpoints import colleges, faculties, academics, scholarships, branches, exports, predictor, exams, net_cost
 
 api_router = APIRouter()
 
 api_router.include_router(colleges.router, prefix="/colleges", tags=["colleges"])
+api_router.include_router(colleges.collection_router, tags=["colleges"])
 # api_router.include_router(courses.router, prefix="/courses", tags=["courses"])
-# api_router.include_router(faculties.router, prefix="/faculties", tags=["faculties"])
-# api_router.include_router(academics.router, prefix="/academics", tags=["academics"])
-# api_router.include_router(scholarships.router, prefix="/scholarships", tags=["scholarships"])
-# api_router.include_router(branches.router, prefix="/branches", tags=["branches"])
\ No newline at end of file
+api_router.include_router(faculties.router, prefix="/faculties", tags=["faculties"])
+api_router.include_router(academics.router, prefix="/academics", tags=["academics"])
+api_router.include_router(scholarships.router, prefix="/scholarships", tags=["scholarships"])
+api_router.include_router(branches.router, prefix="/branches", tags=["branches"])
+api_router.include_router(exports.router, prefix="/exports", tags=["exports"])
+api_router.include_router(predictor.router, prefix="/predict", tags=["predictor"])
+api_router.include_router(exams.router, prefix="/exams", tags=["exams"])
+api_router.include_router(net_cost.router, prefix="/net-cost", tags=["net-cost"])
\ No newline at end of file
@@ -1,8 +1,12 @@
-from fastapi import APIRouter, HTTPException, Query
+import asyncio
+from fastapi import APIRouter, HTTPException, Query, Depends
+from app.core.auth_dependency import require_admin
 from typing import List, Optional
 from beanie import PydanticObjectId
 from app.models.academics import AcademicStream, AcademicCourse
 from app.models.faculty import Faculty
+from app.services.pagination import paginate, InvalidCursorError
+from app.services.loader import Loaders, get_loaders
 from app.schemas.academics import (
     AcademicStreamCreate,
     AcademicStreamUpdate,
@@ -17,7 +21,7 @@ from app.schemas.academics import (
 router = APIRouter()
 
 # Academic Stream endpoints
-@router.post("/streams/", response_model=AcademicStreamResponse, status_code=201)
+@router.post("/streams/", response_model=AcademicStreamResponse, status_code=201, dependencies=[Depends(require_admin)])
 async def create_academic_stream(stream_data: AcademicStreamCreate):
     """Create a new academic stream"""
     try:
@@ -35,12 +39,11 @@ async def create_academic_stream(stream_data: AcademicStreamCreate):
 async def get_academic_streams(
     page: int = Query(1, ge=1, description="Page number"),
     size: int = Query(10, ge=1, le=100, description="Page size"),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page's next_cursor (keyset pagination)"),
     search: Optional[str] = Query(None, description="Search by title or code")
 ):
     """Get list of academic streams with pagination and filters"""
     try:
-        skip = (page - 1) * size
-        
         # Build query filters
         query_filter = {}
         if search:
@@ -50,11 +53,9 @@ async def get_academic_streams(
                 {"description": {"$regex": search, "$options": "i"}}
             ]
         
-        # Get total count
-        total = await AcademicStream.find(query_filter).count()
-        
-        # Get streams with pagination
-        streams = await AcademicStream.find(query_filter).skip(skip).limit(size).to_list()
+        # Get streams by page number, or after the cursor when one is given
+        result = await paginate(AcademicStream, query_filter, page, size, cursor)
+        streams = result.items
         
         stream_responses = []
         for stream in streams:
@@ -64,10 +65,13 @@ async def get_academic_streams(
         
         return AcademicStreamListResponse(
             streams=stream_responses,
-            total=total,
+            total=result.total,
             page=page,
-            size=size
+            size=size,
+            next_cursor=result.next_cursor
         )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching academic streams: {str(e)}")
 
@@ -90,7 +94,7 @@ async def get_academic_stream(stream_id: str):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching academic stream: {str(e)}")
 
-@router.put("/streams/{stream_id}", response_model=AcademicStreamResponse)
+@router.put("/streams/{stream_id}", response_model=AcademicStreamResponse, dependencies=[Depends(require_admin)])
 async def update_academic_stream(stream_id: str, stream_data: AcademicStreamUpdate):
     """Update an academic stream"""
     try:
@@ -114,7 +118,7 @@ async def update_academic_stream(stream_id: str, stream_data: AcademicStreamUpda
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error updating academic stream: {str(e)}")
 
-@router.delete("/streams/{stream_id}", status_code=204)
+@router.delete("/streams/{stream_id}", status_code=204, dependencies=[Depends(require_admin)])
 async def delete_academic_stream(stream_id: str):
     """Delete an academic stream"""
     try:
@@ -133,34 +137,42 @@ async def delete_academic_stream(stream_id: str):
         raise HTTPException(status_code=500, detail=f"Error deleting academic stream: {str(e)}")
 
 # Academic Course endpoints
-@router.post("/courses/", response_model=AcademicCourseResponse, status_code=201)
-async def create_academic_course(course_data: AcademicCourseCreate):
+@router.post("/courses/", response_model=AcademicCourseResponse, status_code=201, dependencies=[Depends(require_admin)])
+async def create_academic_course(
+    course_data: AcademicCourseCreate,
+    loaders: Loaders = Depends(get_loaders)
+):
     """Create a new academic course"""
     try:
         course_dict = course_data.model_dump()
         
-        # Handle academic stream linkage
+        # Validate every linked id before loading any of them
         stream_id = course_dict.pop('academic_stream_id')
         if not PydanticObjectId.is_valid(stream_id):
             raise HTTPException(status_code=400, detail="Invalid academic stream ID")
         
-        stream = await AcademicStream.get(PydanticObjectId(stream_id))
+        faculty_id = course_dict.pop('faculty_id', None)
+        if faculty_id and not PydanticObjectId.is_valid(faculty_id):
+            raise HTTPException(status_code=400, detail="Invalid faculty ID")
+        
+        # One query per model, both in flight together
+        stream, faculties = await asyncio.gather(
+            loaders.load(AcademicStream, PydanticObjectId(stream_id)),
+            loaders.load_many(Faculty, [PydanticObjectId(faculty_id)] if faculty_id else [])
+        )
+        
+        # Handle academic stream linkage
         if not stream:
             raise HTTPException(status_code=404, detail="Academic stream not found")
         
         course_dict['academic_stream'] = stream
         
         # Handle faculty linkage if provided
-        faculty_id = course_dict.pop('faculty_id', None)
         if faculty_id:
-            if not PydanticObjectId.is_valid(faculty_id):
-                raise HTTPException(status_code=400, detail="Invalid faculty ID")
-            
-            faculty = await Faculty.get(PydanticObjectId(faculty_id))
-            if not faculty:
+            if not faculties[0]:
                 raise HTTPException(status_code=404, detail="Faculty not found")
             
-            course_dict['faculty'] = faculty
+            course_dict['faculty'] = faculties[0]
         
         course = AcademicCourse(**course_dict)
         await course.create()
@@ -180,6 +192,7 @@ async def create_academic_course(course_data: AcademicCourseCreate):
 async def get_academic_courses(
     page: int = Query(1, ge=1, description="Page number"),
     size: int = Query(10, ge=1, le=100, description="Page size"),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page's next_cursor (keyset pagination)"),
     search: Optional[str] = Query(None, description="Search by title or course code"),
     stream_id: Optional[str] = Query(None, description="Filter by academic stream ID"),
     faculty_id: Optional[str] = Query(None, description="Filter by faculty ID"),
@@ -188,8 +201,6 @@ async def get_academic_courses(
 ):
     """Get list of academic courses with pagination and filters"""
     try:
-        skip = (page - 1) * size
-        
         # Build query filters
         query_filter = {}
         if search:
@@ -211,11 +222,9 @@ async def get_academic_courses(
         if semester:
             query_filter["semester"] = semester
         
-        # Get total count
-        total = await AcademicCourse.find(query_filter).count()
-        
-        # Get courses with pagination
-        courses = await AcademicCourse.find(query_filter).skip(skip).limit(size).to_list()
+        # Get courses by page number, or after the cursor when one is given
+        result = await paginate(AcademicCourse, query_filter, page, size, cursor)
+        courses = result.items
         
         course_responses = []
         for course in courses:
@@ -227,12 +236,15 @@ async def get_academic_courses(
         
         return AcademicCourseListResponse(
             courses=course_responses,
-            total=total,
+            total=result.total,
             page=page,
-            size=size
+            size=size,
+            next_cursor=result.next_cursor
         )
     except HTTPException:
         raise
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching academic courses: {str(e)}")
 
@@ -258,43 +270,51 @@ async def get_academic_course(course_id: str):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching academic course: {str(e)}")
 
-@router.put("/courses/{course_id}", response_model=AcademicCourseResponse)
-async def update_academic_course(course_id: str, course_data: AcademicCourseUpdate):
+@router.put("/courses/{course_id}", response_model=AcademicCourseResponse, dependencies=[Depends(require_admin)])
+async def update_academic_course(
+    course_id: str,
+    course_data: AcademicCourseUpdate,
+    loaders: Loaders = Depends(get_loaders)
+):
     """Update an academic course"""
     try:
         if not PydanticObjectId.is_valid(course_id):
             raise HTTPException(status_code=400, detail="Invalid course ID")
         
-        course = await AcademicCourse.get(PydanticObjectId(course_id))
-        if not course:
-            raise HTTPException(status_code=404, detail="Academic course not found")
-        
         # Update only provided fields
         update_data = course_data.model_dump()
         
-        # Handle academic stream linkage if provided
+        # Validate every linked id before loading any of them
         stream_id = update_data.pop('academic_stream_id', None)
+        if stream_id and not PydanticObjectId.is_valid(stream_id):
+            raise HTTPException(status_code=400, detail="Invalid academic stream ID")
+        
+        faculty_id = update_data.pop('faculty_id', None)
+        if faculty_id and not PydanticObjectId.is_valid(faculty_id):
+            raise HTTPException(status_code=400, detail="Invalid faculty ID")
+        
+        # The course and its new links, one query per model, all in flight together
+        course, streams, faculties = await asyncio.gather(
+            loaders.load(AcademicCourse, PydanticObjectId(course_id)),
+            loaders.load_many(AcademicStream, [PydanticObjectId(stream_id)] if stream_id else []),
+            loaders.load_many(Faculty, [PydanticObjectId(faculty_id)] if faculty_id else [])
+        )
+        if not course:
+            raise HTTPException(status_code=404, detail="Academic course not found")
+        
+        # Handle academic stream linkage if provided
         if stream_id:
-            if not PydanticObjectId.is_valid(stream_id):
-                raise HTTPException(status_code=400, detail="Invalid academic stream ID")
-            
-            stream = await AcademicStream.get(PydanticObjectId(stream_id))
-            if not stream:
+            if not streams[0]:
                 raise HTTPException(status_code=404, detail="Academic stream not found")
             
-            update_data['academic_stream'] = stream
+            update_data['academic_stream'] = streams[0]
         
         # Handle faculty linkage if provided
-        faculty_id = update_data.pop('faculty_id', None)
         if faculty_id:
-            if not PydanticObjectId.is_valid(faculty_id):
-                raise HTTPException(status_code=400, detail="Invalid faculty ID")
-            
-            faculty = await Faculty.get(PydanticObjectId(faculty_id))
-            if not faculty:
+            if not faculties[0]:
                 raise HTTPException(status_code=404, detail="Faculty not found")
             
-            update_data['faculty'] = faculty
+            update_data['faculty'] = faculties[0]
         
         if update_data:
             await course.set(update_data)
@@ -310,7 +330,7 @@ async def update_academic_course(course_id: str, course_data: AcademicCourseUpda
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error updating academic course: {str(e)}")
 
-@router.delete("/courses/{course_id}", status_code=204)
+@router.delete("/courses/{course_id}", status_code=204, dependencies=[Depends(require_admin)])
 async def delete_academic_course(course_id: str):
     """Delete an academic course"""
     try:
@@ -1,10 +1,17 @@
-from fastapi import APIRouter, HTTPException, Query
+import asyncio
+from fastapi import APIRouter, HTTPException, Query, Depends
+from app.core.auth_dependency import require_admin
 from typing import List, Optional
-from beanie import PydanticObjectId
+from beanie import PydanticObjectId, Link
 from app.models.junction import CollegeJunction
 from app.models.college import College
 from app.models.academics import AcademicStream
 from app.models.faculty import Faculty
+from app.services.pagination import InvalidCursorError
+from app.services.change_feed import change_feed, BRANCH, UPSERT, DELETE
+from app.services.loader import Loaders, get_loaders
+from app.services.branch_service import BranchService, InvalidExpandError, parse_expand
+from app.services.cutoff_table import exam_key
 from app.schemas.junction import (
     CollegeJunctionCreate,
     CollegeJunctionUpdate,
@@ -14,46 +21,64 @@ from app.schemas.junction import (
 
 router = APIRouter()
 
-@router.post("/", response_model=CollegeJunctionResponse, status_code=201)
-async def create_college_branch(branch_data: CollegeJunctionCreate):
+def check_entrance_exams(entries: List[dict], college: College, label: str) -> None:
+    """Cutoffs and seat matrix entries can only be for the college's entrance exams."""
+    exams = {exam_key(exam) for exam in college.entrance_exams or []}
+    for entry in entries:
+        if exam_key(entry["exam"]) not in exams:
+            raise HTTPException(
+                status_code=400,
+                detail=f"{label} exam {entry['exam']} is not one of the college's entrance exams"
+            )
+
+@router.post("/", response_model=CollegeJunctionResponse, status_code=201, dependencies=[Depends(require_admin)])
+async def create_college_branch(
+    branch_data: CollegeJunctionCreate,
+    loaders: Loaders = Depends(get_loaders)
+):
     """Create a new college branch (college-stream junction)"""
     try:
         branch_dict = branch_data.model_dump()
         
-        # Handle college linkage
+        # Validate every linked id before loading any of them
         college_id = branch_dict.pop('college_id')
         if not PydanticObjectId.is_valid(college_id):
             raise HTTPException(status_code=400, detail="Invalid college ID")
         
-        college = await College.get(PydanticObjectId(college_id))
+        stream_id = branch_dict.pop('academic_stream_id')
+        if not PydanticObjectId.is_valid(stream_id):
+            raise HTTPException(status_code=400, detail="Invalid academic stream ID")
+        
+        faculty_ids = branch_dict.pop('faculty_ids', [])
+        for faculty_id in faculty_ids:
+            if not PydanticObjectId.is_valid(faculty_id):
+                raise HTTPException(status_code=400, detail=f"Invalid faculty ID: {faculty_id}")
+        
+        # One query per model, all in flight together
+        college, stream, faculties = await asyncio.gather(
+            loaders.load(College, PydanticObjectId(college_id)),
+            loaders.load(AcademicStream, PydanticObjectId(stream_id)),
+            loaders.load_many(Faculty, [PydanticObjectId(faculty_id) for faculty_id in faculty_ids])
+        )
+        
+        # Handle college linkage
         if not college:
             raise HTTPException(status_code=404, detail="College not found")
         
         branch_dict['college'] = college
+        check_entrance_exams(branch_dict.get('cutoffs') or [], college, "Cutoff")
+        check_entrance_exams(branch_dict.get('seat_matrix') or [], college, "Seat matrix")
         
         # Handle academic stream linkage
-        stream_id = branch_dict.pop('academic_stream_id')
-        if not PydanticObjectId.is_valid(stream_id):
-            raise HTTPException(status_code=400, detail="Invalid academic stream ID")
-        
-        stream = await AcademicStream.get(PydanticObjectId(stream_id))
         if not stream:
             raise HTTPException(status_code=404, detail="Academic stream not found")
         
         branch_dict['academic_stream'] = stream
         
         # Handle faculty linkage if provided
-        faculty_ids = branch_dict.pop('faculty_ids', [])
-        faculties = []
-        for faculty_id in faculty_ids:
-            if not PydanticObjectId.is_valid(faculty_id):
-                raise HTTPException(status_code=400, detail=f"Invalid faculty ID: {faculty_id}")
-            
-            faculty = await Faculty.get(PydanticObjectId(faculty_id))
+        for faculty_id, faculty in zip(faculty_ids, faculties):
             if not faculty:
                 raise HTTPException(status_code=404, detail=f"Faculty not found: {faculty_id}")
-            
-            faculties.append(faculty)
         
         branch_dict['faculties'] = faculties
         
@@ -73,6 +98,7 @@ async def create_college_branch(branch_data: CollegeJunctionCreate):
         
         branch = CollegeJunction(**branch_dict)
         await branch.create()
+        await change_feed.publish(BRANCH, UPSERT, [branch.id])
         
         response_dict = branch.dict()
         response_dict["id"] = str(branch.id)
@@ -90,6 +116,8 @@ async def create_college_branch(branch_data: CollegeJunctionCreate):
 async def get_college_branches(
     page: int = Query(1, ge=1, description="Page number"),
     size: int = Query(10, ge=1, le=100, description="Page size"),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page's next_cursor (keyset pagination)"),
+    expand: Optional[str] = Query(None, description="Linked documents to embed: college, stream, faculties (comma-separated)"),
     college_id: Optional[str] = Query(None, description="Filter by college ID"),
     stream_id: Optional[str] = Query(None, description="Filter by academic stream ID"),
     academic_level: Optional[str] = Query(None, description="Filter by academic level"),
@@ -100,18 +128,16 @@ async def get_college_branches(
 ):
     """Get list of college branches with pagination and filters"""
     try:
-        skip = (page - 1) * size
-        
         # Build query filters
         query_filter = {}
         if college_id:
             if not PydanticObjectId.is_valid(college_id):
                 raise HTTPException(status_code=400, detail="Invalid college ID")
-            query_filter["college"] = PydanticObjectId(college_id)
+            query_filter["college.$id"] = PydanticObjectId(college_id)
         if stream_id:
             if not PydanticObjectId.is_valid(stream_id):
                 raise HTTPException(status_code=400, detail="Invalid stream ID")
-            query_filter["academic_stream"] = PydanticObjectId(stream_id)
+            query_filter["academic_stream.$id"] = PydanticObjectId(stream_id)
         if academic_level:
             query_filter["academic_level"] = academic_level
         if degree_type:
@@ -126,29 +152,12 @@ async def get_college_branches(
             else:
                 query_filter["fees"] = {"$lte": max_fees}
         
-        # Get total count
-        total = await CollegeJunction.find(query_filter).count()
-        
-        # Get branches with pagination
-        branches = await CollegeJunction.find(query_filter).skip(skip).limit(size).to_list()
-        
-        branch_responses = []
-        for branch in branches:
-            branch_dict = branch.dict()
-            branch_dict["id"] = str(branch.id)
-            branch_dict["college_id"] = str(branch.college.id)
-            branch_dict["academic_stream_id"] = str(branch.academic_stream.id)
-            branch_dict["faculty_ids"] = [str(faculty.id) for faculty in branch.faculties] if branch.faculties else []
-            branch_responses.append(CollegeJunctionResponse(**branch_dict))
-        
-        return CollegeJunctionListResponse(
-            branches=branch_responses,
-            total=total,
-            page=page,
-            size=size
-        )
+        # One aggregation: the page by number or cursor, with requested links joined in
+        return await BranchService.list_branches(query_filter, page, size, cursor, parse_expand(expand))
     except HTTPException:
         raise
+    except (InvalidCursorError, InvalidExpandError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching college branches: {str(e)}")
 
@@ -175,62 +184,87 @@ async def get_college_branch(branch_id: str):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching college branch: {str(e)}")
 
-@router.put("/{branch_id}", response_model=CollegeJunctionResponse)
-async def update_college_branch(branch_id: str, branch_data: CollegeJunctionUpdate):
+@router.put("/{branch_id}", response_model=CollegeJunctionResponse, dependencies=[Depends(require_admin)])
+async def update_college_branch(
+    branch_id: str,
+    branch_data: CollegeJunctionUpdate,
+    loaders: Loaders = Depends(get_loaders)
+):
     """Update a college branch"""
     try:
         if not PydanticObjectId.is_valid(branch_id):
             raise HTTPException(status_code=400, detail="Invalid branch ID")
         
-        branch = await CollegeJunction.get(PydanticObjectId(branch_id))
-        if not branch:
-            raise HTTPException(status_code=404, detail="College branch not found")
-        
         # Update only provided fields
         update_data = branch_data.model_dump()
         
-        # Handle college linkage if provided
+        # Validate every linked id before loading any of them
         college_id = update_data.pop('college_id', None)
+        if college_id and not PydanticObjectId.is_valid(college_id):
+            raise HTTPException(status_code=400, detail="Invalid college ID")
+        
+        stream_id = update_data.pop('academic_stream_id', None)
+        if stream_id and not PydanticObjectId.is_valid(stream_id):
+            raise HTTPException(status_code=400, detail="Invalid academic stream ID")
+        
+        faculty_ids = update_data.pop('faculty_ids', None)
+        cutoffs = update_data.pop('cutoffs', None)
+        seat_matrix = update_data.pop('seat_matrix', None)
+        for faculty_id in faculty_ids or []:
+            if not PydanticObjectId.is_valid(faculty_id):
+                raise HTTPException(status_code=400, detail=f"Invalid faculty ID: {faculty_id}")
+        
+        # The branch and its new links, one query per model, all in flight together
+        branch, colleges, streams, faculties = await asyncio.gather(
+            loaders.load(CollegeJunction, PydanticObjectId(branch_id)),
+            loaders.load_many(College, [PydanticObjectId(college_id)] if college_id else []),
+            loaders.load_many(AcademicStream, [PydanticObjectId(stream_id)] if stream_id else []),
+            loaders.load_many(Faculty, [PydanticObjectId(faculty_id) for faculty_id in faculty_ids or []])
+        )
+        if not branch:
+            raise HTTPException(status_code=404, detail="College branch not found")
+        
+        # Handle college linkage if provided
         if college_id:
-            if not PydanticObjectId.is_valid(college_id):
-                raise HTTPException(status_code=400, detail="Invalid college ID")
-            
-            college = await College.get(PydanticObjectId(college_id))
-            if not college:
+            if not colleges[0]:
                 raise HTTPException(status_code=404, detail="College not found")
             
-            update_data['college'] = college
+            update_data['college'] = colleges[0]
         
         # Handle academic stream linkage if provided
-        stream_id = update_data.pop('academic_stream_id', None)
         if stream_id:
-            if not PydanticObjectId.is_valid(stream_id):
-                raise HTTPException(status_code=400, detail="Invalid academic stream ID")
-            
-            stream = await AcademicStream.get(PydanticObjectId(stream_id))
-            if not stream:
+            if not streams[0]:
                 raise HTTPException(status_code=404, detail="Academic stream not found")
             
-            update_data['academic_stream'] = stream
+            update_data['academic_stream'] = streams[0]
         
         # Handle faculty linkage if provided
-        faculty_ids = update_data.pop('faculty_ids', None)
         if faculty_ids is not None:
-            faculties = []
-            for faculty_id in faculty_ids:
-                if not PydanticObjectId.is_valid(faculty_id):
-                    raise HTTPException(status_code=400, detail=f"Invalid faculty ID: {faculty_id}")
-                
-                faculty = await Faculty.get(PydanticObjectId(faculty_id))
+            for faculty_id, faculty in zip(faculty_ids, faculties):
                 if not faculty:
                     raise HTTPException(status_code=404, detail=f"Faculty not found: {faculty_id}")
-                
-                faculties.append(faculty)
             
             update_data['faculties'] = faculties
         
+        # Cutoffs and seats replace the branch's lists, checked against its (new) college's exams
+        if cutoffs is not None or seat_matrix is not None:
+            if college_id:
+                college = colleges[0]
+            else:
+                current = branch.college
+                college = await loaders.load(College, current.ref.id if isinstance(current, Link) else current.id)
+            if cutoffs is not None:
+                if college:
+                    check_entrance_exams(cutoffs, college, "Cutoff")
+                update_data['cutoffs'] = cutoffs
+            if seat_matrix is not None:
+                if college:
+                    check_entrance_exams(seat_matrix, college, "Seat matrix")
+                update_data['seat_matrix'] = seat_matrix
+        
         if update_data:
             await branch.set(update_data)
+            await change_feed.publish(BRANCH, UPSERT, [branch.id])
         
         branch_dict = branch.dict()
         branch_dict["id"] = str(branch.id)
@@ -244,7 +278,7 @@ async def update_college_branch(branch_id: str, branch_data: CollegeJunctionUpda
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error updating college branch: {str(e)}")
 
-@router.delete("/{branch_id}", status_code=204)
+@router.delete("/{branch_id}", status_code=204, dependencies=[Depends(require_admin)])
 async def delete_college_branch(branch_id: str):
     """Delete a college branch"""
     try:
@@ -256,6 +290,7 @@ async def delete_college_branch(branch_id: str):
             raise HTTPException(status_code=404, detail="College branch not found")
         
         await branch.delete()
+        await change_feed.publish(BRANCH, DELETE, [branch.id])
         return None
     except HTTPException:
         raise
@@ -266,7 +301,9 @@ async def delete_college_branch(branch_id: str):
 async def get_branches_by_college(
     college_id: str,
     page: int = Query(1, ge=1, description="Page number"),
-    size: int = Query(10, ge=1, le=100, description="Page size")
+    size: int = Query(10, ge=1, le=100, description="Page size"),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page's next_cursor (keyset pagination)"),
+    expand: Optional[str] = Query(None, description="Linked documents to embed: college, stream, faculties (comma-separated)")
 ):
     """Get all branches for a specific college"""
     try:
@@ -278,32 +315,14 @@ async def get_branches_by_college(
         if not college:
             raise HTTPException(status_code=404, detail="College not found")
         
-        skip = (page - 1) * size
-        query_filter = {"college": PydanticObjectId(college_id)}
-        
-        # Get total count
-        total = await CollegeJunction.find(query_filter).count()
-        
-        # Get branches with pagination
-        branches = await CollegeJunction.find(query_filter).skip(skip).limit(size).to_list()
-        
-        branch_responses = []
-        for branch in branches:
-            branch_dict = branch.dict()
-            branch_dict["id"] = str(branch.id)
-            branch_dict["college_id"] = str(branch.college.id)
-            branch_dict["academic_stream_id"] = str(branch.academic_stream.id)
-            branch_dict["faculty_ids"] = [str(faculty.id) for faculty in branch.faculties] if branch.faculties else []
-            branch_responses.append(CollegeJunctionResponse(**branch_dict))
-        
-        return CollegeJunctionListResponse(
-            branches=branch_responses,
-            total=total,
-            page=page,
-            size=size
-        )
+        query_filter = {"college.$id": PydanticObjectId(college_id)}
+        
+        # One aggregation: the page by number or cursor, with requested links joined in
+        return await BranchService.list_branches(query_filter, page, size, cursor, parse_expand(expand))
     except HTTPException:
         raise
+    except (InvalidCursorError, InvalidExpandError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching college branches: {str(e)}")
 
@@ -311,7 +330,9 @@ async def get_branches_by_college(
 async def get_branches_by_stream(
     stream_id: str,
     page: int = Query(1, ge=1, description="Page number"),
-    size: int = Query(10, ge=1, le=100, description="Page size")
+    size: int = Query(10, ge=1, le=100, description="Page size"),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page's next_cursor (keyset pagination)"),
+    expand: Optional[str] = Query(None, description="Linked documents to embed: college, stream, faculties (comma-separated)")
 ):
     """Get all branches for a specific academic stream"""
     try:
@@ -323,31 +344,13 @@ async def get_branches_by_stream(
         if not stream:
             raise HTTPException(status_code=404, detail="Academic stream not found")
         
-        skip = (page - 1) * size
-        query_filter = {"academic_stream": PydanticObjectId(stream_id)}
-        
-        # Get total count
-        total = await CollegeJunction.find(query_filter).count()
-        
-        # Get branches with pagination
-        branches = await CollegeJunction.find(query_filter).skip(skip).limit(size).to_list()
-        
-        branch_responses = []
-        for branch in branches:
-            branch_dict = branch.dict()
-            branch_dict["id"] = str(branch.id)
-            branch_dict["college_id"] = str(branch.college.id)
-            branch_dict["academic_stream_id"] = str(branch.academic_stream.id)
-            branch_dict["faculty_ids"] = [str(faculty.id) for faculty in branch.faculties] if branch.faculties else []
-            branch_responses.append(CollegeJunctionResponse(**branch_dict))
-        
-        return CollegeJunctionListResponse(
-            branches=branch_responses,
-            total=total,
-            page=page,
-            size=size
-        )
+        query_filter = {"academic_stream.$id": PydanticObjectId(stream_id)}
+        
+        # One aggregation: the page by number or cursor, with requested links joined in
+        return await BranchService.list_branches(query_filter, page, size, cursor, parse_expand(expand))
     except HTTPException:
         raise
+    except (InvalidCursorError, InvalidExpandError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching stream branches: {str(e)}")
\ No newline at end of file
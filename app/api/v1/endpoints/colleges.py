@@ -1,23 +1,47 @@
-from fastapi import APIRouter, HTTPException, Query, Depends, status
+from fastapi import APIRouter, HTTPException, Query, Depends, Header, Request, Response, status
 from typing import List, Optional
 from beanie import PydanticObjectId
 from app.models.college import College
+from app.core.config import settings
+from app.core.auth_dependency import require_admin
+from app.core.http_cache import make_etag, etag_matches, set_cache_headers, not_modified
 from app.schemas.base import BaseResponseSchema
-from app.services.college_service import CollegeService
+from app.services.college_service import CollegeService, MAX_BATCH_COLLEGES
+from app.services.college_ranking_service import CollegeRankingService
+from app.services.college_import import CollegeImportService
+from app.services.pagination import InvalidCursorError
+from app.services.response_cache import cache_stats
+from app.services.change_feed import change_feed
+from app.services.projection import InvalidFieldsError, parse_fields
 
 router = APIRouter()
 
+# Routes on the colleges collection itself (e.g. /colleges:batchGet), mounted without a prefix
+collection_router = APIRouter()
 
-@router.get(
-    "/",
-    response_model=BaseResponseSchema,
-    summary="Get list of colleges",
-    description="Retrieve colleges with optional filtering, sorting, and pagination"
-)
-async def get_colleges(
+MAX_COMPARE_COLLEGES = 10
+
+
+def parse_ids(ids: str, max_ids: int) -> List[str]:
+    """Split a comma-separated ids= value into distinct ids/slugs, in order."""
+    values = list(dict.fromkeys(value.strip() for value in ids.split(",") if value.strip()))
+    if not values:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="ids must name at least one college"
+        )
+    if len(values) > max_ids:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {max_ids} colleges can be requested at once"
+        )
+    return values
+
+
+def build_college_query(
     search: Optional[str] = Query(
         None,
-        description="Search by college name (case-insensitive)",
+        description="Search by college name, short name, alias or tags",
         min_length=2,
         max_length=100
     ),
@@ -33,6 +57,47 @@ async def get_colleges(
         None,
         description="Filter by category (e.g., Engineering, Medical, Management)"
     ),
+    featured: Optional[bool] = Query(
+        None,
+        description="Filter featured colleges"
+    ),
+) -> dict:
+    """Build the college filter query shared by the listing and facet endpoints."""
+    query = {}
+    
+    if search:
+        query["search"] = search.strip()
+    
+    if state:
+        query["state"] = state.strip()
+    
+    if type:
+        valid_types = ["Public", "Private"]
+        if type not in valid_types:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid type. Must be one of: {', '.join(valid_types)}"
+            )
+        query["type"] = type
+    
+    if category:
+        query["category"] = category.strip()
+    
+    if featured is not None:
+        query["featured"] = featured
+    
+    return query
+
+
+@router.get(
+    "/",
+    response_model=BaseResponseSchema,
+    summary="Get list of colleges",
+    description="Retrieve colleges with optional filtering, sorting, and pagination"
+)
+async def get_colleges(
+    response: Response,
+    query: dict = Depends(build_college_query),
     sort_by: Optional[str] = Query(
         None,
         description="Sort by field",
@@ -50,41 +115,29 @@ async def get_colleges(
         le=100,
         description="Number of items per page (max 100)"
     ),
+    cursor: Optional[str] = Query(
+        None,
+        description="Cursor from a previous page's next_cursor; pages by keyset instead of page number"
+    ),
+    fields: Optional[str] = Query(
+        None,
+        description="Comma-separated college fields to return (e.g. name,fees,image); id is always included"
+    ),
+    if_none_match: Optional[str] = Header(None),
 ) -> BaseResponseSchema:
     """
     Get colleges with optional filters and pagination.
     """
     try:
+        field_list = parse_fields(fields)
+        
         print("query params:", {
-            "search": search,
-            "state": state,
-            "type": type,
-            "category": category,
+            "query": query,
             "sort_by": sort_by,
             "page": page,
-            "limit": limit
+            "limit": limit,
+            "cursor": cursor
         })
-        # Build query filters
-        query = {}
-        
-        if search:
-            search = search.strip()
-            query["name"] = {"$regex": search, "$options": "i"}
-        
-        if state:
-            query["state"] = state.strip()
-        
-        if type:
-            valid_types = ["Public", "Private"]
-            if type not in valid_types:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Invalid type. Must be one of: {', '.join(valid_types)}"
-                )
-            query["type"] = type
-        
-        if category:
-            query["category"] = category.strip()
         
         # Build sort criteria
         sort_criteria = None
@@ -99,23 +152,37 @@ async def get_colleges(
             sort_order = -1  # Descending order
             sort_criteria = [(sort_field, sort_order)]
         
-        # Fetch colleges from service
-        colleges_data = await CollegeService.get_colleges(
+        # Revalidation: answer 304 before running the query
+        etag = CollegeService.list_etag(query, sort_criteria, page, limit, cursor, field_list)
+        if etag and etag_matches(if_none_match, etag):
+            return not_modified(etag, settings.COLLEGE_LIST_CACHE_CONTROL)
+        
+        # Fetch colleges from service (served from the response cache when possible)
+        colleges_data = await CollegeService.get_colleges_cached(
             query=query,
             sort_criteria=sort_criteria,
             page=page,
-            page_size=limit
+            page_size=limit,
+            cursor=cursor,
+            fields=field_list
         )
         
+        set_cache_headers(response, etag, settings.COLLEGE_LIST_CACHE_CONTROL)
         return BaseResponseSchema(
             success=True,
             message="Colleges retrieved successfully",
-            data=colleges_data.model_dump()
+            data=colleges_data
         )
     
     except HTTPException:
         raise
     
+    except (InvalidCursorError, InvalidFieldsError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -123,22 +190,376 @@ async def get_colleges(
         )
 
 
+@router.get(
+    "/facets",
+    response_model=BaseResponseSchema,
+    summary="Get facet counts for the college filters",
+    description="Count colleges per state, category, type and sub-category for the current filters"
+)
+async def get_college_facets(
+    response: Response,
+    query: dict = Depends(build_college_query),
+) -> BaseResponseSchema:
+    """Get per-value counts for the listing filter sidebar."""
+    try:
+        facets = await CollegeService.get_facets(query)
+        
+        set_cache_headers(response, None, settings.COLLEGE_FACETS_CACHE_CONTROL)
+        return BaseResponseSchema(
+            success=True,
+            message="College facets retrieved successfully",
+            data=facets.model_dump()
+        )
+    
+    except HTTPException:
+        raise
+    
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An error occurred while fetching college facets"
+        )
+
+
+@router.get(
+    "/nearby",
+    response_model=BaseResponseSchema,
+    summary="Get colleges near a location",
+    description="Colleges within a radius of a point, nearest first, optionally filtered by category and type"
+)
+async def get_nearby_colleges(
+    lat: float = Query(..., ge=-90, le=90, description="Latitude of the point"),
+    lng: float = Query(..., ge=-180, le=180, description="Longitude of the point"),
+    radius_km: float = Query(25, gt=0, le=500, description="Search radius in kilometres (max 500)"),
+    category: Optional[str] = Query(
+        None,
+        description="Filter by category (e.g., Engineering, Medical, Management)"
+    ),
+    type: Optional[str] = Query(
+        None,
+        description="Filter by college type (Public or Private)"
+    ),
+    page: int = Query(1, ge=1, description="Page number (starts from 1)"),
+    limit: int = Query(10, ge=1, le=100, description="Number of items per page (max 100)"),
+) -> BaseResponseSchema:
+    """Get colleges sorted by distance from a point."""
+    try:
+        query = build_college_query(
+            search=None,
+            state=None,
+            type=type,
+            category=category,
+            featured=None
+        )
+        
+        nearby = await CollegeService.get_nearby_colleges(
+            lat=lat,
+            lng=lng,
+            radius_km=radius_km,
+            query=query,
+            page=page,
+            page_size=limit
+        )
+        
+        return BaseResponseSchema(
+            success=True,
+            message="Nearby colleges retrieved successfully",
+            data=nearby.model_dump()
+        )
+    
+    except HTTPException:
+        raise
+    
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An error occurred while fetching nearby colleges"
+        )
+
+
+@router.get(
+    "/suggest",
+    response_model=BaseResponseSchema,
+    summary="Autocomplete college names",
+    description="Most popular colleges whose name, short name, alias or acronym starts with the typed prefix"
+)
+async def suggest_colleges(
+    response: Response,
+    q: str = Query(
+        ...,
+        description="Prefix typed in the search box",
+        min_length=1,
+        max_length=100
+    ),
+    limit: int = Query(
+        10,
+        ge=1,
+        le=20,
+        description="Number of suggestions (max 20)"
+    ),
+) -> BaseResponseSchema:
+    """Get search-box suggestions for a prefix."""
+    try:
+        suggestions = await CollegeService.suggest_colleges(q.strip(), limit)
+        
+        set_cache_headers(response, None, settings.COLLEGE_SUGGEST_CACHE_CONTROL)
+        return BaseResponseSchema(
+            success=True,
+            message="College suggestions retrieved successfully",
+            data=suggestions.model_dump()
+        )
+    
+    except HTTPException:
+        raise
+    
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An error occurred while fetching college suggestions"
+        )
+
+
+@router.get(
+    "/cache/stats",
+    response_model=BaseResponseSchema,
+    summary="Get response cache statistics",
+    description="Hit, miss and coalesced-miss counts of the response caches, for sizing them, and change feed counters",
+    dependencies=[Depends(require_admin)]
+)
+async def get_cache_stats() -> BaseResponseSchema:
+    """Get response cache counters for this worker."""
+    return BaseResponseSchema(
+        success=True,
+        message="Cache statistics retrieved successfully",
+        data={"caches": cache_stats(), "change_feed": change_feed.get_stats()}
+    )
+
+
+@router.post(
+    "/import",
+    response_model=BaseResponseSchema,
+    summary="Bulk import colleges",
+    description="Create colleges from an NDJSON body (one CollegeCreateRequest per line) and report failed lines",
+    dependencies=[Depends(require_admin)]
+)
+async def import_colleges(
+    request: Request,
+    dry_run: bool = Query(
+        False,
+        description="Only validate the rows; nothing is written"
+    ),
+) -> BaseResponseSchema:
+    """Import colleges in bulk from a streamed NDJSON body."""
+    try:
+        report = await CollegeImportService.import_colleges(request.stream(), dry_run=dry_run)
+        
+        if dry_run:
+            message = f"Validated {report.valid} of {report.received} colleges"
+        else:
+            message = f"Imported {report.inserted} of {report.received} colleges"
+        return BaseResponseSchema(
+            success=True,
+            message=message,
+            data=report.model_dump()
+        )
+    
+    except HTTPException:
+        raise
+    
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An error occurred while importing colleges"
+        )
+
+
+@router.get(
+    "/rankings",
+    response_model=BaseResponseSchema,
+    summary="Get a ranking leaderboard",
+    description="Colleges in rank order for one organisation, category and year (latest year by default)"
+)
+async def get_ranking_leaderboard(
+    response: Response,
+    organisation: str = Query(
+        ...,
+        min_length=1,
+        description="Ranking organisation (e.g., NIRF, QS)"
+    ),
+    category: Optional[str] = Query(
+        None,
+        description="Ranking category (e.g., Engineering); Overall by default"
+    ),
+    year: Optional[int] = Query(
+        None,
+        ge=1900,
+        le=2100,
+        description="Ranking year; the latest available by default"
+    ),
+    page: int = Query(1, ge=1, description="Page number (starts from 1)"),
+    limit: int = Query(20, ge=1, le=100, description="Number of items per page (max 100)"),
+    cursor: Optional[str] = Query(
+        None,
+        description="Cursor from a previous page's next_cursor; pages by keyset instead of page number"
+    ),
+) -> BaseResponseSchema:
+    """Get one page of a ranking leaderboard."""
+    try:
+        leaderboard = await CollegeRankingService.get_leaderboard(
+            organisation=organisation.strip(),
+            category=category.strip() if category else None,
+            year=year,
+            page=page,
+            page_size=limit,
+            cursor=cursor
+        )
+        
+        set_cache_headers(response, None, settings.COLLEGE_RANKINGS_CACHE_CONTROL)
+        return BaseResponseSchema(
+            success=True,
+            message="Ranking leaderboard retrieved successfully",
+            data=leaderboard.model_dump()
+        )
+    
+    except HTTPException:
+        raise
+    
+    except InvalidCursorError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An error occurred while fetching the ranking leaderboard"
+        )
+
+
+@router.get(
+    "/rankings/boards",
+    response_model=BaseResponseSchema,
+    summary="Get available ranking leaderboards",
+    description="Every organisation, category and year with a leaderboard, and how many colleges it ranks"
+)
+async def get_ranking_boards(
+    response: Response,
+    organisation: Optional[str] = Query(None, description="Only this ranking organisation"),
+) -> BaseResponseSchema:
+    """Get the list of ranking leaderboards."""
+    try:
+        boards = await CollegeRankingService.get_boards(organisation.strip() if organisation else None)
+        
+        set_cache_headers(response, None, settings.COLLEGE_RANKINGS_CACHE_CONTROL)
+        return BaseResponseSchema(
+            success=True,
+            message="Ranking leaderboards retrieved successfully",
+            data=boards.model_dump()
+        )
+    
+    except HTTPException:
+        raise
+    
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An error occurred while fetching ranking leaderboards"
+        )
+
+
+@router.get(
+    "/compare",
+    response_model=BaseResponseSchema,
+    summary="Compare colleges side by side",
+    description="Fees, placement, ratings, rankings and accreditations of 2 to 10 colleges, aligned field by field"
+)
+async def compare_colleges(
+    ids: str = Query(
+        ...,
+        description="Comma-separated college ObjectIds or slugs, in display order"
+    ),
+) -> BaseResponseSchema:
+    """Compare colleges field by field."""
+    try:
+        values = parse_ids(ids, MAX_COMPARE_COLLEGES)
+        if len(values) < 2:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="At least 2 colleges are needed for a comparison"
+            )
+        
+        comparison = await CollegeService.compare_colleges(values)
+        
+        return BaseResponseSchema(
+            success=True,
+            message="College comparison retrieved successfully",
+            data=comparison.model_dump()
+        )
+    
+    except HTTPException:
+        raise
+    
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An error occurred while comparing colleges"
+        )
+
+
 @router.get(
     "/{college_id}",
     response_model=BaseResponseSchema,
-    summary="Get college by ID"
+    summary="Get college by ID or slug"
 )
-async def get_college_by_id(college_id: str) -> BaseResponseSchema:
-    """Get detailed information about a specific college."""
+async def get_college_by_id(
+    college_id: str,
+    response: Response,
+    fields: Optional[str] = Query(
+        None,
+        description="Comma-separated College paths to return (e.g. name,slug,images.logo); id is always included"
+    ),
+    if_none_match: Optional[str] = Header(None),
+) -> BaseResponseSchema:
+    """Get detailed information about a specific college, by ObjectId or slug."""
     try:
-        college = await CollegeService.get_college_by_id(college_id)
+        field_list = parse_fields(fields)
+        if field_list:
+            CollegeService.validate_detail_fields(field_list)
+        
+        resolved_id = await CollegeService.resolve_college_id(college_id)
+        version = await CollegeService.get_college_version(resolved_id) if resolved_id else None
+        if not version:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"College with ID {college_id} not found"
+            )
         
-        if not college:
+        # Revalidation: compare against the college's version before loading it
+        etag = make_etag("college", version, ",".join(sorted(field_list or [])))
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag, settings.COLLEGE_DETAIL_CACHE_CONTROL)
+        
+        if field_list:
+            college = await CollegeService.get_college_fields(resolved_id, field_list)
+            body = None
+        else:
+            college = None
+            body = await CollegeService.get_college_detail_json(resolved_id, version)
+        
+        if not college and not body:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"College with ID {college_id} not found"
             )
         
+        if body:
+            # Already-serialized envelope from the detail cache
+            cached = Response(content=body, media_type="application/json")
+            set_cache_headers(cached, etag, settings.COLLEGE_DETAIL_CACHE_CONTROL)
+            return cached
+        
+        set_cache_headers(response, etag, settings.COLLEGE_DETAIL_CACHE_CONTROL)
         return BaseResponseSchema(
             success=True,
             message="College retrieved successfully",
@@ -148,6 +569,12 @@ async def get_college_by_id(college_id: str) -> BaseResponseSchema:
     except HTTPException:
         raise
     
+    except InvalidFieldsError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -155,6 +582,44 @@ async def get_college_by_id(college_id: str) -> BaseResponseSchema:
         )
 
 
+@router.get(
+    "/{college_id}/rankings",
+    response_model=BaseResponseSchema,
+    summary="Get a college's rank history",
+    description="Rank per year in every leaderboard the college appears in, oldest year first"
+)
+async def get_college_rank_history(
+    college_id: str,
+    response: Response,
+) -> BaseResponseSchema:
+    """Get rank trends of a college, by ObjectId or slug."""
+    try:
+        resolved_id = await CollegeService.resolve_college_id(college_id)
+        if not resolved_id:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"College with ID {college_id} not found"
+            )
+        
+        history = await CollegeRankingService.get_rank_history(resolved_id)
+        
+        set_cache_headers(response, None, settings.COLLEGE_RANKINGS_CACHE_CONTROL)
+        return BaseResponseSchema(
+            success=True,
+            message="College rank history retrieved successfully",
+            data=history.model_dump()
+        )
+    
+    except HTTPException:
+        raise
+    
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An error occurred while fetching the college rank history"
+        )
+
+
 @router.get(
     "/filters/states",
     response_model=BaseResponseSchema,
@@ -198,4 +663,38 @@ async def get_categories() -> BaseResponseSchema:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="An error occurred while fetching categories"
-        )
\ No newline at end of file
+        )
+
+
+@collection_router.get(
+    "/colleges:batchGet",
+    response_model=BaseResponseSchema,
+    summary="Get several colleges by ID or slug",
+    description="Details of up to 50 colleges in one request, in the order given; unknown ids are listed in not_found"
+)
+async def batch_get_colleges(
+    ids: str = Query(
+        ...,
+        description="Comma-separated college ObjectIds or slugs"
+    ),
+) -> BaseResponseSchema:
+    """Get detailed information about several colleges at once."""
+    try:
+        values = parse_ids(ids, MAX_BATCH_COLLEGES)
+        
+        colleges, not_found = await CollegeService.get_colleges_by_ids(values)
+        
+        return BaseResponseSchema(
+            success=True,
+            message="Colleges retrieved successfully",
+            data={"colleges": colleges, "not_found": not_found}
+        )
+    
+    except HTTPException:
+        raise
+    
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An error occurred while fetching colleges"
+        )
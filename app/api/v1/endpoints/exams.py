@@ -0,0 +1,73 @@
+from fastapi import APIRouter, Depends, HTTPException, Path, Query
+from typing import Optional
+from app.schemas.exam import (
+    ExamDistributionCreate,
+    ExamDistributionSummary,
+    ExamDistributionListResponse,
+    ConversionRequest,
+    ConversionResponse
+)
+from app.core.auth_dependency import require_admin
+from app.services.exam_service import ExamService, ExamDistributionsUnavailableError
+
+router = APIRouter()
+
+@router.get("/distributions", response_model=ExamDistributionListResponse)
+async def get_distributions(
+    exam: Optional[str] = Query(None, description="Filter by entrance exam")
+):
+    """List stored score distributions, latest year first per exam"""
+    try:
+        return ExamDistributionListResponse(distributions=await ExamService.list_distributions(exam))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching distributions: {str(e)}")
+
+@router.put("/{exam}/distributions/{year}", response_model=ExamDistributionSummary, dependencies=[Depends(require_admin)])
+async def put_distribution(
+    distribution: ExamDistributionCreate,
+    exam: str = Path(..., min_length=1, description="Entrance exam, as listed in a college's entrance_exams"),
+    year: int = Path(..., ge=1900, le=2100)
+):
+    """Store the score distribution of an exam for a year, replacing any earlier one"""
+    try:
+        return await ExamService.upsert(exam, year, distribution)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Error storing distribution: {str(e)}")
+
+@router.delete("/{exam}/distributions/{year}", dependencies=[Depends(require_admin)])
+async def delete_distribution(
+    exam: str = Path(..., min_length=1),
+    year: int = Path(...)
+):
+    """Delete the score distribution of an exam for a year"""
+    try:
+        if not await ExamService.delete(exam, year):
+            raise HTTPException(status_code=404, detail="Distribution not found")
+        
+        return {"message": "Distribution deleted successfully"}
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error deleting distribution: {str(e)}")
+
+@router.post("/{exam}/convert", response_model=ConversionResponse)
+async def convert_scores(
+    conversion: ConversionRequest,
+    exam: str = Path(..., min_length=1, description="Entrance exam, as listed in a college's entrance_exams")
+):
+    """Convert scores, ranks and percentiles of an exam into one another, in bulk"""
+    try:
+        result = ExamService.convert(exam, conversion)
+        if result is None:
+            raise HTTPException(
+                status_code=404,
+                detail=f"No score distribution found for {exam}" + (f" in {conversion.year}" if conversion.year else "")
+            )
+        
+        return result
+    except HTTPException:
+        raise
+    except ExamDistributionsUnavailableError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error converting scores: {str(e)}")
@@ -0,0 +1,40 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from app.core.auth_dependency import require_admin
+from app.services.export import ExportService, EXPORT_DATASETS, EXPORT_FORMATS
+
+router = APIRouter()
+
+
+@router.get(
+    "/{dataset}",
+    summary="Export a dataset",
+    description="Stream every college, branch or scholarship as NDJSON or CSV, optionally gzip-compressed",
+    response_class=StreamingResponse,
+    dependencies=[Depends(require_admin)]
+)
+async def export_dataset(
+    dataset: str,
+    format: str = Query(
+        "ndjson",
+        pattern="^(ndjson|csv)$",
+        description="Output format: ndjson (one JSON document per line) or csv"
+    ),
+    gzip: bool = Query(
+        False,
+        description="Compress the download as a .gz file"
+    ),
+) -> StreamingResponse:
+    """Stream a full dump of a dataset, with constant memory regardless of its size."""
+    if dataset not in EXPORT_DATASETS:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Unknown dataset {dataset}; expected one of {', '.join(EXPORT_DATASETS)}"
+        )
+    
+    filename = f"{dataset}.{format}" + (".gz" if gzip else "")
+    return StreamingResponse(
+        ExportService.stream_export(dataset, format, compress=gzip),
+        media_type="application/gzip" if gzip else EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
@@ -1,8 +1,12 @@
+import asyncio
 from fastapi import APIRouter, HTTPException, Query, Depends
+from app.core.auth_dependency import require_admin
 from typing import List, Optional
 from beanie import PydanticObjectId
 from app.models.faculty import Faculty
 from app.models.college import College
+from app.services.pagination import paginate, InvalidCursorError
+from app.services.loader import Loaders, get_loaders
 from app.schemas.faculty import (
     FacultyCreate, 
     FacultyUpdate, 
@@ -12,7 +16,7 @@ from app.schemas.faculty import (
 
 router = APIRouter()
 
-@router.post("/", response_model=FacultyResponse, status_code=201)
+@router.post("/", response_model=FacultyResponse, status_code=201, dependencies=[Depends(require_admin)])
 async def create_faculty(faculty_data: FacultyCreate):
     """Create a new faculty member"""
     try:
@@ -47,6 +51,7 @@ async def create_faculty(faculty_data: FacultyCreate):
 async def get_faculties(
     page: int = Query(1, ge=1, description="Page number"),
     size: int = Query(10, ge=1, le=100, description="Page size"),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page's next_cursor (keyset pagination)"),
     search: Optional[str] = Query(None, description="Search by name"),
     college_id: Optional[str] = Query(None, description="Filter by college ID"),
     designation: Optional[str] = Query(None, description="Filter by designation"),
@@ -54,8 +59,6 @@ async def get_faculties(
 ):
     """Get list of faculty members with pagination and filters"""
     try:
-        skip = (page - 1) * size
-        
         # Build query filters
         query_filter = {}
         if search:
@@ -73,11 +76,9 @@ async def get_faculties(
         if department:
             query_filter["departments.name"] = {"$regex": department, "$options": "i"}
         
-        # Get total count
-        total = await Faculty.find(query_filter).count()
-        
-        # Get faculties with pagination
-        faculties = await Faculty.find(query_filter).skip(skip).limit(size).to_list()
+        # Get faculties by page number, or after the cursor when one is given
+        result = await paginate(Faculty, query_filter, page, size, cursor)
+        faculties = result.items
         
         faculty_responses = []
         for faculty in faculties:
@@ -88,12 +89,15 @@ async def get_faculties(
         
         return FacultyListResponse(
             faculties=faculty_responses,
-            total=total,
+            total=result.total,
             page=page,
-            size=size
+            size=size,
+            next_cursor=result.next_cursor
         )
     except HTTPException:
         raise
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching faculties: {str(e)}")
 
@@ -118,31 +122,38 @@ async def get_faculty(faculty_id: str):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching faculty: {str(e)}")
 
-@router.put("/{faculty_id}", response_model=FacultyResponse)
-async def update_faculty(faculty_id: str, faculty_data: FacultyUpdate):
+@router.put("/{faculty_id}", response_model=FacultyResponse, dependencies=[Depends(require_admin)])
+async def update_faculty(
+    faculty_id: str,
+    faculty_data: FacultyUpdate,
+    loaders: Loaders = Depends(get_loaders)
+):
     """Update a faculty member"""
     try:
         if not PydanticObjectId.is_valid(faculty_id):
             raise HTTPException(status_code=400, detail="Invalid faculty ID")
         
-        faculty = await Faculty.get(PydanticObjectId(faculty_id))
-        if not faculty:
-            raise HTTPException(status_code=404, detail="Faculty not found")
-        
         # Update only provided fields
         update_data = faculty_data.model_dump()
         
-        # Handle college linkage if provided
         college_id = update_data.pop('college_id', None)
+        if college_id and not PydanticObjectId.is_valid(college_id):
+            raise HTTPException(status_code=400, detail="Invalid college ID")
+        
+        # The faculty member and the new college together
+        faculty, colleges = await asyncio.gather(
+            loaders.load(Faculty, PydanticObjectId(faculty_id)),
+            loaders.load_many(College, [PydanticObjectId(college_id)] if college_id else [])
+        )
+        if not faculty:
+            raise HTTPException(status_code=404, detail="Faculty not found")
+        
+        # Handle college linkage if provided
         if college_id:
-            if not PydanticObjectId.is_valid(college_id):
-                raise HTTPException(status_code=400, detail="Invalid college ID")
-            
-            college = await College.get(PydanticObjectId(college_id))
-            if not college:
+            if not colleges[0]:
                 raise HTTPException(status_code=404, detail="College not found")
             
-            update_data['college'] = college
+            update_data['college'] = colleges[0]
         
         if update_data:
             await faculty.set(update_data)
@@ -157,7 +168,7 @@ async def update_faculty(faculty_id: str, faculty_data: FacultyUpdate):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error updating faculty: {str(e)}")
 
-@router.delete("/{faculty_id}", status_code=204)
+@router.delete("/{faculty_id}", status_code=204, dependencies=[Depends(require_admin)])
 async def delete_faculty(faculty_id: str):
     """Delete a faculty member"""
     try:
@@ -179,7 +190,8 @@ async def delete_faculty(faculty_id: str):
 async def get_faculties_by_college(
     college_id: str,
     page: int = Query(1, ge=1, description="Page number"),
-    size: int = Query(10, ge=1, le=100, description="Page size")
+    size: int = Query(10, ge=1, le=100, description="Page size"),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page's next_cursor (keyset pagination)")
 ):
     """Get all faculty members for a specific college"""
     try:
@@ -191,14 +203,11 @@ async def get_faculties_by_college(
         if not college:
             raise HTTPException(status_code=404, detail="College not found")
         
-        skip = (page - 1) * size
         query_filter = {"college": PydanticObjectId(college_id)}
         
-        # Get total count
-        total = await Faculty.find(query_filter).count()
-        
-        # Get faculties with pagination
-        faculties = await Faculty.find(query_filter).skip(skip).limit(size).to_list()
+        # Get faculties by page number, or after the cursor when one is given
+        result = await paginate(Faculty, query_filter, page, size, cursor)
+        faculties = result.items
         
         faculty_responses = []
         for faculty in faculties:
@@ -209,11 +218,14 @@ async def get_faculties_by_college(
         
         return FacultyListResponse(
             faculties=faculty_responses,
-            total=total,
+            total=result.total,
             page=page,
-            size=size
+            size=size,
+            next_cursor=result.next_cursor
         )
     except HTTPException:
         raise
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching college faculties: {str(e)}")
\ No newline at end of file
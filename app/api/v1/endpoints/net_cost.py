@@ -0,0 +1,67 @@
+from fastapi import APIRouter, HTTPException, Query
+from typing import List, Optional
+from beanie import PydanticObjectId
+from app.models.scholarship import Category, Gender
+from app.schemas.net_cost import NetCostResponse
+from app.services.net_cost_service import NetCostService
+from app.services.scholarship_index import ScholarshipIndexUnavailableError
+
+router = APIRouter()
+
+MAX_NET_COST_COLLEGES = 100
+MAX_NET_COST_STREAMS = 20
+
+def parse_id_list(ids: Optional[str], label: str, max_ids: int) -> List[str]:
+    """Split a comma-separated list of ids into distinct, valid ids, in order."""
+    if not ids:
+        return []
+    values = list(dict.fromkeys(value.strip() for value in ids.split(",") if value.strip()))
+    if len(values) > max_ids:
+        raise HTTPException(status_code=400, detail=f"At most {max_ids} {label} ids can be given at once")
+    for value in values:
+        if not PydanticObjectId.is_valid(value):
+            raise HTTPException(status_code=400, detail=f"Invalid {label} ID: {value}")
+    return values
+
+@router.get("/", response_model=NetCostResponse)
+async def get_net_costs(
+    college_ids: Optional[str] = Query(None, description="Comma-separated college IDs"),
+    stream_ids: Optional[str] = Query(None, description="Comma-separated academic stream IDs"),
+    gender: Gender = Query(Gender.ANY, description="Student's gender"),
+    category: Category = Query(Category.GENERAL, description="Student's reservation category"),
+    percentage: Optional[float] = Query(None, ge=0, le=100, description="Qualifying exam percentage"),
+    cgpa: Optional[float] = Query(None, ge=0, le=10, description="CGPA"),
+    family_income: Optional[float] = Query(None, ge=0, description="Yearly family income"),
+    hostel: bool = Query(True, description="Include hostel fees where the branch has a hostel"),
+    max_net_cost: Optional[float] = Query(None, ge=0, description="Maximum net yearly cost"),
+    limit: int = Query(50, ge=1, le=500, description="Branches returned")
+):
+    """
+    Net yearly cost per branch for a student: tuition plus hostel, less the best
+    scholarship the student is eligible for. Branches of the given colleges and/or
+    streams, cheapest first.
+    """
+    try:
+        colleges = parse_id_list(college_ids, "college", MAX_NET_COST_COLLEGES)
+        streams = parse_id_list(stream_ids, "stream", MAX_NET_COST_STREAMS)
+        if not colleges and not streams:
+            raise HTTPException(status_code=400, detail="Give college_ids or stream_ids")
+        
+        return await NetCostService.net_costs(
+            colleges,
+            streams,
+            gender=gender,
+            category=category,
+            percentage=percentage,
+            cgpa=cgpa,
+            family_income=family_income,
+            hostel=hostel,
+            max_net_cost=max_net_cost,
+            limit=limit
+        )
+    except HTTPException:
+        raise
+    except ScholarshipIndexUnavailableError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error computing net costs: {str(e)}")
@@ -0,0 +1,131 @@
+from fastapi import APIRouter, HTTPException, Query, Request, Depends
+from fastapi.responses import StreamingResponse
+from typing import Optional
+from beanie import PydanticObjectId
+from app.core.config import settings
+from app.core.auth_dependency import get_optional_user, is_admin
+from app.models.scholarship import Category, Gender
+from app.schemas.predictor import PredictionResponse, AllocationScenario, AllocationResponse
+from app.services.predictor_service import PredictorService, PredictorUnavailableError
+from app.services.batch_predictor import BatchPredictorService, BatchTooLargeError
+from app.services.allocation_service import AllocationService
+
+router = APIRouter()
+
+@router.get("/", response_model=PredictionResponse)
+async def predict_branches(
+    rank: int = Query(..., ge=1, description="Common rank list (all-India) rank"),
+    exam: str = Query(..., min_length=1, description="Entrance exam, as listed in a college's entrance_exams"),
+    category: Category = Query(Category.GENERAL, description="Reservation category"),
+    category_rank: Optional[int] = Query(None, ge=1, description="Category rank, compared against reserved seats"),
+    gender: Gender = Query(Gender.ANY, description="Gender; female students also see female-only seats"),
+    home_state: Optional[str] = Query(None, description="Home state, for home-state and other-state quotas"),
+    year: Optional[int] = Query(None, description="Cutoff year (defaults to the latest for the exam)"),
+    round: Optional[int] = Query(None, ge=1, description="Counselling round (defaults to each branch's last round)"),
+    stream_id: Optional[str] = Query(None, description="Filter by academic stream ID"),
+    max_fees: Optional[float] = Query(None, ge=0, description="Maximum fees"),
+    limit: int = Query(50, ge=1, le=500, description="Branches returned per chance")
+):
+    """Predict safe, target and reach branches for a rank from past cutoffs"""
+    try:
+        if stream_id and not PydanticObjectId.is_valid(stream_id):
+            raise HTTPException(status_code=400, detail="Invalid stream ID")
+        
+        prediction = PredictorService.predict(
+            rank,
+            exam,
+            category=category,
+            gender=gender,
+            category_rank=category_rank,
+            home_state=home_state,
+            year=year,
+            round=round,
+            stream_id=stream_id,
+            max_fees=max_fees,
+            limit=limit
+        )
+        if prediction is None:
+            raise HTTPException(status_code=404, detail=f"No cutoffs found for {exam}" + (f" in {year}" if year else ""))
+        
+        return prediction
+    except HTTPException:
+        raise
+    except PredictorUnavailableError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error predicting branches: {str(e)}")
+
+@router.post(
+    "/batch",
+    summary="Predict a batch of students",
+    description=(
+        "Predict every student of a CSV (with a header row) or NDJSON body, with columns "
+        "rank, exam, category, gender, home_state and optionally category_rank and student_id, "
+        "and stream one NDJSON result per student in input order. Batches above the public "
+        "size limits need an admin token"
+    ),
+    response_class=StreamingResponse
+)
+async def predict_batch(
+    request: Request,
+    format: str = Query("csv", pattern="^(ndjson|csv)$", description="Input format: csv or ndjson"),
+    limit: int = Query(10, ge=1, le=100, description="Branches returned per chance and student"),
+    user: Optional[dict] = Depends(get_optional_user)
+):
+    """Predict safe, target and reach branches for many students at once"""
+    try:
+        await BatchPredictorService.get_spec()
+    except PredictorUnavailableError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    
+    if is_admin(user):
+        max_bytes, max_rows = settings.PREDICTOR_BATCH_MAX_BYTES, settings.PREDICTOR_BATCH_MAX_ROWS
+        hint = ""
+    else:
+        max_bytes, max_rows = settings.PREDICTOR_BATCH_PUBLIC_MAX_BYTES, settings.PREDICTOR_BATCH_PUBLIC_MAX_ROWS
+        hint = "; larger batches need an admin token"
+    
+    too_large = f"Batches are limited to {max_bytes} bytes and {max_rows} students{hint}"
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > max_bytes:
+        raise HTTPException(status_code=413, detail=too_large)
+    
+    try:
+        # The CSV header line is not a student
+        body = await BatchPredictorService.spool(request.stream(), max_bytes, max_rows + (format == "csv"))
+    except BatchTooLargeError:
+        raise HTTPException(status_code=413, detail=too_large)
+    return StreamingResponse(
+        BatchPredictorService.predict_stream(body, format, limit),
+        media_type="application/x-ndjson"
+    )
+
+@router.post("/simulate", response_model=AllocationResponse)
+async def simulate_allocation(
+    scenario: AllocationScenario,
+    user: Optional[dict] = Depends(get_optional_user)
+):
+    """Simulate counselling seat allocation by deferred acceptance over branch seat matrices"""
+    try:
+        applicants, choices = scenario.size()
+        if (
+            applicants > settings.ALLOCATION_PUBLIC_MAX_APPLICANTS
+            or choices > settings.ALLOCATION_PUBLIC_MAX_CHOICES
+        ) and not is_admin(user):
+            raise HTTPException(
+                status_code=401 if user is None else 403,
+                detail=(
+                    f"Simulations over {settings.ALLOCATION_PUBLIC_MAX_APPLICANTS} applicants or "
+                    f"{settings.ALLOCATION_PUBLIC_MAX_CHOICES} branch choices need an admin token"
+                )
+            )
+        
+        result = await AllocationService.run(scenario)
+        if result is None:
+            raise HTTPException(status_code=404, detail=f"No seat matrix found for {scenario.exam} in {scenario.year}")
+        
+        return result
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error simulating allocation: {str(e)}")
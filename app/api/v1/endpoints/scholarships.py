@@ -1,9 +1,15 @@
-from fastapi import APIRouter, HTTPException, Query
+import asyncio
+from fastapi import APIRouter, HTTPException, Query, Depends
+from app.core.auth_dependency import require_admin
 from typing import List, Optional
 from beanie import PydanticObjectId
-from app.models.scholarship import Scholarship
+from app.models.scholarship import Scholarship, Gender, Category
 from app.models.college import College
 from app.models.academics import AcademicStream
+from app.services.pagination import paginate, InvalidCursorError
+from app.services.change_feed import change_feed, SCHOLARSHIP, UPSERT, DELETE
+from app.services.loader import Loaders, get_loaders
+from app.services.scholarship_index import get_table, ScholarshipIndexUnavailableError
 from app.schemas.scholarship import (
     ScholarshipCreate,
     ScholarshipUpdate,
@@ -13,40 +19,47 @@ from app.schemas.scholarship import (
 
 router = APIRouter()
 
-@router.post("/", response_model=ScholarshipResponse, status_code=201)
-async def create_scholarship(scholarship_data: ScholarshipCreate):
+@router.post("/", response_model=ScholarshipResponse, status_code=201, dependencies=[Depends(require_admin)])
+async def create_scholarship(
+    scholarship_data: ScholarshipCreate,
+    loaders: Loaders = Depends(get_loaders)
+):
     """Create a new scholarship"""
     try:
         scholarship_dict = scholarship_data.model_dump()
         
-        # Handle college linkage
+        # Validate every linked id before loading any of them
         college_id = scholarship_dict.pop('college_id')
         if not PydanticObjectId.is_valid(college_id):
             raise HTTPException(status_code=400, detail="Invalid college ID")
         
-        college = await College.get(PydanticObjectId(college_id))
+        stream_ids = scholarship_dict.pop('eligible_stream_ids', [])
+        for stream_id in stream_ids:
+            if not PydanticObjectId.is_valid(stream_id):
+                raise HTTPException(status_code=400, detail=f"Invalid stream ID: {stream_id}")
+        
+        # One query per model, all in flight together
+        college, eligible_streams = await asyncio.gather(
+            loaders.load(College, PydanticObjectId(college_id)),
+            loaders.load_many(AcademicStream, [PydanticObjectId(stream_id) for stream_id in stream_ids])
+        )
+        
+        # Handle college linkage
         if not college:
             raise HTTPException(status_code=404, detail="College not found")
         
         scholarship_dict['college'] = college
         
         # Handle eligible streams linkage if provided
-        stream_ids = scholarship_dict.pop('eligible_stream_ids', [])
-        eligible_streams = []
-        for stream_id in stream_ids:
-            if not PydanticObjectId.is_valid(stream_id):
-                raise HTTPException(status_code=400, detail=f"Invalid stream ID: {stream_id}")
-            
-            stream = await AcademicStream.get(PydanticObjectId(stream_id))
+        for stream_id, stream in zip(stream_ids, eligible_streams):
             if not stream:
                 raise HTTPException(status_code=404, detail=f"Academic stream not found: {stream_id}")
-            
-            eligible_streams.append(stream)
         
         scholarship_dict['eligible_streams'] = eligible_streams
         
         scholarship = Scholarship(**scholarship_dict)
         await scholarship.create()
+        await change_feed.publish(SCHOLARSHIP, UPSERT, [scholarship.id])
         
         response_dict = scholarship.dict()
         response_dict["id"] = str(scholarship.id)
@@ -63,6 +76,7 @@ async def create_scholarship(scholarship_data: ScholarshipCreate):
 async def get_scholarships(
     page: int = Query(1, ge=1, description="Page number"),
     size: int = Query(10, ge=1, le=100, description="Page size"),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page's next_cursor (keyset pagination)"),
     search: Optional[str] = Query(None, description="Search by title or description"),
     college_id: Optional[str] = Query(None, description="Filter by college ID"),
     scholarship_type: Optional[str] = Query(None, description="Filter by scholarship type"),
@@ -72,8 +86,6 @@ async def get_scholarships(
 ):
     """Get list of scholarships with pagination and filters"""
     try:
-        skip = (page - 1) * size
-        
         # Build query filters
         query_filter = {}
         if search:
@@ -97,11 +109,9 @@ async def get_scholarships(
             else:
                 query_filter["amount"] = {"$lte": max_amount}
         
-        # Get total count
-        total = await Scholarship.find(query_filter).count()
-        
-        # Get scholarships with pagination
-        scholarships = await Scholarship.find(query_filter).skip(skip).limit(size).to_list()
+        # Get scholarships by page number, or after the cursor when one is given
+        result = await paginate(Scholarship, query_filter, page, size, cursor)
+        scholarships = result.items
         
         scholarship_responses = []
         for scholarship in scholarships:
@@ -113,15 +123,73 @@ async def get_scholarships(
         
         return ScholarshipListResponse(
             scholarships=scholarship_responses,
-            total=total,
+            total=result.total,
             page=page,
-            size=size
+            size=size,
+            next_cursor=result.next_cursor
         )
     except HTTPException:
         raise
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching scholarships: {str(e)}")
 
+@router.get("/match", response_model=ScholarshipListResponse)
+async def match_scholarships(
+    gender: Gender = Query(Gender.ANY, description="Student's gender"),
+    category: Category = Query(Category.GENERAL, description="Student's reservation category"),
+    percentage: Optional[float] = Query(None, ge=0, le=100, description="Qualifying exam percentage"),
+    cgpa: Optional[float] = Query(None, ge=0, le=10, description="CGPA"),
+    family_income: Optional[float] = Query(None, ge=0, description="Yearly family income"),
+    stream_id: Optional[str] = Query(None, description="Academic stream the student is applying to"),
+    page: int = Query(1, ge=1, description="Page number"),
+    size: int = Query(10, ge=1, le=100, description="Page size")
+):
+    """Get the active scholarships a student is eligible for, highest amount first"""
+    try:
+        if stream_id and not PydanticObjectId.is_valid(stream_id):
+            raise HTTPException(status_code=400, detail="Invalid stream ID")
+        
+        # Match against the in-memory index, then load only the page's scholarships
+        table = get_table()
+        matched = table.match(
+            gender,
+            category,
+            percentage=percentage,
+            cgpa=cgpa,
+            family_income=family_income,
+            stream_id=stream_id
+        )
+        page_docs = [table.docs[i] for i in matched[(page - 1) * size:page * size].tolist()]
+        page_ids = [PydanticObjectId(doc["scholarship_id"]) for doc in page_docs]
+        found = {scholarship.id: scholarship for scholarship in await Scholarship.find({"_id": {"$in": page_ids}}).to_list()}
+        
+        scholarship_responses = []
+        for scholarship_id, doc in zip(page_ids, page_docs):
+            scholarship = found.get(scholarship_id)
+            if not scholarship:
+                continue
+            # Links are not fetched; their ids come from the index row
+            scholarship_dict = scholarship.dict()
+            scholarship_dict["id"] = str(scholarship.id)
+            scholarship_dict["college_id"] = doc["college_id"]
+            scholarship_dict["eligible_stream_ids"] = doc["stream_ids"]
+            scholarship_responses.append(ScholarshipResponse(**scholarship_dict))
+        
+        return ScholarshipListResponse(
+            scholarships=scholarship_responses,
+            total=int(matched.size),
+            page=page,
+            size=size
+        )
+    except HTTPException:
+        raise
+    except ScholarshipIndexUnavailableError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error matching scholarships: {str(e)}")
+
 @router.get("/{scholarship_id}", response_model=ScholarshipResponse)
 async def get_scholarship(scholarship_id: str):
     """Get a specific scholarship by ID"""
@@ -144,50 +212,57 @@ async def get_scholarship(scholarship_id: str):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching scholarship: {str(e)}")
 
-@router.put("/{scholarship_id}", response_model=ScholarshipResponse)
-async def update_scholarship(scholarship_id: str, scholarship_data: ScholarshipUpdate):
+@router.put("/{scholarship_id}", response_model=ScholarshipResponse, dependencies=[Depends(require_admin)])
+async def update_scholarship(
+    scholarship_id: str,
+    scholarship_data: ScholarshipUpdate,
+    loaders: Loaders = Depends(get_loaders)
+):
     """Update a scholarship"""
     try:
         if not PydanticObjectId.is_valid(scholarship_id):
             raise HTTPException(status_code=400, detail="Invalid scholarship ID")
         
-        scholarship = await Scholarship.get(PydanticObjectId(scholarship_id))
-        if not scholarship:
-            raise HTTPException(status_code=404, detail="Scholarship not found")
-        
         # Update only provided fields
         update_data = scholarship_data.model_dump()
         
-        # Handle college linkage if provided
+        # Validate every linked id before loading any of them
         college_id = update_data.pop('college_id', None)
+        if college_id and not PydanticObjectId.is_valid(college_id):
+            raise HTTPException(status_code=400, detail="Invalid college ID")
+        
+        stream_ids = update_data.pop('eligible_stream_ids', None)
+        for stream_id in stream_ids or []:
+            if not PydanticObjectId.is_valid(stream_id):
+                raise HTTPException(status_code=400, detail=f"Invalid stream ID: {stream_id}")
+        
+        # The scholarship and its new links, one query per model, all in flight together
+        scholarship, colleges, eligible_streams = await asyncio.gather(
+            loaders.load(Scholarship, PydanticObjectId(scholarship_id)),
+            loaders.load_many(College, [PydanticObjectId(college_id)] if college_id else []),
+            loaders.load_many(AcademicStream, [PydanticObjectId(stream_id) for stream_id in stream_ids or []])
+        )
+        if not scholarship:
+            raise HTTPException(status_code=404, detail="Scholarship not found")
+        
+        # Handle college linkage if provided
         if college_id:
-            if not PydanticObjectId.is_valid(college_id):
-                raise HTTPException(status_code=400, detail="Invalid college ID")
-            
-            college = await College.get(PydanticObjectId(college_id))
-            if not college:
+            if not colleges[0]:
                 raise HTTPException(status_code=404, detail="College not found")
             
-            update_data['college'] = college
+            update_data['college'] = colleges[0]
         
         # Handle eligible streams linkage if provided
-        stream_ids = update_data.pop('eligible_stream_ids', None)
         if stream_ids is not None:
-            eligible_streams = []
-            for stream_id in stream_ids:
-                if not PydanticObjectId.is_valid(stream_id):
-                    raise HTTPException(status_code=400, detail=f"Invalid stream ID: {stream_id}")
-                
-                stream = await AcademicStream.get(PydanticObjectId(stream_id))
+            for stream_id, stream in zip(stream_ids, eligible_streams):
                 if not stream:
                     raise HTTPException(status_code=404, detail=f"Academic stream not found: {stream_id}")
-                
-                eligible_streams.append(stream)
             
             update_data['eligible_streams'] = eligible_streams
         
         if update_data:
             await scholarship.set(update_data)
+            await change_feed.publish(SCHOLARSHIP, UPSERT, [scholarship.id])
         
         scholarship_dict = scholarship.dict()
         scholarship_dict["id"] = str(scholarship.id)
@@ -200,7 +275,7 @@ async def update_scholarship(scholarship_id: str, scholarship_data: ScholarshipU
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error updating scholarship: {str(e)}")
 
-@router.delete("/{scholarship_id}", status_code=204)
+@router.delete("/{scholarship_id}", status_code=204, dependencies=[Depends(require_admin)])
 async def delete_scholarship(scholarship_id: str):
     """Delete a scholarship"""
     try:
@@ -212,6 +287,7 @@ async def delete_scholarship(scholarship_id: str):
             raise HTTPException(status_code=404, detail="Scholarship not found")
         
         await scholarship.delete()
+        await change_feed.publish(SCHOLARSHIP, DELETE, [scholarship.id])
         return None
     except HTTPException:
         raise
@@ -223,6 +299,7 @@ async def get_scholarships_by_college(
     college_id: str,
     page: int = Query(1, ge=1, description="Page number"),
     size: int = Query(10, ge=1, le=100, description="Page size"),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page's next_cursor (keyset pagination)"),
     active: Optional[bool] = Query(True, description="Filter by active status")
 ):
     """Get all scholarships for a specific college"""
@@ -235,16 +312,13 @@ async def get_scholarships_by_college(
         if not college:
             raise HTTPException(status_code=404, detail="College not found")
         
-        skip = (page - 1) * size
         query_filter = {"college": PydanticObjectId(college_id)}
         if active is not None:
             query_filter["active"] = active
         
-        # Get total count
-        total = await Scholarship.find(query_filter).count()
-        
-        # Get scholarships with pagination
-        scholarships = await Scholarship.find(query_filter).skip(skip).limit(size).to_list()
+        # Get scholarships by page number, or after the cursor when one is given
+        result = await paginate(Scholarship, query_filter, page, size, cursor)
+        scholarships = result.items
         
         scholarship_responses = []
         for scholarship in scholarships:
@@ -256,16 +330,19 @@ async def get_scholarships_by_college(
         
         return ScholarshipListResponse(
             scholarships=scholarship_responses,
-            total=total,
+            total=result.total,
             page=page,
-            size=size
+            size=size,
+            next_cursor=result.next_cursor
         )
     except HTTPException:
         raise
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching college scholarships: {str(e)}")
 
-@router.post("/{scholarship_id}/toggle-status")
+@router.post("/{scholarship_id}/toggle-status", dependencies=[Depends(require_admin)])
 async def toggle_scholarship_status(scholarship_id: str):
     """Toggle scholarship active status"""
     try:
@@ -277,6 +354,7 @@ async def toggle_scholarship_status(scholarship_id: str):
             raise HTTPException(status_code=404, detail="Scholarship not found")
         
         await scholarship.set({"active": not scholarship.active})
+        await change_feed.publish(SCHOLARSHIP, UPSERT, [scholarship.id])
         
         return {"message": f"Scholarship status updated to {'active' if scholarship.active else 'inactive'}"}
     except HTTPException:
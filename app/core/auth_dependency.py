@@ -1,11 +1,13 @@
 import json
 from typing import Optional
-from fastapi import HTTPException, status
+from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from app.core.firebase_auth import GoogleAuthBackend, AuthFailedException
+from app.core.config import settings
 from app.db.redis import redis
 
 security = HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)
 
 REDIS_USER_PREFIX = "user:"
 REDIS_USER_EXPIRY = 3600  # 1 hour cache
@@ -52,4 +54,28 @@ async def validate_token(token: str) -> dict:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e)
-        )
\ No newline at end of file
+        )
+
+async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> dict:
+    """The user of the request's bearer token"""
+    return await validate_token(credentials.credentials)
+
+async def get_optional_user(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security)
+) -> Optional[dict]:
+    """The user of the request's bearer token, or None for anonymous requests"""
+    if credentials is None:
+        return None
+    return await validate_token(credentials.credentials)
+
+def is_admin(user: Optional[dict]) -> bool:
+    return bool(user) and (user.get("email") or "").lower() in settings.ADMIN_EMAILS
+
+async def require_admin(user: dict = Depends(get_current_user)) -> dict:
+    """Let only users listed in ADMIN_EMAILS through"""
+    if not is_admin(user):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required"
+        )
+    return user
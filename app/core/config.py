@@ -1,4 +1,5 @@
 from pydantic import BaseModel
+from typing import List
 import os
 from dotenv import load_dotenv
 
@@ -15,11 +16,64 @@ class Settings(BaseModel):
     HOST: str = os.getenv("HOST", "0.0.0.0")
     PORT: int = int(os.getenv("PORT", 8000))
     
+    # College list cards (college_cards collection, maintained on write)
+    COLLEGE_CARDS_REBUILD_ON_START: bool = os.getenv("COLLEGE_CARDS_REBUILD_ON_START", "False") == "True"
+    
+    # Ranking leaderboards (college_rankings collection, maintained on write)
+    COLLEGE_RANKINGS_REBUILD_ON_START: bool = os.getenv("COLLEGE_RANKINGS_REBUILD_ON_START", "False") == "True"
+    COLLEGE_RANKINGS_CACHE_CONTROL: str = os.getenv("COLLEGE_RANKINGS_CACHE_CONTROL", "public, max-age=300")
+    
+    # Bulk college import (NDJSON validated in a process pool)
+    COLLEGE_IMPORT_WORKERS: int = int(os.getenv("COLLEGE_IMPORT_WORKERS", os.cpu_count() or 2))
+    COLLEGE_IMPORT_CHUNK_SIZE: int = int(os.getenv("COLLEGE_IMPORT_CHUNK_SIZE", 500))
+    
+    # Batch predictions (cutoff arrays shared read-only with a process pool)
+    PREDICTOR_BATCH_WORKERS: int = int(os.getenv("PREDICTOR_BATCH_WORKERS", os.cpu_count() or 2))
+    PREDICTOR_BATCH_CHUNK_SIZE: int = int(os.getenv("PREDICTOR_BATCH_CHUNK_SIZE", 1000))
+    # Batches above the public limits (body bytes, or student rows) need an admin
+    # token; the max limits apply to everyone
+    PREDICTOR_BATCH_PUBLIC_MAX_BYTES: int = int(os.getenv("PREDICTOR_BATCH_PUBLIC_MAX_BYTES", 1024 * 1024))
+    PREDICTOR_BATCH_PUBLIC_MAX_ROWS: int = int(os.getenv("PREDICTOR_BATCH_PUBLIC_MAX_ROWS", 5000))
+    PREDICTOR_BATCH_MAX_BYTES: int = int(os.getenv("PREDICTOR_BATCH_MAX_BYTES", 256 * 1024 * 1024))
+    PREDICTOR_BATCH_MAX_ROWS: int = int(os.getenv("PREDICTOR_BATCH_MAX_ROWS", 2000000))
+    
+    # Seat allocation simulations, cached per scenario. Runs above the public limits
+    # (applicants, or branch choices across the pool) need an admin token; the max
+    # limits apply to everyone
+    ALLOCATION_PUBLIC_MAX_APPLICANTS: int = int(os.getenv("ALLOCATION_PUBLIC_MAX_APPLICANTS", 50000))
+    ALLOCATION_PUBLIC_MAX_CHOICES: int = int(os.getenv("ALLOCATION_PUBLIC_MAX_CHOICES", 500000))
+    ALLOCATION_MAX_APPLICANTS: int = int(os.getenv("ALLOCATION_MAX_APPLICANTS", 2000000))
+    ALLOCATION_MAX_CHOICES: int = int(os.getenv("ALLOCATION_MAX_CHOICES", 20000000))
+    ALLOCATION_MAX_CONCURRENT: int = int(os.getenv("ALLOCATION_MAX_CONCURRENT", 1))
+    ALLOCATION_CACHE_TTL_SECONDS: int = int(os.getenv("ALLOCATION_CACHE_TTL_SECONDS", 3600))
+    
+    # College catalog (in-process snapshot of the list cards)
+    COLLEGE_CATALOG_ENABLED: bool = os.getenv("COLLEGE_CATALOG_ENABLED", "True") == "True"
+    COLLEGE_CATALOG_REFRESH_SECONDS: int = int(os.getenv("COLLEGE_CATALOG_REFRESH_SECONDS", 60))
+    
+    # Change feed: "redis" (pub/sub between workers), "change_stream" (needs a replica set) or "local"
+    CHANGE_FEED_MODE: str = os.getenv("CHANGE_FEED_MODE", "redis")
+    CHANGE_FEED_DEBOUNCE_SECONDS: float = float(os.getenv("CHANGE_FEED_DEBOUNCE_SECONDS", 0.2))
+    
+    # Response cache (in-process LRU backed by Redis)
+    RESPONSE_CACHE_ENABLED: bool = os.getenv("RESPONSE_CACHE_ENABLED", "True") == "True"
+    RESPONSE_CACHE_MAX_ENTRIES: int = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", 2048))
+    COLLEGE_LIST_CACHE_TTL_SECONDS: int = int(os.getenv("COLLEGE_LIST_CACHE_TTL_SECONDS", 120))
+    COLLEGE_DETAIL_CACHE_TTL_SECONDS: int = int(os.getenv("COLLEGE_DETAIL_CACHE_TTL_SECONDS", 600))
+    
+    # Cache-Control sent per route (empty to omit the header)
+    COLLEGE_LIST_CACHE_CONTROL: str = os.getenv("COLLEGE_LIST_CACHE_CONTROL", "public, max-age=30, stale-while-revalidate=120")
+    COLLEGE_DETAIL_CACHE_CONTROL: str = os.getenv("COLLEGE_DETAIL_CACHE_CONTROL", "public, max-age=60, stale-while-revalidate=300")
+    COLLEGE_FACETS_CACHE_CONTROL: str = os.getenv("COLLEGE_FACETS_CACHE_CONTROL", "public, max-age=120")
+    COLLEGE_SUGGEST_CACHE_CONTROL: str = os.getenv("COLLEGE_SUGGEST_CACHE_CONTROL", "public, max-age=300")
+    
     # File Upload
     MAX_FILE_SIZE: int = int(os.getenv("MAX_FILE_SIZE", 10 * 1024 * 1024))  # 10MB
     UPLOAD_DIR: str = os.getenv("UPLOAD_DIR", "uploads/")
 
     # Firebase
     SA_KEY_FILE: str = os.getenv("FIREBASE_SA_FILE", "secrets/serviceAccountKey.json")
+    # Verified emails allowed to write through the API (comma-separated)
+    ADMIN_EMAILS: List[str] = [email.strip().lower() for email in os.getenv("ADMIN_EMAILS", "").split(",") if email.strip()]
 
 settings = Settings()
@@ -29,7 +29,7 @@ class GoogleAuthBackend:
     @classmethod
     def get_instance(cls):
         if cls._instance is None:
-            cls._instance = GoogleAuthBackend({"SA_KEY_FILE": settings.FIREBASE_SA_FILE})
+            cls._instance = GoogleAuthBackend({"SA_KEY_FILE": settings.SA_KEY_FILE})
         return cls._instance
 
     def verify_token(self, token):
@@ -0,0 +1,41 @@
+import hashlib
+from typing import Optional, Any
+from fastapi import Response, status
+
+
+def make_etag(*parts: Any) -> str:
+    """Strong ETag from the given version parts."""
+    digest = hashlib.blake2b("|".join(str(part) for part in parts).encode(), digest_size=12)
+    return f'"{digest.hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Whether an If-None-Match header matches `etag`. If-None-Match uses the weak
+    comparison, so a W/ prefix on the client's tags is ignored.
+    """
+    if not if_none_match:
+        return False
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*":
+            return True
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag == etag:
+            return True
+    return False
+
+
+def set_cache_headers(response: Response, etag: Optional[str], cache_control: Optional[str]) -> None:
+    if etag:
+        response.headers["ETag"] = etag
+    if cache_control:
+        response.headers["Cache-Control"] = cache_control
+
+
+def not_modified(etag: str, cache_control: Optional[str]) -> Response:
+    """Empty 304 response carrying the validators a 200 would have sent."""
+    response = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    set_cache_headers(response, etag, cache_control)
+    return response
@@ -3,10 +3,13 @@ from beanie import init_beanie
 from typing import Optional
 from app.core.config import settings
 from app.models.college import College
+from app.models.college_card import CollegeCard
+from app.models.college_ranking import CollegeRankingEntry
 from app.models.faculty import Faculty
 from app.models.academics import AcademicStream, AcademicCourse
 from app.models.scholarship import Scholarship
 from app.models.junction import CollegeJunction
+from app.models.exam import ExamDistribution
 
 
 class MongoDB:
@@ -32,6 +35,14 @@ async def connect_to_mongo():
             database=mongodb.db,
             document_models=[
                 College,
+                CollegeCard,
+                CollegeRankingEntry,
+                Faculty,
+                AcademicStream,
+                AcademicCourse,
+                Scholarship,
+                CollegeJunction,
+                ExamDistribution,
             ]
         )
         print("✅ Beanie ODM initialized successfully!")
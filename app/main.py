@@ -1,3 +1,4 @@
+import asyncio
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
@@ -8,6 +9,17 @@ import os
 from app.api.v1.api import api_router
 from app.core.config import settings
 from app.db.mongo import connect_to_mongo, close_mongo_connection
+from app.models.college_card import CollegeCard
+from app.models.college_ranking import CollegeRankingEntry
+from app.services.college_card_service import CollegeCardService
+from app.services.college_ranking_service import CollegeRankingService
+from app.services.college_import import shutdown_pool
+from app.services.batch_predictor import shutdown_pool as shutdown_batch_pool
+from app.services.change_feed import change_feed
+from app.services.college_service import CollegeService
+from app.services.predictor_service import PredictorService
+from app.services.exam_service import ExamService
+from app.services import scholarship_index
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -19,8 +31,70 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         print(f"❌ Failed to connect to MongoDB: {e}")
         raise
+    
+    # The list endpoints read college_cards; build it when empty or when asked to
+    try:
+        if settings.COLLEGE_CARDS_REBUILD_ON_START or await CollegeCard.count() == 0:
+            print("🔄 Rebuilding college cards...")
+            count = await CollegeCardService.rebuild_all()
+            print(f"✅ College cards rebuilt: {count} cards")
+    except Exception as e:
+        print(f"⚠️ College cards not rebuilt: {e}")
+    
+    # Ranking leaderboards are derived the same way, from College.rankings
+    try:
+        if settings.COLLEGE_RANKINGS_REBUILD_ON_START or await CollegeRankingEntry.count() == 0:
+            print("🔄 Rebuilding ranking leaderboards...")
+            count = await CollegeRankingService.rebuild_all()
+            print(f"✅ Ranking leaderboards rebuilt: {count} entries")
+    except Exception as e:
+        print(f"⚠️ Ranking leaderboards not rebuilt: {e}")
+    
+    catalog_task = None
+    if settings.COLLEGE_CATALOG_ENABLED:
+        print("🔄 Loading college catalog...")
+        try:
+            snapshot = await CollegeService.refresh_catalog()
+            print(f"✅ College catalog loaded: {snapshot.size} colleges")
+        except Exception as e:
+            print(f"⚠️ College catalog not loaded, serving lists from MongoDB: {e}")
+        catalog_task = asyncio.create_task(
+            CollegeService.run_catalog_refresher(settings.COLLEGE_CATALOG_REFRESH_SECONDS)
+        )
+    
+    # Cutoff arrays for the predictor, kept current through the change feed
+    try:
+        table = await PredictorService.refresh()
+        print(f"✅ Cutoffs loaded: {table.rows} cutoffs over {table.size} branches")
+    except Exception as e:
+        print(f"⚠️ Cutoffs not loaded, predictions unavailable: {e}")
+    
+    # Score distributions for exam conversions, likewise
+    try:
+        count = await ExamService.refresh()
+        print(f"✅ Score distributions loaded: {count} exam sittings")
+    except Exception as e:
+        print(f"⚠️ Score distributions not loaded, conversions unavailable: {e}")
+    
+    # Scholarship eligibility tables for net costs
+    try:
+        table = await scholarship_index.refresh()
+        print(f"✅ Scholarships indexed: {table.size} active scholarships")
+    except Exception as e:
+        print(f"⚠️ Scholarships not indexed, net costs unavailable: {e}")
+    
+    # Other workers' writes reach this worker's caches and indexes through the change feed
+    change_task = change_feed.start()
+    if change_task:
+        print(f"📡 Change feed started ({settings.CHANGE_FEED_MODE})")
     yield
     # Shutdown
+    if catalog_task:
+        catalog_task.cancel()
+    if change_task:
+        change_task.cancel()
+    shutdown_pool()
+    shutdown_batch_pool()
     print("🔄 Closing MongoDB connection...")
     await close_mongo_connection()
     print("✅ MongoDB connection closed successfully!")
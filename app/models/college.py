@@ -2,7 +2,8 @@ from enum import Enum
 from typing import Optional, List, Dict
 from datetime import datetime
 from pydantic import BaseModel, Field
-from beanie import Document
+from beanie import Document, before_event, after_event, Insert, Replace, Save, SaveChanges, Update, Delete
+from pymongo import IndexModel
 
 
 class CollegeType(str, Enum):
@@ -330,5 +331,40 @@ class College(Document):
     is_active: bool = True
     is_deleted: bool = False
     
+    @before_event(Insert, Replace, Save, SaveChanges, Update)
+    def stamp_updated_at(self):
+        """Every write moves updated_at, which versions the cached detail and ETags."""
+        self.updated_at = datetime.utcnow()
+        if self.created_at is None:
+            self.created_at = self.updated_at
+
+    @after_event(Insert, Replace, Save, SaveChanges, Update)
+    async def sync_card(self):
+        """Keep the college_cards and college_rankings projections in step with this college and announce the write."""
+        from app.services.college_card_service import CollegeCardService
+        from app.services.college_ranking_service import CollegeRankingService
+        from app.services.change_feed import change_feed, COLLEGE, UPSERT
+        await CollegeCardService.sync_college(self.id)
+        await CollegeRankingService.sync_college(self.id)
+        await change_feed.publish(COLLEGE, UPSERT, [self.id])
+
+    @after_event(Delete)
+    async def remove_card(self):
+        from app.services.college_card_service import CollegeCardService
+        from app.services.college_ranking_service import CollegeRankingService
+        from app.services.change_feed import change_feed, COLLEGE, DELETE
+        await CollegeCardService.remove_card(self.id)
+        await CollegeRankingService.remove_college(self.id)
+        await change_feed.publish(COLLEGE, DELETE, [self.id])
+
     class Settings:
-        name = "colleges"
\ No newline at end of file
+        name = "colleges"
+        indexes = [
+            # Detail pages resolve slugs through this index; colleges without a slug are left out
+            IndexModel(
+                [("slug", 1)],
+                unique=True,
+                partialFilterExpression={"slug": {"$type": "string"}},
+                name="college_slug_unique"
+            ),
+        ]
\ No newline at end of file
@@ -0,0 +1,66 @@
+from typing import List, Optional
+from datetime import datetime
+from pydantic import BaseModel
+from beanie import Document
+from pymongo import IndexModel, TEXT, GEOSPHERE
+
+
+class GeoPoint(BaseModel):
+    type: str = "Point"
+    coordinates: List[float]  # [lng, lat], GeoJSON order
+
+
+# Denormalized list card for one listed College (same _id), kept in sync on every
+# College write so listing never loads the full College document
+class CollegeCard(Document):
+    name: str
+    short_name: Optional[str] = None
+    alias: Optional[str] = None
+    tags: Optional[List[str]] = []
+    slug: Optional[str] = None
+
+    location: str = ""  # city
+    state: str = ""
+    type: Optional[str] = None
+    category: Optional[str] = None
+    sub_category: Optional[str] = None
+    featured: bool = False
+
+    rating: Optional[float] = None
+    reviews: Optional[int] = None
+    ranking: Optional[int] = None  # best (lowest) rank across rankings
+    established: Optional[int] = None
+
+    # Display strings, formatted once on write
+    fees: Optional[str] = None
+    placement: Optional[str] = None
+    # Numeric values behind them, for sorting
+    fees_value: Optional[float] = None
+    placement_value: Optional[float] = None
+
+    courses: Optional[int] = None  # total number of courses
+    students: Optional[int] = None
+    image: Optional[str] = None
+
+    geo: Optional[GeoPoint] = None  # from Address.coordinates, absent when unknown
+
+    updated_at: Optional[datetime] = None  # College.updated_at this card was built from
+
+    class Settings:
+        name = "college_cards"
+        indexes = [
+            "state",
+            "category",
+            "type",
+            "featured",
+            [("ranking", 1), ("_id", 1)],
+            [("rating", -1), ("_id", -1)],
+            [("fees_value", -1), ("_id", -1)],
+            [("placement_value", -1), ("_id", -1)],
+            IndexModel([("geo", GEOSPHERE)], name="college_card_geo"),
+            IndexModel(
+                [("name", TEXT), ("short_name", TEXT), ("alias", TEXT), ("tags", TEXT)],
+                weights={"short_name": 4, "name": 3, "alias": 2, "tags": 1},
+                name="college_card_text_search"
+            ),
+        ]
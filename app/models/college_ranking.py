@@ -0,0 +1,39 @@
+from typing import Optional
+from beanie import Document, PydanticObjectId
+from pymongo import IndexModel
+
+DEFAULT_RANKING_CATEGORY = "Overall"
+
+
+# One row of a ranking leaderboard: a college's rank in one (organisation, category,
+# year) table, e.g. NIRF / Engineering / 2025. Derived from College.rankings on every
+# College write, with the list-card fields a leaderboard shows
+class CollegeRankingEntry(Document):
+    college_id: PydanticObjectId
+    organisation: str
+    category: str = DEFAULT_RANKING_CATEGORY
+    year: int
+    rank: int
+
+    name: str
+    short_name: Optional[str] = None
+    slug: Optional[str] = None
+    location: str = ""  # city
+    state: str = ""
+    image: Optional[str] = None
+
+    class Settings:
+        name = "college_rankings"
+        indexes = [
+            # Leaderboard slices, in rank order, and the latest year of a table. Ties
+            # break on college_id, which survives the rebuild of a college's rows
+            IndexModel(
+                [("organisation", 1), ("category", 1), ("year", -1), ("rank", 1), ("college_id", 1)],
+                name="college_ranking_leaderboard"
+            ),
+            # Rank history of one college
+            IndexModel(
+                [("college_id", 1), ("organisation", 1), ("category", 1), ("year", 1)],
+                name="college_ranking_history"
+            ),
+        ]
@@ -0,0 +1,25 @@
+from typing import List
+from datetime import date
+from beanie import Document
+from pydantic import Field
+from pymongo import IndexModel
+
+
+# Score distribution of one sitting of an entrance exam, e.g. JEE Main 2025, as
+# cumulative arrays: scores ascending, and for each score the rank of a candidate
+# scoring exactly that (1 + candidates scoring higher)
+class ExamDistribution(Document):
+    exam: str  # as listed in College.entrance_exams
+    exam_key: str  # exam normalized for lookups
+    year: int
+    total_candidates: int = Field(..., ge=1)
+    scores: List[float]
+    ranks: List[int]
+
+    updated_at: date = Field(default_factory=date.today)
+
+    class Settings:
+        name = "exam_distributions"
+        indexes = [
+            IndexModel([("exam_key", 1), ("year", -1)], name="exam_distribution_year", unique=True),
+        ]
@@ -4,6 +4,7 @@ from beanie import Document, Link
 from app.models.college import College
 from app.models.academics import AcademicStream
 from app.models.faculty import Faculty
+from app.models.scholarship import Category, Gender
 from enum import Enum
 
 class AcademicLevel(str, Enum):
@@ -21,6 +22,30 @@ class TeachingMode(str, Enum):
     OFFLINE = "Offline"
     HYBRID = "Hybrid"
 
+class Quota(str, Enum):
+    ALL_INDIA = "all_india"
+    HOME_STATE = "home_state"  # only for students from the college's state
+    OTHER_STATE = "other_state"  # only for students from outside it
+
+# Opening and closing rank of one counselling round, for one seat type
+class BranchCutoff(BaseModel):
+    exam: str  # one of College.entrance_exams, e.g. JEE Main
+    year: int
+    round: int = 1
+    category: Category = Category.GENERAL
+    gender: Gender = Gender.ANY  # ANY for gender-neutral seats
+    quota: Quota = Quota.ALL_INDIA
+    opening_rank: int
+    closing_rank: int
+
+# Seats of one seat type in one exam's counselling, e.g. OBC / female-only
+class BranchSeats(BaseModel):
+    exam: str  # one of College.entrance_exams
+    year: int
+    category: Category = Category.GENERAL  # GENERAL for open seats
+    gender: Gender = Gender.ANY  # ANY for gender-neutral seats
+    seats: int
+
 class HostelFacility(BaseModel):
     available: bool
     capacity: Optional[int]  # number of students it can accommodate
@@ -40,12 +65,16 @@ class CollegeJunction(Document):
     fees: float
     faculties: Optional[List[Link[Faculty]]] = []
     hostel_facility: Optional[HostelFacility] = None
+    cutoffs: Optional[List[BranchCutoff]] = []
+    seat_matrix: Optional[List[BranchSeats]] = []
 
     class Settings:
         name = "college_junction"
         # Add indexes for better query performance
         indexes = [
             [("college", 1), ("academic_stream", 1)],  # Compound index for unique college-stream pairs
+            [("college.$id", 1), ("academic_stream.$id", 1)],  # Branch list filters on the linked ids
+            "academic_stream.$id",
             "teaching_mode",
             "fees"
         ]
\ No newline at end of file
@@ -55,12 +55,14 @@ class AcademicCourseResponse(AcademicCourseBase):
 
 class AcademicStreamListResponse(BaseModel):
     streams: List[AcademicStreamResponse]
-    total: int
+    total: Optional[int] = None  # not counted in cursor mode
     page: int
     size: int
+    next_cursor: Optional[str] = None
 
 class AcademicCourseListResponse(BaseModel):
     courses: List[AcademicCourseResponse]
-    total: int
+    total: Optional[int] = None  # not counted in cursor mode
     page: int
-    size: int
\ No newline at end of file
+    size: int
+    next_cursor: Optional[str] = None
\ No newline at end of file
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, EmailStr, HttpUrl
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Any
 from datetime import datetime
 
 
@@ -393,10 +393,46 @@ class CollegeListItem(BaseModel):
 # College List Page Response
 class CollegeListPageResponse(BaseModel):
     colleges: List[CollegeListItem]
+    total: Optional[int] = None  # not counted in cursor mode
+    page: int
+    size: int
+    next_cursor: Optional[str] = None
+
+# Colleges Near a Point
+class NearbyCollegeItem(CollegeListItem):
+    distance_km: float
+
+class CollegeNearbyResponse(BaseModel):
+    colleges: List[NearbyCollegeItem]
     total: int
     page: int
     size: int
 
+# College Listing Facets (filter sidebar counts)
+class FacetCount(BaseModel):
+    value: str
+    count: int
+
+class CollegeFacetsResponse(BaseModel):
+    total: int
+    state: List[FacetCount] = []
+    category: List[FacetCount] = []
+    type: List[FacetCount] = []
+    sub_category: List[FacetCount] = []
+
+# College Autocomplete Schemas
+class CollegeSuggestion(BaseModel):
+    id: str
+    name: str
+    short_name: Optional[str] = None
+    alias: Optional[str] = None
+    slug: Optional[str] = None
+    location: Optional[str] = None  # city
+    state: Optional[str] = None
+
+class CollegeSuggestResponse(BaseModel):
+    suggestions: List[CollegeSuggestion]
+
 # College Detail Page Schemas
 class LocationDetail(BaseModel):
     address: str
@@ -548,6 +584,21 @@ class FundingDetail(BaseModel):
     class Config:
         populate_by_name = True
 
+class RankingDetail(BaseModel):
+    organisation: str
+    rank: int
+    year: int
+    category: Optional[str] = None
+
+class AccreditationDetail(BaseModel):
+    body: str
+    grade: Optional[str] = None
+    valid_until: Optional[str] = Field(None, alias="validUntil")
+    score: Optional[float] = None
+    
+    class Config:
+        populate_by_name = True
+
 # College Detail Page Response
 class CollegeDetailResponse(BaseModel):
     id: str = Field(alias="_id")
@@ -559,6 +610,8 @@ class CollegeDetailResponse(BaseModel):
     location: Optional[LocationDetail] = None
     contact: Optional[ContactDetail] = None
     ratings: Optional[RatingsDetail] = None
+    rankings: Optional[List[RankingDetail]] = []
+    accreditations: Optional[List[AccreditationDetail]] = []
     fees: Optional[FeesDetail] = None
     placement: Optional[PlacementDetail] = None
     academics: Optional[AcademicsDetail] = None
@@ -575,4 +628,80 @@ class CollegeDetailResponse(BaseModel):
     funding: Optional[FundingDetail] = None
     
     class Config:
-        populate_by_name = True
\ No newline at end of file
+        populate_by_name = True
+
+# College Comparison
+class CompareCollege(BaseModel):
+    id: str
+    name: str
+    short_name: Optional[str] = None
+    location: Optional[str] = None  # city
+
+class CompareRow(BaseModel):
+    section: str  # fees, placement, ratings, rankings, accreditations
+    key: str
+    label: str
+    values: List[Optional[Any]]  # one per college, in request order
+    best: List[int] = []  # indexes of the best values, when the metric has a direction
+
+class CollegeCompareResponse(BaseModel):
+    colleges: List[CompareCollege]
+    rows: List[CompareRow]
+    not_found: List[str] = []
+
+# Ranking Leaderboards
+class RankingEntryItem(BaseModel):
+    id: str  # college id
+    name: str
+    short_name: Optional[str] = None
+    slug: Optional[str] = None
+    location: str = ""  # city
+    state: str = ""
+    image: Optional[str] = None
+    rank: int
+
+class RankingLeaderboardResponse(BaseModel):
+    organisation: str
+    category: str
+    year: Optional[int] = None  # None when the table does not exist
+    colleges: List[RankingEntryItem]
+    total: Optional[int] = None  # not counted in cursor mode
+    page: int
+    size: int
+    next_cursor: Optional[str] = None
+
+class RankingBoard(BaseModel):
+    organisation: str
+    category: str
+    year: int
+    colleges: int
+
+class RankingBoardsResponse(BaseModel):
+    boards: List[RankingBoard]
+
+class RankHistoryPoint(BaseModel):
+    year: int
+    rank: int
+
+class RankHistorySeries(BaseModel):
+    organisation: str
+    category: str
+    points: List[RankHistoryPoint]  # oldest first
+
+class CollegeRankHistoryResponse(BaseModel):
+    college_id: str
+    series: List[RankHistorySeries]
+
+# Bulk Import Report
+class CollegeImportError(BaseModel):
+    line: int  # 1-based line of the NDJSON body
+    error: str
+
+class CollegeImportResponse(BaseModel):
+    received: int  # non-blank lines read
+    valid: int
+    inserted: int
+    failed: int
+    dry_run: bool = False
+    errors: List[CollegeImportError] = []
+    errors_truncated: bool = False  # more rows failed than are listed
\ No newline at end of file
@@ -0,0 +1,70 @@
+from pydantic import BaseModel, Field, model_validator
+from typing import Optional, List
+from datetime import date
+
+# Values converted in one request, per direction
+MAX_CONVERSIONS = 10000
+
+# Exam Distribution Schemas
+class ExamDistributionCreate(BaseModel):
+    total_candidates: int = Field(..., ge=1)
+    scores: List[float] = Field(..., min_length=2, max_length=100000)  # ascending
+    ranks: List[int] = Field(..., min_length=2, max_length=100000)  # rank at each score
+
+    @model_validator(mode="after")
+    def check_cumulative(self):
+        if len(self.scores) != len(self.ranks):
+            raise ValueError("scores and ranks must have the same length")
+        if any(later <= earlier for earlier, later in zip(self.scores, self.scores[1:])):
+            raise ValueError("scores must be strictly ascending")
+        if any(later > earlier for earlier, later in zip(self.ranks, self.ranks[1:])):
+            raise ValueError("ranks must not increase with the score")
+        if self.ranks[-1] < 1 or self.ranks[0] > self.total_candidates:
+            raise ValueError("ranks must lie between 1 and total_candidates")
+        return self
+
+class ExamDistributionSummary(BaseModel):
+    id: str = Field(alias="_id")
+    exam: str
+    year: int
+    total_candidates: int
+    points: int
+    min_score: float
+    max_score: float
+    updated_at: date
+    
+    class Config:
+        populate_by_name = True
+
+class ExamDistributionListResponse(BaseModel):
+    distributions: List[ExamDistributionSummary]
+
+class ConversionRequest(BaseModel):
+    year: Optional[int] = None  # defaults to the latest year of the exam
+    scores: Optional[List[float]] = Field(None, max_length=MAX_CONVERSIONS)
+    ranks: Optional[List[int]] = Field(None, max_length=MAX_CONVERSIONS)
+    percentiles: Optional[List[float]] = Field(None, max_length=MAX_CONVERSIONS)
+
+    @model_validator(mode="after")
+    def check_values(self):
+        if not (self.scores or self.ranks or self.percentiles):
+            raise ValueError("Give scores, ranks or percentiles to convert")
+        if self.ranks and min(self.ranks) < 1:
+            raise ValueError("ranks must be at least 1")
+        if self.percentiles and not all(0 <= value <= 100 for value in self.percentiles):
+            raise ValueError("percentiles must lie between 0 and 100")
+        return self
+
+# Parallel lists: entry i of each converts the i-th value given
+class ConvertedValues(BaseModel):
+    scores: List[float]
+    ranks: List[int]
+    percentiles: List[float]
+
+class ConversionResponse(BaseModel):
+    exam: str
+    year: int
+    total_candidates: int
+    from_scores: Optional[ConvertedValues] = None
+    from_ranks: Optional[ConvertedValues] = None
+    from_percentiles: Optional[ConvertedValues] = None
@@ -69,6 +69,7 @@ class FacultyResponse(FacultyBase):
 
 class FacultyListResponse(BaseModel):
     faculties: List[FacultyResponse]
-    total: int
+    total: Optional[int] = None  # not counted in cursor mode
     page: int
-    size: int
\ No newline at end of file
+    size: int
+    next_cursor: Optional[str] = None
\ No newline at end of file
@@ -1,6 +1,8 @@
 from pydantic import BaseModel, Field
 from typing import Optional, List
-from app.models.junction import AcademicLevel, DegreeType, TeachingMode, HostelFacility
+from pydantic import model_validator
+from app.models.junction import AcademicLevel, DegreeType, TeachingMode, HostelFacility, Quota
+from app.models.scholarship import Category, Gender
 
 # Hostel Facility Schemas
 class HostelFacilityCreate(BaseModel):
@@ -15,6 +17,37 @@ class HostelFacilityCreate(BaseModel):
 class HostelFacilityResponse(HostelFacilityCreate):
     pass
 
+# Cutoff Schemas
+class BranchCutoffCreate(BaseModel):
+    exam: str = Field(..., min_length=1, max_length=50)
+    year: int = Field(..., ge=1950, le=2100)
+    round: int = Field(1, ge=1, le=20)
+    category: Category = Category.GENERAL
+    gender: Gender = Gender.ANY
+    quota: Quota = Quota.ALL_INDIA
+    opening_rank: int = Field(..., ge=1)
+    closing_rank: int = Field(..., ge=1)
+    
+    @model_validator(mode="after")
+    def check_ranks(self):
+        if self.opening_rank > self.closing_rank:
+            raise ValueError("opening_rank must not be greater than closing_rank")
+        return self
+
+class BranchCutoffResponse(BranchCutoffCreate):
+    pass
+
+# Seat Matrix Schemas
+class BranchSeatsCreate(BaseModel):
+    exam: str = Field(..., min_length=1, max_length=50)
+    year: int = Field(..., ge=1950, le=2100)
+    category: Category = Category.GENERAL
+    gender: Gender = Gender.ANY
+    seats: int = Field(..., ge=0)
+
+class BranchSeatsResponse(BranchSeatsCreate):
+    pass
+
 # College Junction (Branch) Schemas
 class CollegeJunctionBase(BaseModel):
     academic_level: AcademicLevel
@@ -27,6 +60,8 @@ class CollegeJunctionCreate(CollegeJunctionBase):
     academic_stream_id: str
     faculty_ids: Optional[List[str]] = []
     hostel_facility: Optional[HostelFacilityCreate] = None
+    cutoffs: Optional[List[BranchCutoffCreate]] = []
+    seat_matrix: Optional[List[BranchSeatsCreate]] = []
 
 class CollegeJunctionUpdate(BaseModel):
     academic_level: Optional[AcademicLevel] = None
@@ -37,6 +72,37 @@ class CollegeJunctionUpdate(BaseModel):
     academic_stream_id: Optional[str] = None
     faculty_ids: Optional[List[str]] = None
     hostel_facility: Optional[HostelFacilityCreate] = None
+    cutoffs: Optional[List[BranchCutoffCreate]] = None
+    seat_matrix: Optional[List[BranchSeatsCreate]] = None
+
+# Linked documents embedded by `expand=`
+class BranchCollegeSummary(BaseModel):
+    id: str
+    name: str
+    short_name: Optional[str] = None
+    slug: Optional[str] = None
+    location: Optional[str] = None  # city
+    state: Optional[str] = None
+    logo: Optional[str] = None
+
+class BranchStreamSummary(BaseModel):
+    id: str
+    code: Optional[str] = None
+    title: str
+
+class BranchFacultySummary(BaseModel):
+    id: str
+    title: Optional[str] = None
+    first_name: str
+    middle_name: Optional[str] = None
+    last_name: Optional[str] = None
+    designation: Optional[str] = None
+    photo_url: Optional[str] = None
+
+class BranchExpansions(BaseModel):
+    college: Optional[BranchCollegeSummary] = None
+    academic_stream: Optional[BranchStreamSummary] = None
+    faculties: Optional[List[BranchFacultySummary]] = None
 
 class CollegeJunctionResponse(CollegeJunctionBase):
     id: str = Field(alias="_id")
@@ -44,12 +110,16 @@ class CollegeJunctionResponse(CollegeJunctionBase):
     academic_stream_id: str
     faculty_ids: Optional[List[str]] = []
     hostel_facility: Optional[HostelFacilityResponse] = None
+    cutoffs: Optional[List[BranchCutoffResponse]] = []
+    seat_matrix: Optional[List[BranchSeatsResponse]] = []
+    expanded: Optional[BranchExpansions] = None  # linked documents requested with expand=
     
     class Config:
         populate_by_name = True
 
 class CollegeJunctionListResponse(BaseModel):
     branches: List[CollegeJunctionResponse]
-    total: int
+    total: Optional[int] = None  # not counted in cursor mode
     page: int
-    size: int
\ No newline at end of file
+    size: int
+    next_cursor: Optional[str] = None
\ No newline at end of file
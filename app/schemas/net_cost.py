@@ -0,0 +1,31 @@
+from pydantic import BaseModel
+from typing import Optional, List
+from app.models.junction import AcademicLevel, DegreeType
+
+# Net Cost Schemas
+class NetCostScholarship(BaseModel):
+    scholarship_id: str
+    title: str
+    amount: float  # as awarded, or the middle of amount_range
+    amount_range: Optional[List[float]] = None
+
+# Yearly cost of one branch for a student: tuition plus hostel, less the best
+# scholarship the student is eligible for
+class BranchNetCost(BaseModel):
+    branch_id: str
+    college_id: str
+    college_name: str
+    college_slug: Optional[str] = None
+    stream_id: str
+    stream_title: Optional[str] = None
+    academic_level: AcademicLevel
+    degree_type: DegreeType
+    tuition: float
+    hostel: float
+    hostel_available: bool
+    scholarship: Optional[NetCostScholarship] = None
+    net_cost: float
+
+class NetCostResponse(BaseModel):
+    total: int  # branches matching, before the limit
+    branches: List[BranchNetCost]  # cheapest first
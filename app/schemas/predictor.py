@@ -0,0 +1,113 @@
+from pydantic import BaseModel, Field, model_validator
+from typing import Optional, List, Tuple
+from app.core.config import settings
+from app.models.junction import AcademicLevel, DegreeType, TeachingMode, Quota
+from app.models.scholarship import Category, Gender
+
+# Applicants accepted inline in a simulation request; larger pools are synthetic
+MAX_UPLOADED_APPLICANTS = 200000
+
+# One branch a student can expect, with the cutoff it was judged against
+class PredictedBranch(BaseModel):
+    branch_id: str
+    college_id: str
+    college_name: str
+    college_short_name: Optional[str] = None
+    college_slug: Optional[str] = None
+    location: Optional[str] = None  # city
+    state: Optional[str] = None
+    logo: Optional[str] = None
+    stream_id: str
+    stream_title: Optional[str] = None
+    academic_level: AcademicLevel
+    degree_type: DegreeType
+    teaching_mode: TeachingMode
+    fees: float
+    
+    year: int
+    round: int
+    category: Category
+    gender: Gender
+    quota: Quota
+    opening_rank: int
+    closing_rank: int
+
+class PredictionResponse(BaseModel):
+    exam: str
+    year: int
+    rank: int
+    category: Category
+    safe: List[PredictedBranch]
+    target: List[PredictedBranch]
+    reach: List[PredictedBranch]
+
+# Seat allocation simulation
+class SimulationApplicant(BaseModel):
+    id: Optional[str] = None
+    rank: int = Field(..., ge=1)
+    category: Category = Category.GENERAL
+    gender: Gender = Gender.ANY
+    choices: List[str] = Field(..., min_length=1, max_length=300)  # branch ids, most preferred first
+
+class SyntheticPool(BaseModel):
+    applicants: int = Field(..., ge=1, le=settings.ALLOCATION_MAX_APPLICANTS)
+    choices: int = Field(10, ge=1, le=100)  # per applicant
+    female_share: float = Field(0.2, ge=0, le=1)
+    seed: int = 0
+
+class AllocationScenario(BaseModel):
+    exam: str = Field(..., min_length=1)
+    year: int
+    applicants: Optional[List[SimulationApplicant]] = Field(None, max_length=MAX_UPLOADED_APPLICANTS)
+    synthetic: Optional[SyntheticPool] = None
+    student: Optional[SimulationApplicant] = None  # placed into the pool and reported on
+    include_programs: bool = False
+    
+    @model_validator(mode="after")
+    def check_pool(self):
+        if (self.applicants is None) == (self.synthetic is None):
+            raise ValueError("Give either applicants or synthetic")
+        if self.size()[1] > settings.ALLOCATION_MAX_CHOICES:
+            raise ValueError(f"At most {settings.ALLOCATION_MAX_CHOICES} branch choices can be simulated across the pool")
+        return self
+    
+    def size(self) -> Tuple[int, int]:
+        """Applicants in the pool, and their branch choices in total"""
+        if self.synthetic is not None:
+            applicants, choices = self.synthetic.applicants, self.synthetic.applicants * self.synthetic.choices
+        else:
+            applicants, choices = len(self.applicants), sum(len(applicant.choices) for applicant in self.applicants)
+        if self.student is not None:
+            applicants, choices = applicants + 1, choices + len(self.student.choices)
+        return applicants, choices
+
+class SimulatedProgram(BaseModel):
+    branch_id: str
+    college_id: str
+    category: Category
+    gender: Gender
+    seats: int
+    filled: int
+    opening_rank: Optional[int] = None
+    closing_rank: Optional[int] = None
+
+class StudentAllocation(BaseModel):
+    allotted: bool
+    branch_id: Optional[str] = None
+    college_id: Optional[str] = None
+    category: Optional[Category] = None
+    gender: Optional[Gender] = None
+    choice: Optional[int] = None  # 1-based position of the branch in the student's choices
+    closing_rank: Optional[int] = None
+
+class AllocationResponse(BaseModel):
+    scenario_hash: str
+    exam: str
+    year: int
+    applicants: int
+    seats: int
+    allotted: int
+    rounds: int
+    elapsed_ms: float
+    student: Optional[StudentAllocation] = None
+    programs: Optional[List[SimulatedProgram]] = None
@@ -58,6 +58,7 @@ class ScholarshipResponse(ScholarshipBase):
 
 class ScholarshipListResponse(BaseModel):
     scholarships: List[ScholarshipResponse]
-    total: int
+    total: Optional[int] = None  # not counted in cursor mode
     page: int
-    size: int
\ No newline at end of file
+    size: int
+    next_cursor: Optional[str] = None
\ No newline at end of file
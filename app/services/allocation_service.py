@@ -0,0 +1,174 @@
+import asyncio
+import hashlib
+import time
+from typing import Optional
+from app.core.config import settings
+from app.models.junction import CollegeJunction
+from app.schemas.predictor import (
+    AllocationScenario,
+    AllocationResponse,
+    SimulatedProgram,
+    StudentAllocation,
+)
+from app.services.cutoff_table import CATEGORIES, GENDERS, exam_key
+from app.services.response_cache import ResponseCache
+from app.services.seat_allocation import (
+    SeatMatrix,
+    ApplicantPool,
+    deferred_acceptance,
+    program_ranks,
+    category_codes,
+    gender_codes,
+)
+
+# Simulation results by scenario hash; a scenario is deterministic, so only the TTL
+# and a change to the seats (which changes the hash) retire an entry
+allocation_cache = ResponseCache(
+    "allocations",
+    max_entries=64,
+    ttl_seconds=settings.ALLOCATION_CACHE_TTL_SECONDS
+)
+
+# Simulations running at once in this worker; others wait their turn
+allocation_slots = asyncio.Semaphore(settings.ALLOCATION_MAX_CONCURRENT)
+
+
+class AllocationService:
+    @staticmethod
+    async def load_seat_matrix(exam: str, year: int) -> SeatMatrix:
+        """The seats of every branch for one exam and year."""
+        docs = await CollegeJunction.aggregate([
+            {"$match": {"seat_matrix.year": year}},
+            {"$project": {"college": 1, "seat_matrix": 1}},
+            {"$sort": {"_id": 1}},
+        ]).to_list()
+
+        key = exam_key(exam)
+        branch_ids, college_ids, entries = [], [], []
+        for doc in docs:
+            seats = [
+                entry for entry in doc.get("seat_matrix") or []
+                if entry["year"] == year and exam_key(entry["exam"]) == key
+            ]
+            if not seats:
+                continue
+            branch = len(branch_ids)
+            branch_ids.append(str(doc["_id"]))
+            college_ids.append(str(doc["college"].id))
+            entries.extend({**entry, "branch": branch} for entry in seats)
+        return await asyncio.to_thread(SeatMatrix, branch_ids, college_ids, entries)
+
+    @staticmethod
+    def scenario_hash(scenario: AllocationScenario, matrix: SeatMatrix) -> str:
+        """Hash of everything a simulation's result depends on: the request and the seats."""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(matrix.version.encode())
+        digest.update(scenario.model_dump_json().encode())
+        return digest.hexdigest()
+
+    @staticmethod
+    def simulate(scenario: AllocationScenario, matrix: SeatMatrix, scenario_hash: str) -> dict:
+        """Build the applicant pool, run the allocation and summarize it. CPU-bound."""
+        started = time.perf_counter()
+
+        def to_pool(applicants) -> ApplicantPool:
+            return ApplicantPool.from_lists(
+                [applicant.rank for applicant in applicants],
+                category_codes([applicant.category.value for applicant in applicants]),
+                gender_codes([applicant.gender.value for applicant in applicants]),
+                [
+                    [matrix.branch_index[branch_id] for branch_id in applicant.choices if branch_id in matrix.branch_index]
+                    for applicant in applicants
+                ]
+            )
+
+        if scenario.synthetic is not None:
+            synthetic = scenario.synthetic
+            pool = ApplicantPool.synthetic(
+                synthetic.applicants,
+                len(matrix.branch_ids),
+                synthetic.choices,
+                female_share=synthetic.female_share,
+                seed=synthetic.seed
+            )
+        else:
+            pool = to_pool(scenario.applicants)
+        if scenario.student is not None:
+            pool = pool.extend(to_pool([scenario.student]))
+
+        allocation = deferred_acceptance(pool, matrix)
+        ranks = program_ranks(pool, matrix, allocation)
+
+        student = None
+        if scenario.student is not None:
+            program = int(allocation.program[-1])
+            if program < 0:
+                student = StudentAllocation(allotted=False)
+            else:
+                branch = int(matrix.branch[program])
+                student = StudentAllocation(
+                    allotted=True,
+                    branch_id=matrix.branch_ids[branch],
+                    college_id=matrix.college_ids[branch],
+                    category=CATEGORIES[matrix.category[program]],
+                    gender=GENDERS[matrix.gender[program]],
+                    choice=int(allocation.choice[-1]) + 1,
+                    closing_rank=int(ranks["closing"][program])
+                )
+
+        programs = None
+        if scenario.include_programs:
+            filled = ranks["filled"].tolist()
+            opening = ranks["opening"].tolist()
+            closing = ranks["closing"].tolist()
+            programs = [
+                SimulatedProgram(
+                    branch_id=matrix.branch_ids[branch],
+                    college_id=matrix.college_ids[branch],
+                    category=CATEGORIES[category],
+                    gender=GENDERS[gender],
+                    seats=seats,
+                    filled=filled[program],
+                    opening_rank=opening[program] or None,
+                    closing_rank=closing[program] or None
+                )
+                for program, (branch, category, gender, seats) in enumerate(zip(
+                    matrix.branch.tolist(), matrix.category.tolist(), matrix.gender.tolist(), matrix.capacity.tolist()
+                ))
+            ]
+
+        return AllocationResponse(
+            scenario_hash=scenario_hash,
+            exam=scenario.exam,
+            year=scenario.year,
+            applicants=pool.size,
+            seats=int(matrix.capacity.sum()),
+            allotted=int((allocation.program >= 0).sum()),
+            rounds=allocation.rounds,
+            elapsed_ms=round((time.perf_counter() - started) * 1000, 1),
+            student=student,
+            programs=programs
+        ).model_dump(mode="json")
+
+    @staticmethod
+    async def run(scenario: AllocationScenario) -> Optional[AllocationResponse]:
+        """
+        Simulate a counselling round for a scenario; None when the exam has no seat
+        matrix for the year. Results are cached per scenario hash, so a repeated
+        scenario against unchanged seats costs one lookup.
+        """
+        matrix = await AllocationService.load_seat_matrix(scenario.exam, scenario.year)
+        if not matrix.size:
+            return None
+
+        scenario_hash = AllocationService.scenario_hash(scenario, matrix)
+
+        async def compute() -> dict:
+            async with allocation_slots:
+                return await asyncio.to_thread(AllocationService.simulate, scenario, matrix, scenario_hash)
+
+        if not settings.RESPONSE_CACHE_ENABLED:
+            data = await compute()
+        else:
+            data = await allocation_cache.get_or_compute(scenario_hash, compute)
+        return AllocationResponse(**data)
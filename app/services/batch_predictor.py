@@ -0,0 +1,351 @@
+import asyncio
+import csv
+import json
+import os
+import tempfile
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import IO, AsyncIterator, Dict, Iterator, List, Optional, Tuple, Any
+import numpy as np
+from app.core.config import settings
+from app.services.cutoff_table import CutoffTable, SeatProfile, CHANCES, CATEGORY_CODES, GENDER_CODES, exam_key, state_key
+from app.services.predictor_service import cutoff_index, PredictorUnavailableError
+
+# Request bodies are kept in memory up to this size, then spooled to disk
+SPOOL_MAX_BYTES = 8 * 1024 * 1024
+
+# Where the shared table file goes: /dev/shm keeps it in RAM where available
+SHARED_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+# Worker processes running predictions, started on the first batch
+pool: Optional[ProcessPoolExecutor] = None
+
+# In the API process: generation of the table last written out, the path of its
+# file, and every shared file still around by path, with the streams reading it.
+# A file is removed once it is neither current nor read by a running stream
+shared_generation: Optional[int] = None
+shared_path: Optional[str] = None
+shared_files: Dict[str, Dict[str, Any]] = {}  # path -> {"spec": ..., "streams": int}
+
+# Seat profiles a worker keeps for reuse by later students with the same profile
+MAX_PROFILES = 256
+
+# In a worker process: the tables mapped from shared files still in use, by path,
+# and each table's seat profiles, most recently used last
+attached: Dict[str, Tuple[CutoffTable, List[str], List[str]]] = {}
+profiles: Dict[str, "OrderedDict[tuple, Optional[SeatProfile]]"] = {}
+
+
+class BatchTooLargeError(Exception):
+    pass
+
+
+def get_pool() -> ProcessPoolExecutor:
+    global pool
+    if pool is None:
+        pool = ProcessPoolExecutor(max_workers=settings.PREDICTOR_BATCH_WORKERS)
+    return pool
+
+
+def shutdown_pool() -> None:
+    global pool, shared_generation, shared_path
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+        pool = None
+    for path in list(shared_files):
+        remove_file(path)
+    shared_files.clear()
+    shared_generation = shared_path = None
+
+
+def remove_file(path: str) -> None:
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+def write_shared(table: CutoffTable) -> Dict[str, Any]:
+    """
+    Write the table's arrays, plus branch and college ids, into one file laid out
+    for memory mapping. Workers map it read-only, so every process shares the same
+    pages instead of holding its own copy. Returns what a worker needs to map it.
+    """
+    arrays = table.arrays()
+    arrays["branch_ids"] = np.array([row["branch_id"] for row in table.branches], dtype="S24")
+    arrays["college_ids"] = np.array([row["college_id"] for row in table.branches], dtype="S24")
+
+    layout = {}
+    offset = 0
+    for name, array in arrays.items():
+        offset = -(-offset // 64) * 64  # keep every array aligned
+        layout[name] = (offset, array.dtype.str, array.shape)
+        offset += array.nbytes
+
+    fd, path = tempfile.mkstemp(prefix="cutoffs-", suffix=".bin", dir=SHARED_DIR)
+    with os.fdopen(fd, "wb") as file:
+        for name, array in arrays.items():
+            file.seek(layout[name][0])
+            file.write(np.ascontiguousarray(array).tobytes())
+        file.truncate(max(offset, 1))
+    return {"path": path, "layout": layout, "meta": table.meta()}
+
+
+def remove_unused_files() -> None:
+    """Remove shared files that are no longer current and that no running stream reads."""
+    for path, entry in list(shared_files.items()):
+        if path != shared_path and entry["streams"] == 0:
+            remove_file(path)  # mapped copies stay valid until dropped
+            del shared_files[path]
+
+
+def live_paths() -> List[str]:
+    """Shared files workers should keep mapped: the current one and those streams read."""
+    return list(shared_files)
+
+
+def attach(spec: Dict[str, Any], live: List[str]) -> Tuple[CutoffTable, List[str], List[str]]:
+    """
+    In a worker: the table of `spec`, mapped once per file and reused across chunks.
+    Mappings of files not in `live` (replaced and no longer read by any stream) are
+    dropped; the others stay, as chunks of older streams can still arrive.
+    """
+    for path in [path for path in attached if path not in live and path != spec["path"]]:
+        del attached[path]
+        profiles.pop(path, None)
+
+    entry = attached.get(spec["path"])
+    if entry is None:
+        raw = np.memmap(spec["path"], dtype=np.uint8, mode="r").view(np.ndarray)  # plain views index faster
+        arrays = {}
+        for name, (offset, dtype, shape) in spec["layout"].items():
+            dtype = np.dtype(dtype)
+            count = int(np.prod(shape))
+            arrays[name] = raw[offset:offset + count * dtype.itemsize].view(dtype).reshape(shape)
+        table = CutoffTable.from_arrays(arrays, spec["meta"])
+        ids = (arrays["branch_ids"].astype(str).tolist(), arrays["college_ids"].astype(str).tolist())
+        entry = attached[spec["path"]] = (table, *ids)
+        profiles[spec["path"]] = OrderedDict()
+    return entry
+
+
+def parse_student(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Read one student row; raises ValueError with a readable message."""
+    def optional(name: str) -> Optional[str]:
+        value = record.get(name)
+        value = str(value).strip() if value is not None else ""
+        return value or None
+
+    def positive_int(name: str) -> Optional[int]:
+        value = optional(name)
+        if value is None:
+            return None
+        try:
+            number = int(float(value))
+        except ValueError:
+            raise ValueError(f"{name}: '{value}' is not a number")
+        if number < 1:
+            raise ValueError(f"{name}: must be at least 1")
+        return number
+
+    rank = positive_int("rank")
+    exam = optional("exam")
+    if rank is None or exam is None:
+        raise ValueError("rank and exam are required")
+    category = (optional("category") or "general").lower()
+    if category not in CATEGORY_CODES:
+        raise ValueError(f"category: '{category}' is not one of {', '.join(CATEGORY_CODES)}")
+    gender = (optional("gender") or "any").lower()
+    if gender not in GENDER_CODES:
+        raise ValueError(f"gender: '{gender}' is not one of {', '.join(GENDER_CODES)}")
+    return {
+        "rank": rank,
+        "exam": exam,
+        "category": category,
+        "gender": gender,
+        "category_rank": positive_int("category_rank"),
+        "home_state": optional("home_state"),
+    }
+
+
+def get_profile(path: str, table: CutoffTable, student: Dict[str, Any]) -> Optional[SeatProfile]:
+    """The seat profile of a student, computed once per distinct profile and table in a worker."""
+    cached = profiles[path]
+    key = (exam_key(student["exam"]), student["category"], student["gender"], state_key(student["home_state"]))
+    if key in cached:
+        cached.move_to_end(key)
+        return cached[key]
+    profile = cached[key] = table.profile(
+        student["exam"], student["category"], student["gender"], student["home_state"]
+    )
+    if len(cached) > MAX_PROFILES:
+        cached.popitem(last=False)
+    return profile
+
+
+def predict_chunk(
+    spec: Dict[str, Any],
+    live: List[str],
+    header: Optional[List[str]],
+    rows: List[Tuple[int, str]],
+    limit: int
+) -> bytes:
+    """
+    Predict a chunk of students and return their NDJSON result lines. Rows are CSV
+    lines under `header`, or NDJSON objects without one. Runs in a worker process.
+    Students sharing a profile (exam, category, gender, home state) share its
+    seats, so each costs one pass over the branches, not over every cutoff.
+    """
+    table, branch_ids, college_ids = attach(spec, live)
+    branch_column = table.columns["branch"]
+    closing_column = table.columns["closing"]
+
+    if header is not None:
+        records = [dict(zip(header, values)) for values in csv.reader(text for _, text in rows)]
+    else:
+        records = []
+        for _, text in rows:
+            try:
+                record = json.loads(text)
+            except ValueError:
+                record = None
+            records.append(record if isinstance(record, dict) else None)
+
+    out = []
+    for (line, _), record in zip(rows, records):
+        result: Dict[str, Any] = {"line": line}
+        try:
+            if record is None:
+                raise ValueError("Not a JSON object")
+            result["student_id"] = record.get("student_id") or record.get("id")
+            student = parse_student(record)
+            profile = get_profile(spec["path"], table, student)
+            if profile is None:
+                raise ValueError(f"No cutoffs found for {student['exam']}")
+            predicted = profile.predict(student["rank"], student["category_rank"], limit)
+        except ValueError as e:
+            result["error"] = str(e)
+            out.append(json.dumps(result))
+            continue
+
+        result["exam"] = student["exam"]
+        result["year"] = profile.year
+        for chance in CHANCES:
+            picked = predicted[chance]
+            result[chance] = [
+                {"branch_id": branch_ids[branch], "college_id": college_ids[branch], "closing_rank": closing}
+                for branch, closing in zip(branch_column[picked].tolist(), closing_column[picked].tolist())
+            ]
+        out.append(json.dumps(result))
+    return ("\n".join(out) + "\n").encode() if out else b""
+
+
+def iter_file_lines(file: IO[bytes]) -> Iterator[Tuple[int, str]]:
+    """Non-blank lines of a spooled body with their 1-based line numbers."""
+    file.seek(0)
+    for line, raw in enumerate(file, start=1):
+        if raw.strip():
+            yield line, raw.decode("utf-8", errors="replace").rstrip("\r\n")
+
+
+class BatchPredictorService:
+    @staticmethod
+    async def spool(stream: AsyncIterator[bytes], max_bytes: int, max_lines: int) -> IO[bytes]:
+        """
+        Take in the whole request body before answering. Reading the body while the
+        response streams would compete with the server's disconnect listener. Stops
+        with BatchTooLargeError as soon as the body passes `max_bytes` or `max_lines`.
+        """
+        file = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+        size = lines = 0
+        last = b"\n"
+        try:
+            async for chunk in stream:
+                if not chunk:
+                    continue
+                size += len(chunk)
+                lines += chunk.count(b"\n")
+                last = chunk[-1:]
+                if size > max_bytes:
+                    raise BatchTooLargeError(f"Batch body is larger than {max_bytes} bytes")
+                if lines > max_lines:
+                    raise BatchTooLargeError(f"Batch has more than {max_lines} lines")
+                file.write(chunk)
+            if last != b"\n" and lines + 1 > max_lines:
+                raise BatchTooLargeError(f"Batch has more than {max_lines} lines")
+        except BaseException:
+            file.close()
+            raise
+        return file
+
+    @staticmethod
+    async def get_spec() -> Dict[str, Any]:
+        """The shared file of the current table, rewritten when the table was replaced."""
+        global shared_generation, shared_path
+        table = cutoff_index.table
+        if table is None:
+            raise PredictorUnavailableError("Cutoffs are not loaded yet")
+        generation = cutoff_index.generation
+        if generation != shared_generation:
+            spec = await asyncio.to_thread(write_shared, table)
+            shared_files[spec["path"]] = {"spec": spec, "streams": 0}
+            shared_generation, shared_path = generation, spec["path"]
+            remove_unused_files()
+        return shared_files[shared_path]["spec"]
+
+    @staticmethod
+    async def acquire_spec() -> Dict[str, Any]:
+        """The current shared file, kept until the stream taking it calls release_spec."""
+        spec = await BatchPredictorService.get_spec()
+        shared_files[spec["path"]]["streams"] += 1
+        return spec
+
+    @staticmethod
+    def release_spec(spec: Dict[str, Any]) -> None:
+        entry = shared_files.get(spec["path"])
+        if entry is not None:
+            entry["streams"] -= 1
+        remove_unused_files()
+
+    @staticmethod
+    async def predict_stream(file: IO[bytes], format: str, limit: int) -> AsyncIterator[bytes]:
+        """
+        Predict every student of a spooled CSV (with a header row) or NDJSON body,
+        yielding NDJSON results in input order. Chunks of rows go to the worker
+        pool a few ahead of the one being sent, so memory stays bounded by the
+        chunks in flight while every worker is kept busy.
+        """
+        loop = asyncio.get_running_loop()
+        executor = get_pool()
+        chunk_size = settings.PREDICTOR_BATCH_CHUNK_SIZE
+        max_in_flight = settings.PREDICTOR_BATCH_WORKERS * 2
+        spec = await BatchPredictorService.acquire_spec()
+
+        in_flight: List[asyncio.Future] = []
+        rows: List[Tuple[int, str]] = []
+        try:
+            lines = iter_file_lines(file)
+            header = None
+            if format == "csv":
+                first = next(lines, None)
+                if first is None:
+                    return
+                header = [name.strip().lower() for name in next(csv.reader([first[1]]))]
+
+            for row in lines:
+                rows.append(row)
+                if len(rows) >= chunk_size:
+                    in_flight.append(loop.run_in_executor(executor, predict_chunk, spec, live_paths(), header, rows, limit))
+                    rows = []
+                    if len(in_flight) >= max_in_flight:
+                        yield await in_flight.pop(0)
+            if rows:
+                in_flight.append(loop.run_in_executor(executor, predict_chunk, spec, live_paths(), header, rows, limit))
+            while in_flight:
+                yield await in_flight.pop(0)
+        finally:
+            for future in in_flight:
+                future.cancel()
+            file.close()
+            # Chunks already running in a worker keep their own mapping of the file
+            BatchPredictorService.release_spec(spec)
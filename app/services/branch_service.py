@@ -0,0 +1,142 @@
+from typing import List, Optional, Set
+from app.models.college import College
+from app.models.academics import AcademicStream
+from app.models.faculty import Faculty
+from app.models.junction import CollegeJunction
+from app.schemas.junction import CollegeJunctionResponse, CollegeJunctionListResponse
+from app.services.pagination import aggregate_page
+
+# expand= values, each joined with one $lookup on the link's DBRef id
+EXPANSIONS = {
+    "college": {
+        "from": College.Settings.name,
+        "local_field": "college.$id",
+        "as": "college",
+        "projection": {
+            "_id": 1,
+            "name": 1,
+            "short_name": 1,
+            "slug": 1,
+            "location": "$address.city",
+            "state": "$address.state",
+            "logo": "$images.logo",
+        },
+        "many": False,
+    },
+    "stream": {
+        "from": AcademicStream.Settings.name,
+        "local_field": "academic_stream.$id",
+        "as": "academic_stream",
+        "projection": {"_id": 1, "code": 1, "title": 1},
+        "many": False,
+    },
+    "faculties": {
+        "from": Faculty.Settings.name,
+        "local_field": "faculties.$id",
+        "as": "faculties",
+        "projection": {
+            "_id": 1,
+            "title": 1,
+            "first_name": 1,
+            "middle_name": 1,
+            "last_name": 1,
+            "designation": 1,
+            "photo_url": 1,
+        },
+        "many": True,
+    },
+}
+
+
+class InvalidExpandError(ValueError):
+    pass
+
+
+def parse_expand(expand: Optional[str]) -> Set[str]:
+    """Split an `expand=` value into known expansion names."""
+    if not expand:
+        return set()
+    names = {name.strip() for name in expand.split(",") if name.strip()}
+    unknown = names - set(EXPANSIONS)
+    if unknown:
+        raise InvalidExpandError(
+            f"Unknown expand value: {', '.join(sorted(unknown))}; expected any of {', '.join(EXPANSIONS)}"
+        )
+    return names
+
+
+def with_id(doc: dict) -> dict:
+    return {**doc, "id": str(doc.pop("_id"))}
+
+
+class BranchService:
+    @staticmethod
+    def expansion_stages(expand: Set[str]) -> List[dict]:
+        """$lookup stages joining the requested links into `expanded`, projected down to summaries."""
+        stages = []
+        for name in sorted(expand):
+            expansion = EXPANSIONS[name]
+            target = f"expanded.{expansion['as']}"
+            stages.append({"$lookup": {
+                "from": expansion["from"],
+                "localField": expansion["local_field"],
+                "foreignField": "_id",
+                "pipeline": [{"$project": expansion["projection"]}],
+                "as": target,
+            }})
+            if not expansion["many"]:
+                stages.append({"$set": {target: {"$first": f"${target}"}}})
+        return stages
+
+    @staticmethod
+    def to_response(doc: dict) -> CollegeJunctionResponse:
+        """Map a raw college_junction document (links stored as DBRefs) onto the response."""
+        expanded = doc.get("expanded")
+        if expanded:
+            expanded = {
+                "college": with_id(expanded["college"]) if expanded.get("college") else None,
+                "academic_stream": with_id(expanded["academic_stream"]) if expanded.get("academic_stream") else None,
+                "faculties": [with_id(faculty) for faculty in expanded["faculties"]] if "faculties" in expanded else None,
+            }
+        return CollegeJunctionResponse(
+            id=str(doc["_id"]),
+            college_id=str(doc["college"].id),
+            academic_stream_id=str(doc["academic_stream"].id),
+            faculty_ids=[str(faculty.id) for faculty in doc.get("faculties") or []],
+            academic_level=doc["academic_level"],
+            degree_type=doc["degree_type"],
+            teaching_mode=doc["teaching_mode"],
+            fees=doc["fees"],
+            hostel_facility=doc.get("hostel_facility"),
+            cutoffs=doc.get("cutoffs") or [],
+            seat_matrix=doc.get("seat_matrix") or [],
+            expanded=expanded
+        )
+
+    @staticmethod
+    async def list_branches(
+        query_filter: dict,
+        page: int,
+        size: int,
+        cursor: Optional[str] = None,
+        expand: Optional[Set[str]] = None
+    ) -> CollegeJunctionListResponse:
+        """
+        One page of branches in a single aggregation. Requested links are joined
+        after skip/limit, so only the page's rows are looked up.
+        """
+        result = await aggregate_page(
+            CollegeJunction,
+            query_filter,
+            page,
+            size,
+            cursor,
+            item_stages=BranchService.expansion_stages(expand or set())
+        )
+        return CollegeJunctionListResponse(
+            branches=[BranchService.to_response(doc) for doc in result.items],
+            total=result.total,
+            page=page,
+            size=size,
+            next_cursor=result.next_cursor
+        )
@@ -0,0 +1,154 @@
+import asyncio
+import json
+import uuid
+from typing import Awaitable, Callable, Dict, List, NamedTuple, Optional
+from app.core.config import settings
+from app.db.mongo import mongodb
+from app.db.redis import redis
+
+# Entities whose writes are announced
+COLLEGE = "college"
+BRANCH = "branch"
+SCHOLARSHIP = "scholarship"
+EXAM = "exam"
+
+UPSERT = "upsert"
+DELETE = "delete"
+
+# Redis channel shared by every worker
+CHANNEL = "changes"
+
+# Collections watched per entity in change-stream mode. Colleges are watched through
+# their cards, which only the API's College write hooks rebuild: a college edited
+# directly in MongoDB is not picked up until the cards are rebuilt, e.g. on a start
+# with COLLEGE_CARDS_REBUILD_ON_START
+WATCHED_COLLECTIONS = {
+    "college_cards": COLLEGE,
+    "college_junction": BRANCH,
+    "scholarships": SCHOLARSHIP,
+    "exam_distributions": EXAM,
+}
+
+RECONNECT_SECONDS = 5
+
+
+class ChangeEvent(NamedTuple):
+    entity: str  # college, branch, scholarship or exam
+    op: str  # upsert or delete
+    ids: List[str]
+    origin: str  # worker that made the write
+
+
+Handler = Callable[[ChangeEvent], Awaitable[None]]
+
+
+class ChangeFeed:
+    """
+    Write notifications for in-process caches and indexes.
+
+    Writers call `publish` after a create, update or delete. Consumers registered
+    with `subscribe` receive the event right away in the writing worker, and in
+    every other worker through Redis pub/sub, so each one can apply the delta
+    (re-read or drop the changed documents) instead of reloading everything.
+    Where MongoDB runs as a replica set, `CHANGE_FEED_MODE=change_stream` has every
+    worker, the writer included, follow a change stream instead; `publish` then
+    leaves delivery to the stream. That also catches branch, scholarship and exam
+    writes made outside the API, but colleges only through their cards, i.e. API
+    writes (see WATCHED_COLLECTIONS). Handlers must be idempotent: an event can
+    arrive more than once.
+    """
+
+    def __init__(self):
+        self.worker_id = uuid.uuid4().hex
+        self.handlers: Dict[str, List[Handler]] = {}
+        self.stats = {"published": 0, "received": 0, "handler_errors": 0, "redis_errors": 0}
+
+    def subscribe(self, entity: str, handler: Handler) -> None:
+        self.handlers.setdefault(entity, []).append(handler)
+
+    async def dispatch(self, event: ChangeEvent) -> None:
+        for handler in self.handlers.get(event.entity, []):
+            try:
+                await handler(event)
+            except Exception as e:
+                self.stats["handler_errors"] += 1
+                print(f"❌ Change handler failed for {event.entity} {event.op}: {e}")
+
+    async def publish(self, entity: str, op: str, ids: List[str]) -> None:
+        """Announce a write: handle it in this worker, then fan it out to the others."""
+        if not ids or settings.CHANGE_FEED_MODE == "change_stream":
+            # The change stream reports the write to every worker, this one included
+            return
+        event = ChangeEvent(entity=entity, op=op, ids=[str(i) for i in ids], origin=self.worker_id)
+        self.stats["published"] += 1
+        await self.dispatch(event)
+
+        if settings.CHANGE_FEED_MODE != "redis":
+            return
+        try:
+            await redis.publish(CHANNEL, json.dumps(event._asdict()))
+        except Exception:
+            self.stats["redis_errors"] += 1
+
+    async def listen_redis(self) -> None:
+        """Apply events published by other workers."""
+        while True:
+            pubsub = redis.pubsub()
+            try:
+                await pubsub.subscribe(CHANNEL)
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    event = ChangeEvent(**json.loads(message["data"]))
+                    if event.origin == self.worker_id:
+                        continue
+                    self.stats["received"] += 1
+                    await self.dispatch(event)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.stats["redis_errors"] += 1
+                print(f"⚠️ Change feed subscription lost, retrying: {e}")
+                await asyncio.sleep(RECONNECT_SECONDS)
+            finally:
+                await pubsub.aclose()
+
+    async def watch_change_stream(self) -> None:
+        """Apply every write to the watched collections, as reported by MongoDB."""
+        pipeline = [{"$match": {
+            "ns.coll": {"$in": list(WATCHED_COLLECTIONS)},
+            "operationType": {"$in": ["insert", "update", "replace", "delete"]},
+        }}]
+        resume_token = None
+        while True:
+            try:
+                async with mongodb.db.watch(pipeline, resume_after=resume_token) as stream:
+                    async for change in stream:
+                        resume_token = stream.resume_token
+                        event = ChangeEvent(
+                            entity=WATCHED_COLLECTIONS[change["ns"]["coll"]],
+                            op=DELETE if change["operationType"] == "delete" else UPSERT,
+                            ids=[str(change["documentKey"]["_id"])],
+                            origin="mongodb"
+                        )
+                        self.stats["received"] += 1
+                        await self.dispatch(event)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"⚠️ Change stream interrupted, resuming: {e}")
+                await asyncio.sleep(RECONNECT_SECONDS)
+
+    def start(self) -> Optional[asyncio.Task]:
+        """Start receiving other workers' writes; None in local mode."""
+        if settings.CHANGE_FEED_MODE == "redis":
+            return asyncio.create_task(self.listen_redis())
+        if settings.CHANGE_FEED_MODE == "change_stream":
+            return asyncio.create_task(self.watch_change_stream())
+        return None
+
+    def get_stats(self) -> dict:
+        return {**self.stats, "mode": settings.CHANGE_FEED_MODE, "worker_id": self.worker_id}
+
+
+change_feed = ChangeFeed()
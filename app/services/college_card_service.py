@@ -0,0 +1,131 @@
+from typing import Optional, List, Any
+from bson import ObjectId
+from pymongo import ReplaceOne, DeleteOne
+from app.db.mongo import mongodb
+from app.models.college import College
+from app.models.college_card import CollegeCard
+
+COURSE_LEVELS = ["undergraduate", "postgraduate", "phd", "diploma", "certificate"]
+
+# Shapes a College document into the raw fields of its CollegeCard
+CARD_SOURCE_PROJECTION = {
+    "_id": 1,
+    "name": 1,
+    "short_name": 1,
+    "alias": 1,
+    "tags": 1,
+    "slug": 1,
+    "location": "$address.city",
+    "state": "$address.state",
+    "rating": "$ratings.overall",
+    "reviews": "$ratings.total_reviews",
+    "type": 1,
+    "category": 1,
+    "sub_category": 1,
+    "established": "$established_year",
+    "fees": "$fees.total",
+    "fees_value": {
+        "$convert": {"input": "$fees.total", "to": "double", "onError": None, "onNull": None}
+    },
+    "placement": "$placement.average_package",
+    "placement_value": {
+        "$convert": {"input": "$placement.average_package", "to": "double", "onError": None, "onNull": None}
+    },
+    "ranking": {"$min": "$rankings.rank"},
+    "featured": 1,
+    "courses": {
+        "$add": [
+            {"$size": {"$ifNull": [f"$academics.courses.{level}", []]}}
+            for level in COURSE_LEVELS
+        ]
+    },
+    "students": "$academics.total_students",
+    "image": "$images.logo",
+    "geo": {
+        "$cond": [
+            {"$and": [
+                {"$isNumber": "$address.coordinates.lat"},
+                {"$isNumber": "$address.coordinates.lng"},
+            ]},
+            {"type": "Point", "coordinates": ["$address.coordinates.lng", "$address.coordinates.lat"]},
+            "$$REMOVE",
+        ]
+    },
+    "updated_at": 1,
+    "listed": {
+        "$and": [{"$ne": ["$is_deleted", True]}, {"$eq": ["$is_active", True]}]
+    },
+}
+
+SYNC_BATCH_SIZE = 1000
+
+
+def format_fees(value: Optional[float], raw: Any = None) -> Optional[str]:
+    """Format a fee amount in rupees for display, e.g. 250000 -> '₹2.5 Lakhs'."""
+    if value is None:
+        return raw
+    return f"₹{value / 100000:.1f} Lakhs"
+
+
+def format_placement(value: Optional[float], raw: Any = None) -> Optional[str]:
+    """Format an annual package in rupees for display, e.g. 2500000 -> '₹25 LPA'."""
+    if value is None:
+        return raw
+    return f"₹{value / 100000:.0f} LPA"
+
+
+class CollegeCardService:
+    @staticmethod
+    def to_card(doc: dict) -> dict:
+        """Convert a College projected with CARD_SOURCE_PROJECTION into a college_cards document."""
+        card = dict(doc)
+        card.pop("listed", None)
+        card["location"] = card.get("location") or ""
+        card["state"] = card.get("state") or ""
+        card["featured"] = bool(card.get("featured"))
+        card["fees"] = format_fees(card.get("fees_value"), card.get("fees"))
+        card["placement"] = format_placement(card.get("placement_value"), card.get("placement"))
+        return card
+
+    @staticmethod
+    async def sync_cards(match: dict) -> List[ObjectId]:
+        """
+        Rebuild the cards of the colleges matching `match`: listed colleges get their
+        card replaced, inactive or soft-deleted ones lose it. Returns the ids seen.
+        """
+        collection = mongodb.db[CollegeCard.Settings.name]
+        pipeline = [{"$match": match}, {"$project": CARD_SOURCE_PROJECTION}]
+
+        seen = []
+        operations = []
+        async for doc in mongodb.db[College.Settings.name].aggregate(pipeline, batchSize=SYNC_BATCH_SIZE):
+            seen.append(doc["_id"])
+            if doc.get("listed"):
+                operations.append(ReplaceOne({"_id": doc["_id"]}, CollegeCardService.to_card(doc), upsert=True))
+            else:
+                operations.append(DeleteOne({"_id": doc["_id"]}))
+            if len(operations) >= SYNC_BATCH_SIZE:
+                await collection.bulk_write(operations, ordered=False)
+                operations = []
+
+        if operations:
+            await collection.bulk_write(operations, ordered=False)
+        return seen
+
+    @staticmethod
+    async def sync_college(college_id: ObjectId) -> None:
+        """Bring one college's card up to date after a write; drops it if the college is gone."""
+        seen = await CollegeCardService.sync_cards({"_id": college_id})
+        if not seen:
+            await CollegeCardService.remove_card(college_id)
+
+    @staticmethod
+    async def remove_card(college_id: ObjectId) -> None:
+        await mongodb.db[CollegeCard.Settings.name].delete_one({"_id": college_id})
+
+    @staticmethod
+    async def rebuild_all() -> int:
+        """Rebuild every card from the colleges collection and drop orphaned cards."""
+        seen = await CollegeCardService.sync_cards({})
+        await mongodb.db[CollegeCard.Settings.name].delete_many({"_id": {"$nin": seen}})
+        return await CollegeCard.count()
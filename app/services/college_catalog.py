@@ -0,0 +1,256 @@
+import hashlib
+import json
+from typing import Optional, List, Dict, Tuple, Any
+import numpy as np
+
+
+# Numeric columns kept per college, one per `sortBy` value
+SORT_COLUMNS = ["ranking", "rating", "fees", "placement"]
+
+# Categorical list filters answered from per-value bitmaps
+BITMAP_FIELDS = ["state", "type", "category", "sub_category", "featured"]
+
+
+def row_digest(row: dict) -> int:
+    """64-bit content hash of one formatted row."""
+    encoded = json.dumps(row, sort_keys=True, default=str).encode()
+    return int.from_bytes(hashlib.blake2b(encoded, digest_size=8).digest(), "big")
+
+
+class CatalogPage:
+    def __init__(self, rows: List[dict], total: int, next_row: Optional[int]):
+        self.rows = rows
+        self.total = total
+        self.next_row = next_row  # last row of the page when more rows follow
+
+
+class CatalogSnapshot:
+    """
+    Immutable, array-backed view of the college list cards.
+
+    Rows are the pre-formatted CollegeListItem payloads. Numeric sort fields are
+    NumPy columns (NaN for missing), each categorical filter value has a boolean
+    bitmap over the rows, and one sort permutation is precomputed per `sortBy`
+    field so a list query is a few vectorized mask operations and a slice.
+    """
+
+    def __init__(
+        self,
+        rows: List[dict],
+        sort_values: Dict[str, List[Optional[float]]],
+        filter_values: Dict[str, List[Any]],
+        versions: Optional[List[Optional[str]]] = None,
+        digests: Optional[List[int]] = None
+    ):
+        self.rows = rows
+        self.size = len(rows)
+        self.ids = [row["id"] for row in rows]
+        self.row_index = {college_id: i for i, college_id in enumerate(self.ids)}
+        self.versions = dict(zip(self.ids, versions or []))  # college_id -> per-college version
+
+        # Content hash of the rows: equal across workers holding the same data, so it
+        # can key caches shared between them. XOR of the row digests, so it does not
+        # depend on row order and only changed rows need hashing
+        if digests is None:
+            digests = [row_digest(row) for row in rows]
+        combined = np.bitwise_xor.reduce(np.array(digests, dtype=np.uint64)) if digests else 0
+        self.version = f"{int(combined):016x}"
+
+        self.columns = {
+            field: np.array([np.nan if v is None else v for v in sort_values[field]], dtype=np.float64)
+            for field in SORT_COLUMNS
+        }
+
+        # Dictionary-encode each categorical field, then one bitmap per distinct value
+        self.codes: Dict[str, np.ndarray] = {}
+        self.code_values: Dict[str, List[Any]] = {}
+        self.bitmaps: Dict[str, Dict[Any, np.ndarray]] = {}
+        for field in BITMAP_FIELDS:
+            codes: Dict[Any, int] = {}
+            encoded = np.fromiter(
+                (codes.setdefault(value, len(codes)) for value in filter_values[field]),
+                dtype=np.int32,
+                count=self.size
+            )
+            self.codes[field] = encoded
+            self.code_values[field] = list(codes)
+            self.bitmaps[field] = {value: encoded == code for value, code in codes.items()}
+
+        # Rank of each row by _id; ObjectId hex strings order the same way as ObjectIds
+        id_order = np.argsort(np.array(self.ids, dtype=object), kind="stable") if self.size else np.array([], dtype=np.intp)
+        id_rank = np.empty(self.size, dtype=np.int64)
+        id_rank[id_order] = np.arange(self.size)
+
+        # Descending permutations match MongoDB's {field: -1, _id: -1}: nulls last, ties by _id
+        self.permutations = {"_id": id_order.astype(np.intp)}
+        for field in SORT_COLUMNS:
+            self.permutations[field] = np.lexsort((-id_rank, -self.columns[field]))
+
+        self.positions = {}
+        for field, perm in self.permutations.items():
+            position = np.empty(self.size, dtype=np.int64)
+            position[perm] = np.arange(self.size)
+            self.positions[field] = position
+
+    def sort_value(self, field: Optional[str], row: int) -> Optional[float]:
+        if field is None:
+            return None
+        value = self.columns[field][row]
+        return None if np.isnan(value) else float(value)
+
+    def mask(self, filters: Dict[str, Any], ranked_rows: Optional[np.ndarray] = None) -> Optional[np.ndarray]:
+        """
+        Boolean mask of rows matching all equality filters (and among `ranked_rows`
+        when given); None if a filter is unsupported.
+        """
+        if ranked_rows is None:
+            mask = np.ones(self.size, dtype=bool)
+        else:
+            mask = np.zeros(self.size, dtype=bool)
+            mask[ranked_rows] = True
+
+        for field, value in filters.items():
+            if field not in self.bitmaps or isinstance(value, dict):
+                return None
+            bitmap = self.bitmaps[field].get(value)
+            if bitmap is None:
+                return np.zeros(self.size, dtype=bool)
+            mask &= bitmap
+        return mask
+
+    def facet_counts(self, mask: np.ndarray, fields: List[str]) -> Dict[str, Dict[Any, int]]:
+        """Count matching rows per value of each categorical field, one bincount per field."""
+        counts = {}
+        for field in fields:
+            values = self.code_values[field]
+            per_code = np.bincount(self.codes[field][mask], minlength=len(values))
+            counts[field] = {
+                values[code]: int(count)
+                for code, count in enumerate(per_code)
+                if count and values[code] is not None
+            }
+        return counts
+
+    def permutation(self, sort_by: Optional[str], direction: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Row permutation for the sort and each row's position in it."""
+        key = sort_by or "_id"
+        perm = self.permutations[key]
+        position = self.positions[key]
+        # The _id permutation is ascending, the sort columns descending
+        natural = 1 if key == "_id" else -1
+        if direction != natural:
+            perm = perm[::-1]
+            position = self.size - 1 - position
+        return perm, position
+
+    def query(
+        self,
+        filters: Dict[str, Any],
+        sort_by: Optional[str],
+        direction: int,
+        offset: int,
+        limit: int,
+        after_id: Optional[str] = None,
+        ranked_rows: Optional[np.ndarray] = None
+    ) -> Optional[CatalogPage]:
+        """
+        Answer a list query from the snapshot. `ranked_rows` restricts the result to
+        search hits and, without a sort field, orders it by their rank. Returns None
+        when the query cannot be answered here (unsupported filter, or the cursor row
+        is not part of this snapshot).
+        """
+        mask = self.mask(filters, ranked_rows)
+        if mask is None:
+            return None
+
+        if ranked_rows is not None and sort_by is None:
+            order = ranked_rows[mask[ranked_rows]]
+            matched = None
+        else:
+            perm, position = self.permutation(sort_by, direction)
+            matched = mask[perm]
+            order = perm[matched]
+        total = int(order.size)
+
+        if after_id is not None:
+            row = self.row_index.get(after_id)
+            if row is None:
+                return None
+            if matched is not None:
+                # Number of matching rows up to and including the cursor row
+                offset = int(np.count_nonzero(matched[:position[row] + 1]))
+            else:
+                found = np.flatnonzero(order == row)
+                if not found.size:
+                    return None
+                offset = int(found[0]) + 1
+
+        page_rows = order[offset:offset + limit]
+        has_more = offset + page_rows.size < total
+        next_row = int(page_rows[-1]) if page_rows.size and has_more else None
+
+        return CatalogPage(
+            rows=[self.rows[i] for i in page_rows],
+            total=total,
+            next_row=next_row
+        )
+
+
+class CollegeCatalog:
+    """Holds the current snapshot; refreshes swap in a fully built snapshot in one assignment."""
+
+    def __init__(self):
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self.generation = 0  # bumped on every swap, for caches derived from the snapshot
+        self.docs: Dict[str, dict] = {}  # college_id -> doc the current snapshot was built from
+        # college_id -> version served from the catalog; replaced, never mutated, so
+        # readers holding the previous map are unaffected
+        self.versions: Dict[str, str] = {}
+
+    @property
+    def snapshot(self) -> Optional[CatalogSnapshot]:
+        return self._snapshot
+
+    def replace(self, snapshot: CatalogSnapshot, docs: List[dict]) -> None:
+        self._snapshot = snapshot
+        self.docs = {doc["row"]["id"]: doc for doc in docs}
+        self.versions = snapshot.versions
+        self.generation += 1
+
+    def drop_version(self, college_id: str) -> Optional[str]:
+        """
+        Stop serving a college's version until the next swap, so it is read from
+        MongoDB meanwhile. Returns the version dropped.
+        """
+        previous = self.versions.get(college_id)
+        if previous is not None:
+            self.versions = {key: value for key, value in self.versions.items() if key != college_id}
+        return previous
+
+    def apply(self, upserts: List[dict], removed: List[str]) -> Tuple[CatalogSnapshot, List[dict]]:
+        """
+        Build a snapshot with some colleges replaced, added or dropped, from the docs
+        of the current one, so a change costs a rebuild of the arrays but no reload.
+        Unchanged rows keep the digests they were hashed with.
+        """
+        docs = dict(self.docs)
+        for college_id in removed:
+            docs.pop(college_id, None)
+        for doc in upserts:
+            docs[doc["row"]["id"]] = doc
+        merged = list(docs.values())
+        return self.build(merged), merged
+
+    @staticmethod
+    def build(docs: List[dict]) -> CatalogSnapshot:
+        """
+        Build a snapshot from list-card documents. Each doc carries the formatted
+        CollegeListItem fields under "row" and the raw numeric sort keys, filter
+        values, per-college "version" and optionally the row's "digest" alongside it.
+        """
+        rows = [doc["row"] for doc in docs]
+        sort_values = {field: [doc.get(field) for doc in docs] for field in SORT_COLUMNS}
+        filter_values = {field: [doc.get(field) for doc in docs] for field in BITMAP_FIELDS}
+        versions = [doc.get("version") for doc in docs]
+        digests = [doc["digest"] if "digest" in doc else row_digest(doc["row"]) for doc in docs]
+        return CatalogSnapshot(rows, sort_values, filter_values, versions, digests)
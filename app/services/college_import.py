@@ -0,0 +1,192 @@
+import asyncio
+import json
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import AsyncIterator, List, Optional, Tuple
+from beanie.odm.utils.encoder import Encoder
+from bson import ObjectId
+from pydantic import ValidationError
+from pymongo.errors import BulkWriteError
+from app.core.config import settings
+from app.db.mongo import mongodb
+from app.models.college import College, CollegeType, CollegeCategory, CollegeSubCategory
+from app.schemas.college import CollegeCreateRequest, CollegeImportResponse, CollegeImportError
+from app.services.college_card_service import CollegeCardService
+from app.services.college_ranking_service import CollegeRankingService
+from app.services.change_feed import change_feed, COLLEGE, UPSERT
+
+# Failed rows listed in the report; the rest are only counted
+MAX_REPORTED_ERRORS = 1000
+
+# College fields stored as enums, which CollegeCreateRequest accepts as plain strings
+ENUM_FIELDS = {
+    "type": CollegeType,
+    "category": CollegeCategory,
+    "sub_category": CollegeSubCategory,
+}
+
+# Worker processes validating chunks, started on the first import
+pool: Optional[ProcessPoolExecutor] = None
+
+
+def describe_validation_error(error: ValidationError) -> str:
+    messages = []
+    for detail in error.errors()[:5]:
+        location = ".".join(str(part) for part in detail["loc"])
+        messages.append(f"{location}: {detail['msg']}" if location else detail["msg"])
+    if error.error_count() > 5:
+        messages.append(f"and {error.error_count() - 5} more")
+    return "; ".join(messages)
+
+
+def validate_chunk(rows: List[Tuple[int, str]]) -> Tuple[List[Tuple[int, dict]], List[Tuple[int, str]]]:
+    """
+    Validate NDJSON lines against CollegeCreateRequest and shape them as College
+    documents. Runs in a worker process, so it only takes and returns plain data.
+    """
+    documents = []
+    errors = []
+    for line, text in rows:
+        try:
+            request = CollegeCreateRequest.model_validate_json(text)
+        except ValidationError as e:
+            errors.append((line, describe_validation_error(e)))
+            continue
+
+        # Encoded the way Beanie stores documents, e.g. dates as BSON datetimes
+        document = Encoder(to_db=True).encode(request.model_dump())
+        invalid = [
+            f"{field}: '{document[field]}' is not a valid {enum.__name__}"
+            for field, enum in ENUM_FIELDS.items()
+            if document.get(field) is not None and document[field] not in enum._value2member_map_
+        ]
+        if invalid:
+            errors.append((line, "; ".join(invalid)))
+            continue
+        documents.append((line, document))
+    return documents, errors
+
+
+def get_pool() -> ProcessPoolExecutor:
+    global pool
+    if pool is None:
+        pool = ProcessPoolExecutor(max_workers=settings.COLLEGE_IMPORT_WORKERS)
+    return pool
+
+
+def shutdown_pool() -> None:
+    global pool
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+        pool = None
+
+
+async def iter_lines(stream: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, str]]:
+    """Non-blank lines of a streamed body with their 1-based line numbers."""
+    pending = b""
+    line = 0
+    async for chunk in stream:
+        pending += chunk
+        *complete, pending = pending.split(b"\n")
+        for raw in complete:
+            line += 1
+            if raw.strip():
+                yield line, raw.decode("utf-8", errors="replace")
+    if pending.strip():
+        yield line + 1, pending.decode("utf-8", errors="replace")
+
+
+class CollegeImportService:
+    @staticmethod
+    async def write_chunk(documents: List[Tuple[int, dict]]) -> Tuple[int, List[Tuple[int, str]]]:
+        """
+        Insert validated colleges with one unordered insert_many, so a bad row (e.g. a
+        duplicate slug) fails alone. Cards and leaderboard rows of the inserted colleges
+        are then built in one pass each, and the inserts are announced on the change
+        feed. Returns the inserted count and per-line errors.
+        """
+        now = datetime.utcnow()
+        docs = []
+        for _, document in documents:
+            docs.append({
+                "_id": ObjectId(),
+                **document,
+                "created_at": now,
+                "updated_at": now,
+                "is_deleted": False,
+            })
+
+        failed = {}
+        try:
+            await mongodb.db[College.Settings.name].insert_many(docs, ordered=False)
+        except BulkWriteError as e:
+            for write_error in e.details.get("writeErrors", []):
+                if write_error.get("code") == 11000:
+                    message = "Duplicate key: a college with this slug already exists"
+                else:
+                    message = write_error.get("errmsg", "Write failed")
+                failed[write_error["index"]] = message
+
+        inserted = [doc["_id"] for index, doc in enumerate(docs) if index not in failed]
+        if inserted:
+            match = {"_id": {"$in": inserted}}
+            await CollegeCardService.sync_cards(match)
+            await CollegeRankingService.sync_rankings(match)
+            await change_feed.publish(COLLEGE, UPSERT, inserted)
+        return len(inserted), [(documents[index][0], message) for index, message in failed.items()]
+
+    @staticmethod
+    async def import_colleges(stream: AsyncIterator[bytes], dry_run: bool = False) -> CollegeImportResponse:
+        """
+        Import colleges from a streamed NDJSON body. Lines are grouped into chunks and
+        validated in worker processes, a few chunks ahead of the writer, so the event
+        loop stays free and validation overlaps with MongoDB writes. Memory is bounded
+        by the chunks in flight, not the size of the body.
+        """
+        loop = asyncio.get_running_loop()
+        executor = get_pool()
+        chunk_size = settings.COLLEGE_IMPORT_CHUNK_SIZE
+        max_in_flight = settings.COLLEGE_IMPORT_WORKERS * 2
+
+        report = CollegeImportResponse(received=0, valid=0, inserted=0, failed=0, dry_run=dry_run)
+        in_flight: List[asyncio.Future] = []
+
+        def record_errors(errors: List[Tuple[int, str]]) -> None:
+            report.failed += len(errors)
+            for line, message in errors:
+                if len(report.errors) < MAX_REPORTED_ERRORS:
+                    report.errors.append(CollegeImportError(line=line, error=message))
+                else:
+                    report.errors_truncated = True
+
+        async def drain_one() -> None:
+            documents, errors = await in_flight.pop(0)
+            report.valid += len(documents)
+            record_errors(errors)
+            if documents and not dry_run:
+                inserted, write_errors = await CollegeImportService.write_chunk(documents)
+                report.inserted += inserted
+                record_errors(write_errors)
+
+        rows: List[Tuple[int, str]] = []
+        try:
+            async for row in iter_lines(stream):
+                report.received += 1
+                rows.append(row)
+                if len(rows) >= chunk_size:
+                    in_flight.append(loop.run_in_executor(executor, validate_chunk, rows))
+                    rows = []
+                    if len(in_flight) >= max_in_flight:
+                        await drain_one()
+            if rows:
+                in_flight.append(loop.run_in_executor(executor, validate_chunk, rows))
+            while in_flight:
+                await drain_one()
+        finally:
+            for future in in_flight:
+                future.cancel()
+
+        report.errors.sort(key=lambda error: error.line)
+        if report.inserted:
+            print(f"📥 Imported {report.inserted} colleges ({report.failed} rows failed)")
+        return report
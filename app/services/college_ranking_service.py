@@ -0,0 +1,266 @@
+from typing import Optional, List, Dict, Tuple
+from bson import ObjectId
+from pymongo import DeleteMany, InsertOne
+from app.db.mongo import mongodb
+from app.models.college import College
+from app.models.college_ranking import CollegeRankingEntry, DEFAULT_RANKING_CATEGORY
+from app.schemas.college import (
+    RankingLeaderboardResponse,
+    RankingEntryItem,
+    RankingBoardsResponse,
+    RankingBoard,
+    CollegeRankHistoryResponse,
+    RankHistorySeries,
+    RankHistoryPoint,
+)
+from app.services.college_card_service import CARD_SOURCE_PROJECTION
+from app.services.pagination import (
+    encode_cursor,
+    decode_cursor,
+    keyset_match,
+    facet_page_stage,
+    unpack_facet_page,
+)
+
+# College fields a leaderboard row is built from
+RANKING_SOURCE_PROJECTION = {
+    "_id": 1,
+    "rankings": 1,
+    "name": 1,
+    "short_name": 1,
+    "slug": 1,
+    "location": "$address.city",
+    "state": "$address.state",
+    "image": "$images.logo",
+    "listed": CARD_SOURCE_PROJECTION["listed"],
+}
+
+# Leaderboard row fields returned by the endpoints
+ENTRY_PROJECTION = {
+    "_id": 1,
+    "college_id": 1,
+    "name": 1,
+    "short_name": 1,
+    "slug": 1,
+    "location": 1,
+    "state": 1,
+    "image": 1,
+    "rank": 1,
+}
+
+SYNC_BATCH_SIZE = 1000
+
+
+class CollegeRankingService:
+    @staticmethod
+    def to_entries(doc: dict) -> List[dict]:
+        """
+        Leaderboard rows of a College projected with RANKING_SOURCE_PROJECTION, one per
+        (organisation, category, year); a duplicated table keeps the best rank.
+        """
+        best: Dict[Tuple[str, str, int], int] = {}
+        for ranking in doc.get("rankings") or []:
+            if not ranking.get("organisation") or ranking.get("rank") is None or ranking.get("year") is None:
+                continue
+            key = (ranking["organisation"], ranking.get("category") or DEFAULT_RANKING_CATEGORY, ranking["year"])
+            best[key] = min(best.get(key, ranking["rank"]), ranking["rank"])
+
+        return [
+            {
+                "college_id": doc["_id"],
+                "organisation": organisation,
+                "category": category,
+                "year": year,
+                "rank": rank,
+                "name": doc["name"],
+                "short_name": doc.get("short_name"),
+                "slug": doc.get("slug"),
+                "location": doc.get("location") or "",
+                "state": doc.get("state") or "",
+                "image": doc.get("image"),
+            }
+            for (organisation, category, year), rank in best.items()
+        ]
+
+    @staticmethod
+    async def sync_rankings(match: dict) -> List[ObjectId]:
+        """
+        Rebuild the leaderboard rows of the colleges matching `match`: each college's
+        rows are replaced by its current rankings, and unlisted colleges lose them.
+        Returns the ids seen.
+        """
+        collection = mongodb.db[CollegeRankingEntry.Settings.name]
+        pipeline = [{"$match": match}, {"$project": RANKING_SOURCE_PROJECTION}]
+
+        seen = []
+        operations = []
+        async for doc in mongodb.db[College.Settings.name].aggregate(pipeline, batchSize=SYNC_BATCH_SIZE):
+            seen.append(doc["_id"])
+            operations.append(DeleteMany({"college_id": doc["_id"]}))
+            if doc.get("listed"):
+                operations.extend(InsertOne(entry) for entry in CollegeRankingService.to_entries(doc))
+            if len(operations) >= SYNC_BATCH_SIZE:
+                await collection.bulk_write(operations, ordered=True)
+                operations = []
+
+        if operations:
+            await collection.bulk_write(operations, ordered=True)
+        return seen
+
+    @staticmethod
+    async def sync_college(college_id: ObjectId) -> None:
+        """Bring one college's leaderboard rows up to date after a write."""
+        seen = await CollegeRankingService.sync_rankings({"_id": college_id})
+        if not seen:
+            await CollegeRankingService.remove_college(college_id)
+
+    @staticmethod
+    async def remove_college(college_id: ObjectId) -> None:
+        await mongodb.db[CollegeRankingEntry.Settings.name].delete_many({"college_id": college_id})
+
+    @staticmethod
+    async def rebuild_all() -> int:
+        """Rebuild every leaderboard from the colleges collection and drop orphaned rows."""
+        seen = await CollegeRankingService.sync_rankings({})
+        await mongodb.db[CollegeRankingEntry.Settings.name].delete_many({"college_id": {"$nin": seen}})
+        return await CollegeRankingEntry.count()
+
+    @staticmethod
+    async def latest_year(organisation: str, category: str) -> Optional[int]:
+        """Most recent year of a (organisation, category) table, read off the board index."""
+        docs = await CollegeRankingEntry.aggregate([
+            {"$match": {"organisation": organisation, "category": category}},
+            {"$sort": {"year": -1}},
+            {"$limit": 1},
+            {"$project": {"_id": 0, "year": 1}},
+        ]).to_list()
+        return docs[0]["year"] if docs else None
+
+    @staticmethod
+    def to_item(entry: dict) -> RankingEntryItem:
+        return RankingEntryItem(
+            id=str(entry["college_id"]),
+            name=entry["name"],
+            short_name=entry.get("short_name"),
+            slug=entry.get("slug"),
+            location=entry.get("location") or "",
+            state=entry.get("state") or "",
+            image=entry.get("image"),
+            rank=entry["rank"],
+        )
+
+    @staticmethod
+    def board_key(organisation: str, category: str, year: int) -> str:
+        """Sort tag of a leaderboard's cursors, so a cursor only resumes the board it came from."""
+        return f"rank:{organisation}:{category}:{year}"
+
+    @staticmethod
+    async def get_leaderboard(
+        organisation: str,
+        category: Optional[str] = None,
+        year: Optional[int] = None,
+        page: int = 1,
+        page_size: int = 20,
+        cursor: Optional[str] = None
+    ) -> RankingLeaderboardResponse:
+        """
+        One slice of a leaderboard in rank order, defaulting to the latest year. Rows
+        are read straight off the board index, so a page costs O(page size); cursor
+        mode seeks past the last (rank, college id) instead of skipping. A cursor is
+        bound to its board and rejected on any other.
+        """
+        category = category or DEFAULT_RANKING_CATEGORY
+        if year is None:
+            year = await CollegeRankingService.latest_year(organisation, category)
+        if year is None:
+            return RankingLeaderboardResponse(
+                organisation=organisation,
+                category=category,
+                year=None,
+                colleges=[],
+                total=0,
+                page=page,
+                size=page_size
+            )
+
+        board = {"organisation": organisation, "category": category, "year": year}
+        board_key = CollegeRankingService.board_key(organisation, category, year)
+        sort = {"rank": 1, "college_id": 1}
+        if cursor:
+            rank, last_id = decode_cursor(cursor, board_key)
+            pipeline = [
+                {"$match": {"$and": [board, keyset_match("rank", 1, rank, last_id, id_field="college_id")]}},
+                {"$sort": sort},
+                {"$limit": page_size + 1},
+                {"$project": ENTRY_PROJECTION},
+            ]
+            entries = await CollegeRankingEntry.aggregate(pipeline).to_list()
+            total = None
+            has_more = len(entries) > page_size
+            entries = entries[:page_size]
+        else:
+            skip = (page - 1) * page_size
+            pipeline = [
+                {"$match": board},
+                {"$sort": sort},
+                facet_page_stage(skip, page_size, [{"$project": ENTRY_PROJECTION}]),
+            ]
+            result = await CollegeRankingEntry.aggregate(pipeline).to_list()
+            entries, total = unpack_facet_page(result)
+            has_more = skip + len(entries) < total
+
+        next_cursor = None
+        if entries and has_more:
+            next_cursor = encode_cursor(board_key, entries[-1]["rank"], entries[-1]["college_id"])
+
+        return RankingLeaderboardResponse(
+            organisation=organisation,
+            category=category,
+            year=year,
+            colleges=[CollegeRankingService.to_item(entry) for entry in entries],
+            total=total,
+            page=page,
+            size=page_size,
+            next_cursor=next_cursor
+        )
+
+    @staticmethod
+    async def get_boards(organisation: Optional[str] = None) -> RankingBoardsResponse:
+        """Available leaderboards with their sizes, latest year first within each table."""
+        pipeline = []
+        if organisation:
+            pipeline.append({"$match": {"organisation": organisation}})
+        pipeline += [
+            {"$group": {
+                "_id": {"organisation": "$organisation", "category": "$category", "year": "$year"},
+                "colleges": {"$sum": 1},
+            }},
+            {"$sort": {"_id.organisation": 1, "_id.category": 1, "_id.year": -1}},
+        ]
+        groups = await CollegeRankingEntry.aggregate(pipeline).to_list()
+        return RankingBoardsResponse(boards=[
+            RankingBoard(**group["_id"], colleges=group["colleges"])
+            for group in groups
+        ])
+
+    @staticmethod
+    async def get_rank_history(college_id: str) -> CollegeRankHistoryResponse:
+        """A college's rank per year in every table it appears in, for trend charts."""
+        entries = await CollegeRankingEntry.aggregate([
+            {"$match": {"college_id": ObjectId(college_id)}},
+            {"$sort": {"organisation": 1, "category": 1, "year": 1}},
+            {"$project": {"_id": 0, "organisation": 1, "category": 1, "year": 1, "rank": 1}},
+        ]).to_list()
+
+        series: Dict[Tuple[str, str], List[RankHistoryPoint]] = {}
+        for entry in entries:
+            series.setdefault((entry["organisation"], entry["category"]), []).append(
+                RankHistoryPoint(year=entry["year"], rank=entry["rank"])
+            )
+        return CollegeRankHistoryResponse(
+            college_id=college_id,
+            series=[
+                RankHistorySeries(organisation=organisation, category=category, points=points)
+                for (organisation, category), points in series.items()
+            ]
+        )
@@ -0,0 +1,164 @@
+import re
+from bisect import bisect_left, insort
+from typing import Optional, List, Dict, Tuple, Any
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Relative weight of a token by the field it came from
+FIELD_WEIGHTS = {
+    "short_name": 4.0,
+    "name": 3.0,
+    "alias": 2.0,
+    "tags": 1.0,
+}
+
+# Score multiplier when a query term only matches the start of a token
+PREFIX_MATCH_FACTOR = 0.6
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Lowercase alphanumeric tokens of `text`; punctuation and spaces separate tokens."""
+    if not text:
+        return []
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def document_tokens(fields: Dict[str, Any]) -> Dict[str, float]:
+    """Map every token of a college's searchable fields to its best field weight."""
+    tokens: Dict[str, float] = {}
+    for field, weight in FIELD_WEIGHTS.items():
+        value = fields.get(field)
+        texts = value if isinstance(value, list) else [value]
+        for text in texts:
+            for token in tokenize(text):
+                if weight > tokens.get(token, 0.0):
+                    tokens[token] = weight
+    return tokens
+
+
+class CollegeSearchIndex:
+    """
+    Token inverted index over college name, short_name, alias and tags.
+
+    Every query term is matched as a token prefix against a sorted vocabulary
+    (so "iit bom" finds "IIT Bombay"), candidates are intersected across terms
+    starting from the rarest one, and hits are ranked by summed field weights.
+    The index is updated per college on write, without a rebuild.
+    """
+
+    def __init__(self):
+        self.postings: Dict[str, Dict[str, float]] = {}  # token -> {college_id: weight}
+        self.vocabulary: List[str] = []  # sorted tokens, for prefix range lookups
+        self.documents: Dict[str, Dict[str, float]] = {}  # college_id -> {token: weight}
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    @classmethod
+    def build(cls, entries: List[Dict[str, Any]]) -> "CollegeSearchIndex":
+        """Build an index from dicts carrying "id" and the searchable fields."""
+        index = cls()
+        for entry in entries:
+            college_id = entry["id"]
+            tokens = document_tokens(entry)
+            index.documents[college_id] = tokens
+            for token, weight in tokens.items():
+                index.postings.setdefault(token, {})[college_id] = weight
+        index.vocabulary = sorted(index.postings)
+        return index
+
+    def swap(self, other: "CollegeSearchIndex") -> None:
+        """Take over the contents of a freshly built index."""
+        self.postings = other.postings
+        self.vocabulary = other.vocabulary
+        self.documents = other.documents
+
+    def upsert(self, college_id: str, fields: Dict[str, Any]) -> None:
+        """Index (or re-index) one college."""
+        self.remove(college_id)
+        tokens = document_tokens(fields)
+        self.documents[college_id] = tokens
+        for token, weight in tokens.items():
+            posting = self.postings.get(token)
+            if posting is None:
+                posting = self.postings[token] = {}
+                insort(self.vocabulary, token)
+            posting[college_id] = weight
+
+    def remove(self, college_id: str) -> None:
+        """Drop one college from the index."""
+        tokens = self.documents.pop(college_id, None)
+        if not tokens:
+            return
+        for token in tokens:
+            posting = self.postings.get(token)
+            if posting is None:
+                continue
+            posting.pop(college_id, None)
+            if not posting:
+                del self.postings[token]
+                position = bisect_left(self.vocabulary, token)
+                if position < len(self.vocabulary) and self.vocabulary[position] == token:
+                    self.vocabulary.pop(position)
+
+    def prefix_tokens(self, term: str) -> List[str]:
+        """Vocabulary tokens starting with `term`."""
+        start = bisect_left(self.vocabulary, term)
+        end = bisect_left(self.vocabulary, term + "\uffff")
+        return self.vocabulary[start:end]
+
+    @staticmethod
+    def token_score(term: str, token: str, weight: float) -> float:
+        return weight if token == term else weight * PREFIX_MATCH_FACTOR
+
+    def term_scores(self, term: str, tokens: List[str]) -> Dict[str, float]:
+        """Best score per college for one query term, from the postings of its matching tokens."""
+        scores: Dict[str, float] = {}
+        for token in tokens:
+            for college_id, weight in self.postings[token].items():
+                score = self.token_score(term, token, weight)
+                if score > scores.get(college_id, 0.0):
+                    scores[college_id] = score
+        return scores
+
+    def document_term_score(self, college_id: str, term: str) -> float:
+        """Best score of one query term within one college's tokens."""
+        best = 0.0
+        for token, weight in self.documents[college_id].items():
+            if token.startswith(term):
+                best = max(best, self.token_score(term, token, weight))
+        return best
+
+    def search(self, text: str) -> List[Tuple[str, float]]:
+        """College ids matching every term of `text`, best first, with their scores."""
+        terms = list(dict.fromkeys(tokenize(text)))
+        if not terms:
+            return []
+
+        matches = [(term, self.prefix_tokens(term)) for term in terms]
+        sizes = {term: sum(len(self.postings[token]) for token in tokens) for term, tokens in matches}
+        matches.sort(key=lambda match: sizes[match[0]])
+
+        first_term, first_tokens = matches[0]
+        scores = self.term_scores(first_term, first_tokens)
+
+        for term, tokens in matches[1:]:
+            if not scores:
+                break
+            if len(scores) * 4 < sizes[term]:
+                # Few candidates left: check their own tokens rather than walk large postings
+                next_scores = {}
+                for college_id, score in scores.items():
+                    term_score = self.document_term_score(college_id, term)
+                    if term_score:
+                        next_scores[college_id] = score + term_score
+                scores = next_scores
+            else:
+                term_scores = self.term_scores(term, tokens)
+                scores = {
+                    college_id: score + term_scores[college_id]
+                    for college_id, score in scores.items()
+                    if college_id in term_scores
+                }
+
+        return sorted(scores.items(), key=lambda item: (-item[1], item[0]))
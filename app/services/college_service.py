@@ -1,367 +1,1062 @@
+import asyncio
+import hashlib
+import json
+import time
+import numpy as np
+from bson import ObjectId
+from app.core.config import settings
+from app.core.http_cache import make_etag
 from app.models.college import College
-from app.schemas.college import CollegeListPageResponse
-from typing import Optional, List, Tuple
-import re
+from app.models.college_card import CollegeCard
+from app.schemas.college import (
+    CollegeListPageResponse,
+    CollegeFacetsResponse,
+    FacetCount,
+    CollegeSuggestResponse,
+    CollegeListItem,
+    CollegeDetailResponse,
+    CollegeNearbyResponse,
+    CollegeCompareResponse,
+    CompareCollege,
+    CompareRow,
+)
+from app.schemas.base import BaseResponseSchema
+from app.services.college_catalog import CollegeCatalog, CatalogSnapshot, row_digest
+from app.services.college_search import CollegeSearchIndex
+from app.services.college_suggest import CollegeSuggestIndex
+from app.services.response_cache import ResponseCache
+from app.services.change_feed import change_feed, ChangeEvent, COLLEGE
+from app.services.projection import InvalidFieldsError, projection_model, mongo_projection
+from app.services.pagination import (
+    facet_page_stage,
+    unpack_facet_page,
+    encode_cursor,
+    decode_cursor,
+    InvalidCursorError,
+    keyset_match,
+)
+from typing import Optional, List, Tuple, Dict, Any, Set
+
+
+# List query keys (as built in endpoints/colleges.py) mapped to CollegeCard fields;
+# "search" is handled separately as a full-text query
+QUERY_FIELD_MAP = {
+    "state": "state",
+    "type": "type",
+    "category": "category",
+    "featured": "featured",
+}
+
+# CollegeCard field sorted on for each `sortBy` value
+SORT_FIELDS = {
+    "ranking": "ranking",
+    "rating": "rating",
+    "fees": "fees_value",
+    "placement": "placement_value",
+}
+
+# Text-search relevance, used when searching without an explicit sort
+RELEVANCE_EXPRESSION = {"$meta": "textScore"}
+
+# Relevance is scored differently by the catalog's token index and by MongoDB's text
+# index, so a relevance cursor records which of them issued it and only resumes there
+CATALOG_RELEVANCE = "relevance:catalog"
+TEXT_RELEVANCE = "relevance:text"
+
+# CollegeCard fields returned in a CollegeListItem
+LIST_ITEM_PROJECTION = {
+    "_id": 1,
+    "name": 1,
+    "short_name": 1,
+    "location": 1,
+    "state": 1,
+    "rating": 1,
+    "reviews": 1,
+    "type": 1,
+    "category": 1,
+    "sub_category": 1,
+    "established": 1,
+    "fees": 1,
+    "placement": 1,
+    "ranking": 1,
+    "featured": 1,
+    "courses": 1,
+    "students": 1,
+    "image": 1,
+}
+
+# Fields a sparse list request may select
+LIST_ITEM_FIELDS = set(CollegeListItem.model_fields)
+
+# The catalog also loads the searchable fields, slug, raw sort values and version
+CATALOG_PROJECTION = {
+    **LIST_ITEM_PROJECTION,
+    "alias": 1,
+    "tags": 1,
+    "slug": 1,
+    "fees_value": 1,
+    "placement_value": 1,
+    "updated_at": 1,
+}
+
+
+# College paths read for a CollegeDetailResponse; news bodies and SEO/admin fields stay in MongoDB
+DETAIL_PROJECTION = {
+    "_id": 1,
+    "name": 1,
+    "short_name": 1,
+    "established_year": 1,
+    "type": 1,
+    "category": 1,
+    "address": 1,
+    "contact": 1,
+    "ratings": 1,
+    "rankings": 1,
+    "accreditations": 1,
+    "fees": 1,
+    "placement": 1,
+    "academics": 1,
+    "infrastructure": 1,
+    "social_media": 1,
+    "images": 1,
+    "alumni_network": 1,
+    "clubs": 1,
+    "events": 1,
+    "scholarships": 1,
+    "nearby_places": 1,
+    "news.title": 1,
+    "news.date": 1,
+    "news.category": 1,
+    "news.excerpt": 1,
+    "news.image": 1,
+    "startups": 1,
+    "funding": 1,
+}
+
+# Most colleges fetched by one batch get
+MAX_BATCH_COLLEGES = 50
+
+# Metrics lined up by the compare view: (section, key, label, better), where better
+# is "min", "max" or None when values have no order
+COMPARE_METRICS = [
+    ("fees", "tuition", "Tuition fees", "min"),
+    ("fees", "hostel", "Hostel fees", "min"),
+    ("fees", "total", "Total fees", "min"),
+    ("placement", "average_package", "Average package", "max"),
+    ("placement", "highest_package", "Highest package", "max"),
+    ("placement", "placement_rate", "Placement rate (%)", "max"),
+    ("ratings", "overall", "Overall rating", "max"),
+    ("ratings", "academics", "Academics rating", "max"),
+    ("ratings", "infrastructure", "Infrastructure rating", "max"),
+    ("ratings", "faculty", "Faculty rating", "max"),
+    ("ratings", "placement", "Placement rating", "max"),
+    ("ratings", "hostel_life", "Hostel life rating", "max"),
+    ("ratings", "social_life", "Social life rating", "max"),
+    ("ratings", "total_reviews", "Reviews", "max"),
+]
+
+# Sidebar facet dimensions mapped to CollegeCard fields
+FACET_FIELDS = {
+    "state": "state",
+    "category": "category",
+    "type": "type",
+    "sub_category": "sub_category",
+}
+
+FACET_CACHE_TTL_SECONDS = 300
+FACET_CACHE_MAX_ENTRIES = 1024
+
+
+# In-process snapshot of the list cards, refreshed in the background
+catalog = CollegeCatalog()
+
+# Token index over name, short_name, alias and tags, rebuilt with the catalog
+search_index = CollegeSearchIndex()
+
+# Prefix array for search-box autocomplete, updated per changed college
+suggest_index = CollegeSuggestIndex()
+
+# Serialized list pages, keyed by catalog version and the canonical query
+college_list_cache = ResponseCache(
+    "colleges:list",
+    max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.COLLEGE_LIST_CACHE_TTL_SECONDS
+)
+
+# Serialized detail responses, keyed by college id and version
+college_detail_cache = ResponseCache(
+    "colleges:detail",
+    max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.COLLEGE_DETAIL_CACHE_TTL_SECONDS
+)
+
+# College slug -> id, filled from the catalog and by lookups
+slug_ids: Dict[str, str] = {}
+
+# Colleges written since the catalog last took in changes, applied together
+pending_college_ids: Set[str] = set()
+pending_flush: Optional[asyncio.Task] = None
+
+# Serializes catalog swaps between full refreshes and change deltas
+catalog_lock = asyncio.Lock()
+
+# Facet counts per normalized filter: key -> (expires_at, response)
+facet_cache: Dict[str, Tuple[float, CollegeFacetsResponse]] = {}
+
 
 class CollegeService:
+    @staticmethod
+    def build_match(query: dict) -> dict:
+        """
+        Translate the endpoint-level list query into a filter on CollegeCard
+        documents; only listed colleges have a card.
+        """
+        match = {}
+        for key, value in query.items():
+            if key == "search":
+                match["$text"] = {"$search": value}
+            else:
+                match[QUERY_FIELD_MAP.get(key, key)] = value
+        return match
+
+    @staticmethod
+    def to_list_item(card: dict) -> dict:
+        """Convert a CollegeCard document into CollegeListItem input."""
+        item = dict(card)
+        item["id"] = str(item.pop("_id"))
+        for field in ("fees_value", "placement_value", "updated_at"):
+            item.pop(field, None)
+        return item
+
+    @staticmethod
+    def college_version(college_id: Any, updated_at: Any) -> str:
+        """Version of one college's data; changes whenever the document is updated."""
+        stamp = updated_at.isoformat() if updated_at else ""
+        return hashlib.blake2b(f"{college_id}|{stamp}".encode(), digest_size=8).hexdigest()
+
+    @staticmethod
+    async def resolve_college_ids(ids_or_slugs: List[str]) -> Dict[str, str]:
+        """
+        Map ObjectId strings and slugs to college ids. Slugs resolve through the
+        in-process slug map; the rest go to the unique slug index in one query.
+        Unknown slugs are left out of the result.
+        """
+        resolved = {}
+        unknown = []
+        for value in ids_or_slugs:
+            if ObjectId.is_valid(value):
+                resolved[value] = value
+            elif value in slug_ids:
+                resolved[value] = slug_ids[value]
+            else:
+                unknown.append(value)
+
+        if unknown:
+            docs = await College.aggregate([
+                {"$match": {"slug": {"$in": unknown}, "is_deleted": {"$ne": True}}},
+                {"$project": {"_id": 1, "slug": 1}},
+            ]).to_list()
+            for doc in docs:
+                slug_ids[doc["slug"]] = resolved[doc["slug"]] = str(doc["_id"])
+        return resolved
+
+    @staticmethod
+    async def resolve_college_id(id_or_slug: str) -> Optional[str]:
+        """College id for an ObjectId string or a slug; None for an unknown slug."""
+        resolved = await CollegeService.resolve_college_ids([id_or_slug])
+        return resolved.get(id_or_slug)
+
+    @staticmethod
+    async def get_college_versions(college_ids: List[str]) -> Dict[str, str]:
+        """
+        Current versions of colleges, from the catalog or by reading only their
+        updated_at in one query. Missing or deleted colleges are left out.
+        """
+        versions = {}
+        catalog_versions = catalog.versions
+        remaining = []
+        for college_id in college_ids:
+            if college_id in catalog_versions:
+                versions[college_id] = catalog_versions[college_id]
+            elif ObjectId.is_valid(college_id):
+                remaining.append(ObjectId(college_id))
+
+        if remaining:
+            docs = await College.aggregate([
+                {"$match": {"_id": {"$in": remaining}, "is_deleted": {"$ne": True}}},
+                {"$project": {"updated_at": 1}},
+            ]).to_list()
+            for doc in docs:
+                versions[str(doc["_id"])] = CollegeService.college_version(doc["_id"], doc.get("updated_at"))
+        return versions
+
+    @staticmethod
+    async def get_college_version(college_id: str) -> Optional[str]:
+        """Current version of a college; None if it does not exist."""
+        versions = await CollegeService.get_college_versions([college_id])
+        return versions.get(college_id)
+
+    @staticmethod
+    def to_catalog_doc(card: dict) -> dict:
+        """Pair a CollegeCard's list item with its raw sort keys, filter values, version and digest."""
+        row = CollegeService.to_list_item(card)
+        return {
+            "row": row,
+            "digest": row_digest(row),
+            "version": CollegeService.college_version(card["_id"], card.get("updated_at")),
+            "ranking": card.get("ranking"),
+            "rating": card.get("rating"),
+            "fees": card.get("fees_value"),
+            "placement": card.get("placement_value"),
+            "state": card.get("state") or None,
+            "type": card.get("type"),
+            "category": card.get("category"),
+            "sub_category": card.get("sub_category"),
+            "featured": bool(card.get("featured")),
+        }
+
+    @staticmethod
+    def to_search_entry(card: dict) -> dict:
+        return {
+            "id": str(card["_id"]),
+            "name": card.get("name"),
+            "short_name": card.get("short_name"),
+            "alias": card.get("alias"),
+            "tags": card.get("tags"),
+        }
+
+    @staticmethod
+    async def refresh_catalog() -> CatalogSnapshot:
+        """Load every college card and atomically swap in a freshly built catalog snapshot."""
+        async with catalog_lock:
+            docs = await CollegeCard.aggregate([{"$project": CATALOG_PROJECTION}]).to_list()
+            catalog_docs = [CollegeService.to_catalog_doc(doc) for doc in docs]
+            search_entries = [CollegeService.to_search_entry(doc) for doc in docs]
+
+            snapshot = await asyncio.to_thread(CollegeCatalog.build, catalog_docs)
+            index = await asyncio.to_thread(CollegeSearchIndex.build, search_entries)
+            catalog.replace(snapshot, catalog_docs)
+            search_index.swap(index)
+            slug_ids.clear()
+            slug_ids.update({row["slug"]: row["id"] for row in snapshot.rows if row.get("slug")})
+            await CollegeService.sync_suggestions([doc["row"] for doc in catalog_docs])
+            CollegeService.invalidate_facets()
+            return snapshot
+
+    @staticmethod
+    async def apply_college_changes(college_ids: List[str]) -> None:
+        """
+        Fold written colleges into the catalog, search and suggestion indexes by
+        re-reading only their cards. Colleges without a card (unlisted or deleted)
+        are dropped.
+        """
+        object_ids = [ObjectId(college_id) for college_id in college_ids if ObjectId.is_valid(college_id)]
+        cards = await CollegeCard.aggregate([
+            {"$match": {"_id": {"$in": object_ids}}},
+            {"$project": CATALOG_PROJECTION},
+        ]).to_list()
+        upserts = [CollegeService.to_catalog_doc(card) for card in cards]
+        found = {doc["row"]["id"] for doc in upserts}
+        removed = [college_id for college_id in college_ids if college_id not in found]
+
+        async with catalog_lock:
+            if catalog.snapshot is not None:
+                snapshot, docs = await asyncio.to_thread(catalog.apply, upserts, removed)
+                catalog.replace(snapshot, docs)
+            for card, doc in zip(cards, upserts):
+                college_id = doc["row"]["id"]
+                search_index.upsert(college_id, CollegeService.to_search_entry(card))
+                suggest_index.upsert(college_id, doc["row"])
+                if doc["row"].get("slug"):
+                    slug_ids[doc["row"]["slug"]] = college_id
+            for college_id in removed:
+                search_index.remove(college_id)
+                suggest_index.remove(college_id)
+            CollegeService.invalidate_facets()
+
+    @staticmethod
+    async def flush_college_changes() -> None:
+        """Apply the pending college changes once writes pause for the debounce interval."""
+        global pending_flush
+        try:
+            while pending_college_ids:
+                await asyncio.sleep(settings.CHANGE_FEED_DEBOUNCE_SECONDS)
+                college_ids = list(pending_college_ids)
+                pending_college_ids.clear()
+                try:
+                    await CollegeService.apply_college_changes(college_ids)
+                except Exception as e:
+                    print(f"❌ College changes not applied, left to the next catalog refresh: {e}")
+        finally:
+            pending_flush = None
+
+    @staticmethod
+    async def on_college_change(event: ChangeEvent) -> None:
+        """
+        Change-feed consumer for colleges. Cached details are dropped right away;
+        the catalog and indexes take in bursts of writes (e.g. a bulk import) together.
+        """
+        global pending_flush
+        for college_id in event.ids:
+            await CollegeService.invalidate_college(college_id)
+
+        pending_college_ids.update(event.ids)
+        if pending_flush is None:
+            pending_flush = asyncio.create_task(CollegeService.flush_college_changes())
+
+    @staticmethod
+    async def sync_suggestions(rows: List[dict]) -> None:
+        """
+        Bring the autocomplete index up to date with the listed colleges. The first
+        load is built off the event loop; afterwards only changed colleges are applied.
+        """
+        if not len(suggest_index):
+            loaded = CollegeSuggestIndex()
+            await asyncio.to_thread(loaded.load, rows)
+            suggest_index.swap(loaded)
+            return
+
+        changed, stale = await asyncio.to_thread(suggest_index.diff, rows)
+        suggest_index.apply(changed, stale)
+
+    @staticmethod
+    async def run_catalog_refresher(interval: int) -> None:
+        """Background task rebuilding the catalog snapshot every `interval` seconds."""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                snapshot = await CollegeService.refresh_catalog()
+                print(f"🔄 College catalog refreshed: {snapshot.size} colleges")
+            except Exception as e:
+                print(f"❌ College catalog refresh failed: {e}")
+
+    @staticmethod
+    def catalog_filters(snapshot: CatalogSnapshot, query: dict) -> Tuple[dict, Optional[np.ndarray], Dict[str, float]]:
+        """
+        Split a list query into catalog equality filters and, when searching, the
+        matching rows in relevance order with each hit's score.
+        """
+        filters = dict(query)
+        text = filters.pop("search", None)
+        if text is None:
+            return filters, None, {}
+
+        hits = search_index.search(text)
+        scores = dict(hits)
+        ranked_rows = np.fromiter(
+            (snapshot.row_index[college_id] for college_id, _ in hits if college_id in snapshot.row_index),
+            dtype=np.intp
+        )
+        return filters, ranked_rows, scores
+
+    @staticmethod
+    def get_colleges_from_catalog(
+        query: dict,
+        sort_by: Optional[str],
+        direction: int,
+        page: int,
+        page_size: int,
+        cursor: Optional[str]
+    ) -> Optional[CollegeListPageResponse]:
+        """Answer a list query from the in-process catalog; None if it has to go to MongoDB."""
+        snapshot = catalog.snapshot
+        if snapshot is None:
+            return None
+
+        by_relevance = sort_by == "relevance"
+        cursor_sort = CATALOG_RELEVANCE if by_relevance else sort_by
+
+        after_id = None
+        if cursor:
+            try:
+                _, last_id = decode_cursor(cursor, cursor_sort)
+            except InvalidCursorError:
+                if by_relevance:
+                    return None  # possibly a text-index cursor, resumed from MongoDB
+                raise
+            after_id = str(last_id)
+
+        filters, ranked_rows, scores = CollegeService.catalog_filters(snapshot, query)
+
+        result = snapshot.query(
+            filters=filters,
+            sort_by=None if by_relevance else sort_by,
+            direction=direction,
+            offset=(page - 1) * page_size,
+            limit=page_size,
+            after_id=after_id,
+            ranked_rows=ranked_rows
+        )
+        if result is None:
+            return None
+
+        next_cursor = None
+        if result.next_row is not None:
+            college_id = snapshot.ids[result.next_row]
+            value = scores.get(college_id) if by_relevance else snapshot.sort_value(sort_by, result.next_row)
+            next_cursor = encode_cursor(cursor_sort, value, college_id)
+
+        return CollegeListPageResponse(
+            colleges=result.rows,
+            total=None if cursor else result.total,
+            page=page,
+            size=page_size,
+            next_cursor=next_cursor
+        )
+
     @staticmethod
     async def get_colleges(
         query: dict = {},
         sort_criteria: Optional[List[Tuple[str, int]]] = None,
         page: int = 1,
-        page_size: int = 10
+        page_size: int = 10,
+        cursor: Optional[str] = None
     ) -> CollegeListPageResponse:
-        
-        print(
-            f"Query: {query}, Sort: {sort_criteria}, Page: {page}, Page Size: {page_size}"
+        """
+        Filter, sort and paginate colleges, from the in-process catalog when it can
+        answer the query, otherwise with a single aggregation.
+
+        By page number, the page and the total count come back together through
+        $facet. When a cursor is given, the page is read after the (sort key, _id)
+        it encodes instead of skipping, and no total is counted. A `search` without
+        an explicit sort is ordered by relevance.
+        """
+        sort_by, direction = sort_criteria[0] if sort_criteria else (None, 1)
+        if query.get("search") and not sort_by:
+            sort_by, direction = "relevance", -1
+
+        cached = CollegeService.get_colleges_from_catalog(
+            query, sort_by, direction, page, page_size, cursor
         )
-        # Sample colleges data
-        all_colleges = [
-            {
-                "id": "1",
-                "name": 'Indian Institute of Technology Delhi',
-                "shortName": 'IIT Delhi',
-                "location": 'New Delhi',
-                "state": 'Delhi',
-                "rating": 4.8,
-                "reviews": 2453,
-                "type": 'Public',
-                "category": 'Engineering',
-                "established": 1961,
-                "fees": 250000,
-                "placement": 2500000,
-                "ranking": 2,
-                "featured": True,
-                "courses": 42,
-                "students": 8000,
-                "image": '/api/placeholder/400/300'
-            },
-            {
-                "id": "2",
-                "name": 'All India Institute of Medical Sciences',
-                "shortName": 'AIIMS Delhi',
-                "location": 'New Delhi',
-                "state": 'Delhi',
-                "rating": 4.9,
-                "reviews": 1876,
-                "type": 'Public',
-                "category": 'Medical',
-                "established": 1956,
-                "fees": 150000,
-                "placement": 3000000,
-                "ranking": 1,
-                "featured": True,
-                "courses": 28,
-                "students": 3000,
-                "image": '/api/placeholder/400/300'
-            },
-            {
-                "id": "3",
-                "name": 'Indian Institute of Management Ahmedabad',
-                "shortName": 'IIM Ahmedabad',
-                "location": 'Ahmedabad',
-                "state": 'Gujarat',
-                "rating": 4.7,
-                "reviews": 1234,
-                "type": 'Public',
-                "category": 'Management',
-                "established": 1961,
-                "fees": 2500000,
-                "placement": 3500000,
-                "ranking": 1,
-                "featured": True,
-                "courses": 15,
-                "students": 1200,
-                "image": '/api/placeholder/400/300'
-            },
-            {
-                "id": "4",
-                "name": 'Indian Institute of Science',
-                "shortName": 'IISc Bangalore',
-                "location": 'Bangalore',
-                "state": 'Karnataka',
-                "rating": 4.8,
-                "reviews": 987,
-                "type": 'Public',
-                "category": 'Science & Research',
-                "established": 1909,
-                "fees": 200000,
-                "placement": 2800000,
-                "ranking": 1,
-                "featured": True,
-                "courses": 35,
-                "students": 4500,
-                "image": '/api/placeholder/400/300'
-            },
-            {
-                "id": "5",
-                "name": 'Delhi University',
-                "shortName": 'DU',
-                "location": 'New Delhi',
-                "state": 'Delhi',
-                "rating": 4.5,
-                "reviews": 5432,
-                "type": 'Public',
-                "category": 'Arts & Science',
-                "established": 1922,
-                "fees": 50000,
-                "placement": 800000,
-                "ranking": 12,
-                "featured": False,
-                "courses": 180,
-                "students": 400000,
-                "image": '/api/placeholder/400/300'
-            },
-            {
-                "id": "6",
-                "name": 'Indian Institute of Technology Bombay',
-                "shortName": 'IIT Bombay',
-                "location": 'Mumbai',
-                "state": 'Maharashtra',
-                "rating": 4.8,
-                "reviews": 2156,
-                "type": 'Public',
-                "category": 'Engineering',
-                "established": 1958,
-                "fees": 250000,
-                "placement": 2700000,
-                "ranking": 3,
-                "featured": True,
-                "courses": 45,
-                "students": 9000,
-                "image": '/api/placeholder/400/300'
-            },
-            {
-                "id": "7",
-                "name": 'Jawaharlal Nehru University',
-                "shortName": 'JNU',
-                "location": 'New Delhi',
-                "state": 'Delhi',
-                "rating": 4.6,
-                "reviews": 1543,
-                "type": 'Public',
-                "category": 'Arts & Science',
-                "established": 1969,
-                "fees": 20000,
-                "placement": 600000,
-                "ranking": 8,
-                "featured": False,
-                "courses": 75,
-                "students": 8500,
-                "image": '/api/placeholder/400/300'
-            },
-            {
-                "id": "8",
-                "name": 'Indian Institute of Technology Madras',
-                "shortName": 'IIT Madras',
-                "location": 'Chennai',
-                "state": 'Tamil Nadu',
-                "rating": 4.9,
-                "reviews": 2891,
-                "type": 'Public',
-                "category": 'Engineering',
-                "established": 1959,
-                "fees": 250000,
-                "placement": 2800000,
-                "ranking": 1,
-                "featured": True,
-                "courses": 50,
-                "students": 10000,
-                "image": '/api/placeholder/400/300'
-            },
-            {
-                "id": "9",
-                "name": 'National Law School of India University',
-                "shortName": 'NLSIU Bangalore',
-                "location": 'Bangalore',
-                "state": 'Karnataka',
-                "rating": 4.7,
-                "reviews": 876,
-                "type": 'Public',
-                "category": 'Law',
-                "established": 1987,
-                "fees": 400000,
-                "placement": 2000000,
-                "ranking": 1,
-                "featured": True,
-                "courses": 8,
-                "students": 800,
-                "image": '/api/placeholder/400/300'
-            },
-            {
-                "id": "10",
-                "name": 'Banaras Hindu University',
-                "shortName": 'BHU',
-                "location": 'Varanasi',
-                "state": 'Uttar Pradesh',
-                "rating": 4.4,
-                "reviews": 3421,
-                "type": 'Public',
-                "category": 'Arts & Science',
-                "established": 1916,
-                "fees": 60000,
-                "placement": 700000,
-                "ranking": 15,
-                "featured": False,
-                "courses": 140,
-                "students": 30000,
-                "image": '/api/placeholder/400/300'
-            },
-            {
-                "id": "11",
-                "name": 'BITS Pilani',
-                "shortName": 'BITS Pilani',
-                "location": 'Pilani',
-                "state": 'Rajasthan',
-                "rating": 4.6,
-                "reviews": 1987,
-                "type": 'Private',
-                "category": 'Engineering',
-                "established": 1964,
-                "fees": 450000,
-                "placement": 2300000,
-                "ranking": 5,
-                "featured": True,
-                "courses": 38,
-                "students": 4500,
-                "image": '/api/placeholder/400/300'
-            },
-            {
-                "id": "12",
-                "name": 'Manipal Academy of Higher Education',
-                "shortName": 'MAHE',
-                "location": 'Manipal',
-                "state": 'Karnataka',
-                "rating": 4.3,
-                "reviews": 2134,
-                "type": 'Private',
-                "category": 'Medical',
-                "established": 1953,
-                "fees": 1800000,
-                "placement": 1500000,
-                "ranking": 10,
-                "featured": False,
-                "courses": 65,
-                "students": 28000,
-                "image": '/api/placeholder/400/300'
-            },
-            {
-                "id": "13",
-                "name": 'Vellore Institute of Technology',
-                "shortName": 'VIT Vellore',
-                "location": 'Vellore',
-                "state": 'Tamil Nadu',
-                "rating": 4.4,
-                "reviews": 3567,
-                "type": 'Private',
-                "category": 'Engineering',
-                "established": 1984,
-                "fees": 175000,
-                "placement": 1200000,
-                "ranking": 11,
-                "featured": False,
-                "courses": 52,
-                "students": 35000,
-                "image": '/api/placeholder/400/300'
-            },
+        if cached is not None:
+            return cached
+
+        pipeline = [{"$match": CollegeService.build_match(query)}]
+        cursor_sort = sort_by
+        if sort_by == "relevance":
+            sort_key = "relevance_sort"
+            cursor_sort = TEXT_RELEVANCE
+            pipeline.append({"$addFields": {sort_key: RELEVANCE_EXPRESSION}})
+        else:
+            sort_key = SORT_FIELDS.get(sort_by)
+        if cursor:
+            # A catalog relevance cursor is rejected here: its scores mean nothing to the text index
+            value, last_id = decode_cursor(cursor, cursor_sort)
+            pipeline.append({"$match": keyset_match(sort_key, direction, value, last_id)})
+        pipeline.append({"$sort": {sort_key: direction, "_id": direction} if sort_key else {"_id": 1}})
+
+        projection = dict(LIST_ITEM_PROJECTION)
+        if sort_key:
+            projection["sort_value"] = f"${sort_key}"
+
+        if cursor:
+            pipeline += [{"$limit": page_size + 1}, {"$project": projection}]
+            docs = await CollegeCard.aggregate(pipeline).to_list()
+            has_more = len(docs) > page_size
+            docs = docs[:page_size]
+            total = None
+        else:
+            skip = (page - 1) * page_size
+            pipeline.append(
+                facet_page_stage(skip=skip, limit=page_size, item_stages=[{"$project": projection}])
+            )
+            result = await CollegeCard.aggregate(pipeline).to_list()
+            docs, total = unpack_facet_page(result)
+            has_more = skip + len(docs) < total
+
+        next_cursor = None
+        if docs and has_more:
+            next_cursor = encode_cursor(cursor_sort, docs[-1].get("sort_value"), docs[-1]["_id"])
+
+        colleges = []
+        for doc in docs:
+            doc.pop("sort_value", None)
+            colleges.append(CollegeService.to_list_item(doc))
+
+        return CollegeListPageResponse(
+            colleges=colleges,
+            total=total,
+            page=page,
+            size=page_size,
+            next_cursor=next_cursor
+        )
+
+    @staticmethod
+    async def get_nearby_colleges(
+        lat: float,
+        lng: float,
+        radius_km: float,
+        query: dict = {},
+        page: int = 1,
+        page_size: int = 10
+    ) -> CollegeNearbyResponse:
+        """
+        Colleges within `radius_km` of a point, nearest first, via $geoNear on the
+        2dsphere index of college_cards, so only cards inside the radius are read.
+        """
+        skip = (page - 1) * page_size
+        projection = {**LIST_ITEM_PROJECTION, "distance_km": {"$divide": ["$distance_m", 1000]}}
+        pipeline = [
+            {"$geoNear": {
+                "near": {"type": "Point", "coordinates": [lng, lat]},
+                "key": "geo",
+                "distanceField": "distance_m",
+                "maxDistance": radius_km * 1000,
+                "spherical": True,
+                "query": CollegeService.build_match(query),
+            }},
+            facet_page_stage(skip=skip, limit=page_size, item_stages=[{"$project": projection}]),
+        ]
+        result = await CollegeCard.aggregate(pipeline).to_list()
+        docs, total = unpack_facet_page(result)
+
+        return CollegeNearbyResponse(
+            colleges=[CollegeService.to_list_item(doc) for doc in docs],
+            total=total,
+            page=page,
+            size=page_size
+        )
+
+    @staticmethod
+    async def suggest_colleges(text: str, limit: int = 10) -> CollegeSuggestResponse:
+        """
+        Autocomplete suggestions for a search-box prefix, most popular first, from
+        the in-memory prefix index; falls back to a text search until it is loaded.
+        """
+        if len(suggest_index):
+            return CollegeSuggestResponse(suggestions=suggest_index.suggest(text, limit))
+
+        pipeline = [
+            {"$match": CollegeService.build_match({"search": text})},
+            {"$sort": {"score": {"$meta": "textScore"}, "_id": 1}},
+            {"$limit": limit},
+            {"$project": {
+                "name": 1,
+                "short_name": 1,
+                "alias": 1,
+                "slug": 1,
+                "location": 1,
+                "state": 1,
+            }},
+        ]
+        docs = await CollegeCard.aggregate(pipeline).to_list()
+        suggestions = []
+        for doc in docs:
+            doc["id"] = str(doc.pop("_id"))
+            suggestions.append(doc)
+        return CollegeSuggestResponse(suggestions=suggestions)
+
+    @staticmethod
+    def list_cache_key(
+        query: dict,
+        sort_criteria: Optional[List[Tuple[str, int]]],
+        page: int,
+        page_size: int,
+        cursor: Optional[str]
+    ) -> str:
+        """
+        Cache key for a list request. It carries the catalog content version, so
+        pages cached before a data change are never served after it; without a
+        catalog, entries only expire by TTL.
+        """
+        snapshot = catalog.snapshot
+        version = snapshot.version if snapshot is not None else "live"
+        request = json.dumps(
             {
-                "id": "14",
-                "name": 'Indian Statistical Institute',
-                "shortName": 'ISI Kolkata',
-                "location": 'Kolkata',
-                "state": 'West Bengal',
-                "rating": 4.7,
-                "reviews": 654,
-                "type": 'Public',
-                "category": 'Science & Research',
-                "established": 1931,
-                "fees": 100000,
-                "placement": 2400000,
-                "ranking": 3,
-                "featured": True,
-                "courses": 12,
-                "students": 900,
-                "image": '/api/placeholder/400/300'
+                "query": CollegeService.normalize_query(query),
+                "sort": sort_criteria,
+                "page": None if cursor else page,
+                "size": page_size,
+                "cursor": cursor,
             },
-            {
-                "id": "15",
-                "name": 'Amity University',
-                "shortName": 'Amity Noida',
-                "location": 'Noida',
-                "state": 'Uttar Pradesh',
-                "rating": 4.2,
-                "reviews": 4321,
-                "type": 'Private',
-                "category": 'Arts & Science',
-                "established": 2005,
-                "fees": 200000,
-                "placement": 600000,
-                "ranking": 20,
-                "featured": False,
-                "courses": 95,
-                "students": 45000,
-                "image": '/api/placeholder/400/300'
+            sort_keys=True
+        )
+        return f"{version}:{hashlib.sha1(request.encode()).hexdigest()}"
+
+    @staticmethod
+    def list_etag(
+        query: dict,
+        sort_criteria: Optional[List[Tuple[str, int]]],
+        page: int,
+        page_size: int,
+        cursor: Optional[str],
+        fields: Optional[List[str]] = None
+    ) -> Optional[str]:
+        """
+        ETag of a list response, known without running the query: the catalog
+        version and the request. None when no catalog is loaded.
+        """
+        if catalog.snapshot is None:
+            return None
+        key = CollegeService.list_cache_key(query, sort_criteria, page, page_size, cursor)
+        return make_etag(key, ",".join(sorted(fields)) if fields else "")
+
+    @staticmethod
+    def validate_list_fields(fields: List[str]) -> None:
+        """Check that sparse list fields name CollegeListItem fields."""
+        for field in fields:
+            if field not in LIST_ITEM_FIELDS:
+                raise InvalidFieldsError(f"Unknown field: {field}")
+
+    @staticmethod
+    def sparse_page(data: dict, fields: List[str]) -> dict:
+        """Copy of a serialized list page keeping only `fields` (and id) of each college."""
+        keep = ["id"] + [field for field in fields if field != "id"]
+        return {
+            **data,
+            "colleges": [{field: college.get(field) for field in keep} for college in data["colleges"]],
+        }
+
+    @staticmethod
+    async def get_colleges_cached(
+        query: dict = {},
+        sort_criteria: Optional[List[Tuple[str, int]]] = None,
+        page: int = 1,
+        page_size: int = 10,
+        cursor: Optional[str] = None,
+        fields: Optional[List[str]] = None
+    ) -> dict:
+        """
+        `get_colleges` behind the two-tier response cache; returns the serialized page,
+        trimmed to `fields` when given. Every field set shares the one cached page.
+        """
+        async def compute() -> dict:
+            colleges_data = await CollegeService.get_colleges(query, sort_criteria, page, page_size, cursor)
+            return colleges_data.model_dump(mode="json")
+
+        if fields:
+            CollegeService.validate_list_fields(fields)
+
+        if not settings.RESPONSE_CACHE_ENABLED:
+            data = await compute()
+        else:
+            key = CollegeService.list_cache_key(query, sort_criteria, page, page_size, cursor)
+            data = await college_list_cache.get_or_compute(key, compute)
+
+        return CollegeService.sparse_page(data, fields) if fields else data
+
+    @staticmethod
+    def to_detail(doc: dict) -> CollegeDetailResponse:
+        """Map a College document projected with DETAIL_PROJECTION onto CollegeDetailResponse."""
+        detail = dict(doc)
+        detail["_id"] = str(detail["_id"])
+        detail["established"] = detail.pop("established_year", None)
+
+        address = detail.pop("address", None)
+        if address:
+            coordinates = {
+                key: value
+                for key, value in (address.get("coordinates") or {}).items()
+                if value is not None
+            }
+            detail["location"] = {
+                "address": ", ".join(part for part in (address.get("line1"), address.get("line2")) if part),
+                "city": address.get("city") or "",
+                "state": address.get("state") or "",
+                "pincode": address.get("pincode"),
+                "coordinates": coordinates or None,
             }
-        ]
 
-        # Apply filters from query
-        filtered_colleges = all_colleges.copy()
+        hostel = (detail.get("infrastructure") or {}).get("hostel")
+        if hostel:
+            detail["infrastructure"] = {
+                **detail["infrastructure"],
+                "hostel": {**hostel, "rooms": hostel.get("rooms_type")},
+            }
 
-        # Name search filter (case-insensitive)
-        if 'name' in query and '$regex' in query['name']:
-            search_pattern = query['name']['$regex']
-            filtered_colleges = [
-                c for c in filtered_colleges
-                if re.search(search_pattern, c['name'], re.IGNORECASE)
-            ]
+        return CollegeDetailResponse.model_validate(detail)
 
-        # State filter
-        if 'state' in query:
-            filtered_colleges = [
-                c for c in filtered_colleges
-                if c['state'] == query['state']
-            ]
+    @staticmethod
+    async def get_college_by_id(id_or_slug: str) -> Optional[dict]:
+        """Detail of a college by ObjectId or slug; None if it does not exist or is deleted."""
+        college_id = await CollegeService.resolve_college_id(id_or_slug)
+        if college_id is None:
+            return None
+
+        docs = await College.aggregate([
+            {"$match": {"_id": ObjectId(college_id), "is_deleted": {"$ne": True}}},
+            {"$project": DETAIL_PROJECTION},
+        ]).to_list()
+        if not docs:
+            return None
+        return CollegeService.to_detail(docs[0]).model_dump(mode="json")
 
-        # Type filter
-        if 'type' in query:
-            filtered_colleges = [
-                c for c in filtered_colleges
-                if c['type'] == query['type']
+    @staticmethod
+    def detail_envelope(college: dict) -> str:
+        """Serialized detail response body, as stored in the detail cache."""
+        return BaseResponseSchema(
+            success=True,
+            message="College retrieved successfully",
+            data=college
+        ).model_dump_json()
+
+    @staticmethod
+    async def get_college_detail_json(college_id: str, version: str) -> Optional[str]:
+        """
+        Serialized detail response for one version of a college. It is built once per
+        version and then served from the response cache, skipping the MongoDB read,
+        the model mapping and serialization.
+        """
+        async def compute() -> Optional[str]:
+            college = await CollegeService.get_college_by_id(college_id)
+            if college is None:
+                return None
+            return CollegeService.detail_envelope(college)
+
+        if not settings.RESPONSE_CACHE_ENABLED:
+            return await compute()
+        return await college_detail_cache.get_or_compute(f"{college_id}:{version}", compute)
+
+    @staticmethod
+    async def get_colleges_by_ids(ids_or_slugs: List[str]) -> Tuple[List[dict], List[str]]:
+        """
+        Details of several colleges by ObjectId or slug, in request order, plus the
+        values that matched nothing. Details come from the detail cache where the
+        current version is cached; the rest are read in a single $in query and
+        cached for the single-college endpoint too.
+        """
+        resolved = await CollegeService.resolve_college_ids(ids_or_slugs)
+        versions = await CollegeService.get_college_versions(list(dict.fromkeys(resolved.values())))
+        keys = {college_id: f"{college_id}:{version}" for college_id, version in versions.items()}
+
+        details = {}
+        if settings.RESPONSE_CACHE_ENABLED:
+            cached = await college_detail_cache.get_many(list(keys.values()))
+            for college_id, key in keys.items():
+                body = cached.get(key)
+                if body:
+                    details[college_id] = json.loads(body)["data"]
+
+        missing = [ObjectId(college_id) for college_id in keys if college_id not in details]
+        if missing:
+            docs = await College.aggregate([
+                {"$match": {"_id": {"$in": missing}, "is_deleted": {"$ne": True}}},
+                {"$project": DETAIL_PROJECTION},
+            ]).to_list()
+            bodies = {}
+            for doc in docs:
+                college = CollegeService.to_detail(doc).model_dump(mode="json")
+                details[college["id"]] = college
+                bodies[keys[college["id"]]] = CollegeService.detail_envelope(college)
+            if settings.RESPONSE_CACHE_ENABLED:
+                await college_detail_cache.set_many(bodies)
+
+        colleges = []
+        not_found = []
+        for value in ids_or_slugs:
+            college = details.get(resolved.get(value))
+            if college is None:
+                not_found.append(value)
+            else:
+                colleges.append(college)
+        return colleges, not_found
+
+    @staticmethod
+    def compare_value(value: Any) -> Optional[float]:
+        """Numeric value behind a metric for ranking ("2500000", 8.5); None if it has none."""
+        if isinstance(value, bool):
+            return None
+        if isinstance(value, (int, float)):
+            return float(value)
+        try:
+            return float(str(value).replace(",", "").strip())
+        except (TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def compare_row(section: str, key: str, label: str, values: List[Any], better: Optional[str]) -> CompareRow:
+        best = []
+        numbers = [CollegeService.compare_value(value) for value in values]
+        known = [number for number in numbers if number is not None]
+        if better and len(known) > 1:
+            target = min(known) if better == "min" else max(known)
+            best = [index for index, number in enumerate(numbers) if number == target]
+        return CompareRow(section=section, key=key, label=label, values=values, best=best)
+
+    @staticmethod
+    def build_comparison(colleges: List[dict], not_found: List[str]) -> CollegeCompareResponse:
+        """
+        Line up the colleges' fees, placement, ratings, rankings and accreditations as
+        rows with one value per college. Rankings take each organisation and category's
+        latest year per college; rows no college has a value for are left out.
+        """
+        rows = []
+        for section, key, label, better in COMPARE_METRICS:
+            values = [(college.get(section) or {}).get(key) for college in colleges]
+            if any(value is not None for value in values):
+                rows.append(CollegeService.compare_row(section, key, label, values, better))
+
+        latest_ranks: Dict[Tuple[str, str], List[Optional[dict]]] = {}
+        for index, college in enumerate(colleges):
+            for ranking in college.get("rankings") or []:
+                group = (ranking["organisation"], ranking.get("category") or "Overall")
+                slots = latest_ranks.setdefault(group, [None] * len(colleges))
+                if slots[index] is None or ranking["year"] > slots[index]["year"]:
+                    slots[index] = ranking
+        for (organisation, category), slots in sorted(latest_ranks.items()):
+            rows.append(CollegeService.compare_row(
+                "rankings",
+                f"{organisation}:{category}",
+                f"{organisation} rank ({category})",
+                [slot["rank"] if slot else None for slot in slots],
+                "min"
+            ))
+
+        grades: Dict[str, List[Optional[str]]] = {}
+        for index, college in enumerate(colleges):
+            for accreditation in college.get("accreditations") or []:
+                grades.setdefault(accreditation["body"], [None] * len(colleges))[index] = accreditation.get("grade")
+        for body, values in sorted(grades.items()):
+            rows.append(CollegeService.compare_row("accreditations", body, f"{body} grade", values, None))
+
+        return CollegeCompareResponse(
+            colleges=[
+                CompareCollege(
+                    id=college["id"],
+                    name=college["name"],
+                    short_name=college.get("short_name"),
+                    location=(college.get("location") or {}).get("city"),
+                )
+                for college in colleges
+            ],
+            rows=rows,
+            not_found=not_found
+        )
+
+    @staticmethod
+    async def compare_colleges(ids_or_slugs: List[str]) -> CollegeCompareResponse:
+        colleges, not_found = await CollegeService.get_colleges_by_ids(ids_or_slugs)
+        return CollegeService.build_comparison(colleges, not_found)
+
+    @staticmethod
+    async def invalidate_college(college_id: str) -> None:
+        """
+        Drop the cached detail of one written college. Its catalog version is dropped
+        too, so until the catalog takes in the change its version is read from MongoDB
+        and the old entry is no longer served.
+        """
+        keys = set(college_detail_cache.local_keys(f"{college_id}:"))
+
+        previous = catalog.drop_version(college_id)
+        if previous is not None:
+            keys.add(f"{college_id}:{previous}")
+        await college_detail_cache.delete(list(keys))
+
+        for slug in [slug for slug, target in slug_ids.items() if target == college_id]:
+            del slug_ids[slug]
+
+    @staticmethod
+    def validate_detail_fields(fields: List[str]) -> None:
+        """Check that sparse detail fields are College paths (builds their projection model)."""
+        projection_model(College, frozenset(fields))
+
+    @staticmethod
+    async def get_college_fields(college_id: str, fields: List[str]) -> Optional[dict]:
+        """
+        Read only the requested College paths. They are projected in MongoDB and
+        validated against a model built for just those paths, so unrequested nested
+        arrays are neither transferred nor parsed.
+        """
+        paths = frozenset(fields)
+        model = projection_model(College, paths)
+        if not ObjectId.is_valid(college_id):
+            return None
+
+        docs = await College.aggregate([
+            {"$match": {"_id": ObjectId(college_id), "is_deleted": {"$ne": True}}},
+            {"$project": mongo_projection(College, paths)},
+        ]).to_list()
+        if not docs:
+            return None
+
+        doc = docs[0]
+        doc["_id"] = str(doc["_id"])
+        return model.model_validate(doc).model_dump(mode="json")
+
+    @staticmethod
+    def normalize_query(query: dict) -> str:
+        """Canonical cache key for a list query: sorted keys, trimmed string values."""
+        normalized = {
+            key: value.strip() if isinstance(value, str) else value
+            for key, value in query.items()
+        }
+        return json.dumps(normalized, sort_keys=True, default=str)
+
+    @staticmethod
+    def invalidate_facets() -> None:
+        """Drop every cached facet count; called when colleges are written."""
+        facet_cache.clear()
+
+    @staticmethod
+    def build_facets_response(total: int, counts: Dict[str, Dict[Any, int]]) -> CollegeFacetsResponse:
+        facets = {
+            field: [
+                FacetCount(value=str(value), count=count)
+                for value, count in sorted(counts.get(field, {}).items(), key=lambda kv: (-kv[1], str(kv[0])))
             ]
+            for field in FACET_FIELDS
+        }
+        return CollegeFacetsResponse(total=total, **facets)
 
-        # Category filter
-        if 'category' in query:
-            filtered_colleges = [
-                c for c in filtered_colleges
-                if c['category'] == query['category']
+    @staticmethod
+    async def compute_facets(query: dict) -> CollegeFacetsResponse:
+        """Count matching colleges per facet value in one pass, from the catalog or one $facet."""
+        snapshot = catalog.snapshot
+        if snapshot is not None:
+            filters, ranked_rows, _ = CollegeService.catalog_filters(snapshot, query)
+            mask = snapshot.mask(filters, ranked_rows)
+            if mask is not None:
+                counts = snapshot.facet_counts(mask, list(FACET_FIELDS))
+                return CollegeService.build_facets_response(int(mask.sum()), counts)
+
+        facet_stage = {"total": [{"$count": "count"}]}
+        for field, path in FACET_FIELDS.items():
+            facet_stage[field] = [
+                {"$match": {path: {"$nin": [None, ""]}}},
+                {"$sortByCount": f"${path}"},
             ]
+        pipeline = [{"$match": CollegeService.build_match(query)}, {"$facet": facet_stage}]
 
-        # Apply sorting
-        if sort_criteria:
-            sort_field, sort_order = sort_criteria[0]
-            reverse = sort_order == -1
-            filtered_colleges = sorted(
-                filtered_colleges,
-                key=lambda x: x.get(sort_field, 0),
-                reverse=reverse
-            )
+        result = await CollegeCard.aggregate(pipeline).to_list()
+        facet = result[0] if result else {}
+        total = facet["total"][0]["count"] if facet.get("total") else 0
+        counts = {
+            field: {bucket["_id"]: bucket["count"] for bucket in facet.get(field, [])}
+            for field in FACET_FIELDS
+        }
+        return CollegeService.build_facets_response(total, counts)
 
-        # Calculate pagination
-        total = len(filtered_colleges)
-        total_pages = (total + page_size - 1) // page_size
-        start_idx = (page - 1) * page_size
-        end_idx = start_idx + page_size
-        paginated_colleges = filtered_colleges[start_idx:end_idx]
+    @staticmethod
+    async def get_facets(query: dict = {}) -> CollegeFacetsResponse:
+        """
+        Facet counts for the listing filters, cached per normalized filter. Cache keys
+        carry the catalog generation, so a refreshed snapshot never serves stale counts.
+        """
+        key = f"{catalog.generation}:{CollegeService.normalize_query(query)}"
+        now = time.monotonic()
 
-        # Convert fees and placement back to string format for display
-        for college in paginated_colleges:
-            print(college['name'])
-            college['fees'] = f"₹{college['fees'] / 100000:.1f} Lakhs"
-            college['placement'] = f"₹{college['placement'] / 100000:.0f} LPA"
+        cached = facet_cache.get(key)
+        if cached and cached[0] > now:
+            return cached[1]
 
-        return CollegeListPageResponse(
-            colleges=paginated_colleges,
-            total=total,
-            page=page,
-            size=page_size
-        )
+        facets = await CollegeService.compute_facets(query)
+
+        if len(facet_cache) >= FACET_CACHE_MAX_ENTRIES:
+            facet_cache.pop(next(iter(facet_cache)))
+        facet_cache[key] = (now + FACET_CACHE_TTL_SECONDS, facets)
+        return facets
+
+    @staticmethod
+    async def get_unique_states() -> List[str]:
+        """All states that have listed colleges."""
+        facets = await CollegeService.get_facets({})
+        return sorted(facet.value for facet in facets.state)
+
+    @staticmethod
+    async def get_unique_categories() -> List[str]:
+        """All categories that have listed colleges."""
+        facets = await CollegeService.get_facets({})
+        return sorted(facet.value for facet in facets.category)
+
+
+change_feed.subscribe(COLLEGE, CollegeService.on_college_change)
@@ -0,0 +1,217 @@
+import re
+from bisect import bisect_left, insort
+from heapq import nsmallest
+from typing import Optional, List, Dict, Tuple, Any
+
+NORMALIZE_PATTERN = re.compile(r"[^a-z0-9]+")
+
+# Words skipped when deriving an acronym, e.g. "Indian Institute of Technology Bombay" -> "iitb"
+ACRONYM_STOPWORDS = {"of", "and", "the", "for", "in", "at"}
+
+# Fields returned with each suggestion, besides the college id
+SUGGESTION_FIELDS = ["name", "short_name", "alias", "slug", "location", "state"]
+
+# Prefixes matching more keys than this have their suggestions memoized until the
+# next change, so the broad one- and two-letter prefixes are only walked once
+MEMO_RANGE_SIZE = 1000
+MEMO_MAX_ENTRIES = 4096
+
+
+def normalize(text: Optional[str]) -> str:
+    """Lowercase `text` and collapse punctuation and whitespace runs into single spaces."""
+    if not text:
+        return ""
+    return NORMALIZE_PATTERN.sub(" ", text.lower()).strip()
+
+
+def acronym(name: str) -> Optional[str]:
+    """Initials of the significant words of a name, if it has at least two."""
+    words = [word for word in name.split() if word not in ACRONYM_STOPWORDS]
+    if len(words) < 2:
+        return None
+    return "".join(word[0] for word in words)
+
+
+def suggestion_keys(entry: Dict[str, Any]) -> List[str]:
+    """
+    Normalized strings a college can be found by: its name and every word suffix of
+    it (so "bombay" finds "IIT Bombay"), short name, alias and name acronym.
+    """
+    keys = set()
+    name = normalize(entry.get("name"))
+    if name:
+        words = name.split()
+        for i in range(len(words)):
+            keys.add(" ".join(words[i:]))
+        short = acronym(name)
+        if short:
+            keys.add(short)
+    for field in ("short_name", "alias"):
+        value = normalize(entry.get(field))
+        if value:
+            keys.add(value)
+            short = acronym(value)
+            if short:
+                keys.add(short)
+    return sorted(keys)
+
+
+def popularity_key(entry: Dict[str, Any]) -> Tuple:
+    """Sort key putting the best ranked, then most reviewed and best rated colleges first."""
+    ranking = entry.get("ranking")
+    return (
+        ranking is None,
+        ranking or 0,
+        -(entry.get("reviews") or 0),
+        -(entry.get("rating") or 0),
+        normalize(entry.get("name")),
+    )
+
+
+class CollegeSuggestIndex:
+    """
+    Sorted prefix array for search-box autocomplete.
+
+    Every key from `suggestion_keys` is stored as a (key, college_id) pair in one
+    sorted list; a prefix lookup is a bisect for the start of the range and a walk
+    to its end, keeping the N most popular distinct colleges. Prefixes broad enough
+    to match a large share of colleges instead walk the colleges in popularity
+    order and stop after N hits. Colleges are added,
+    changed and removed one at a time, so after the initial load a catalog refresh
+    only touches the colleges that actually changed.
+    """
+
+    def __init__(self):
+        self.entries: List[Tuple[str, str]] = []  # sorted (key, college_id)
+        self.documents: Dict[str, Dict[str, Any]] = {}  # college_id -> suggestion payload
+        self.keys: Dict[str, List[str]] = {}  # college_id -> its keys
+        self.popularity: Dict[str, Tuple] = {}  # college_id -> popularity_key
+        self.ranked: List[Tuple[Tuple, str]] = []  # sorted (popularity_key, college_id)
+        self.memo: Dict[Tuple[str, int], List[Dict[str, Any]]] = {}
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def upsert(self, college_id: str, entry: Dict[str, Any]) -> None:
+        """Add a college, or update it in place if it is already indexed."""
+        keys = suggestion_keys(entry)
+        if self.keys.get(college_id) != keys:
+            self.remove(college_id)
+            for key in keys:
+                insort(self.entries, (key, college_id))
+            self.keys[college_id] = keys
+
+        self.documents[college_id] = {field: entry.get(field) for field in SUGGESTION_FIELDS}
+        self.documents[college_id]["id"] = college_id
+
+        popularity = popularity_key(entry)
+        previous = self.popularity.get(college_id)
+        if previous != popularity:
+            if previous is not None:
+                self.unrank(college_id, previous)
+            insort(self.ranked, (popularity, college_id))
+            self.popularity[college_id] = popularity
+        self.memo.clear()
+
+    def unrank(self, college_id: str, popularity: Tuple) -> None:
+        position = bisect_left(self.ranked, (popularity, college_id))
+        if position < len(self.ranked) and self.ranked[position] == (popularity, college_id):
+            self.ranked.pop(position)
+
+    def remove(self, college_id: str) -> None:
+        """Drop a college from the index."""
+        for key in self.keys.pop(college_id, []):
+            position = bisect_left(self.entries, (key, college_id))
+            if position < len(self.entries) and self.entries[position] == (key, college_id):
+                self.entries.pop(position)
+        popularity = self.popularity.pop(college_id, None)
+        if popularity is not None:
+            self.unrank(college_id, popularity)
+        self.documents.pop(college_id, None)
+        self.memo.clear()
+
+    def load(self, entries: List[Dict[str, Any]]) -> None:
+        """Bulk-fill an empty index with one sort instead of per-key inserts."""
+        pairs = []
+        for entry in entries:
+            college_id = entry["id"]
+            keys = suggestion_keys(entry)
+            self.keys[college_id] = keys
+            self.documents[college_id] = {field: entry.get(field) for field in SUGGESTION_FIELDS}
+            self.documents[college_id]["id"] = college_id
+            self.popularity[college_id] = popularity_key(entry)
+            pairs.extend((key, college_id) for key in keys)
+        pairs.sort()
+        self.entries = pairs
+        self.ranked = sorted((popularity, college_id) for college_id, popularity in self.popularity.items())
+        self.memo.clear()
+
+    def swap(self, other: "CollegeSuggestIndex") -> None:
+        """Take over the contents of a freshly loaded index."""
+        self.entries = other.entries
+        self.documents = other.documents
+        self.keys = other.keys
+        self.popularity = other.popularity
+        self.ranked = other.ranked
+        self.memo = {}
+
+    def diff(self, entries: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[str]]:
+        """
+        Compare the full list of colleges with the index without modifying it.
+        Returns the entries that are new or changed and the ids no longer present.
+        """
+        seen = set()
+        changed = []
+        for entry in entries:
+            college_id = entry["id"]
+            seen.add(college_id)
+            current = self.documents.get(college_id)
+            if (
+                current is None
+                or any(current[field] != entry.get(field) for field in SUGGESTION_FIELDS)
+                or self.popularity[college_id] != popularity_key(entry)
+            ):
+                changed.append(entry)
+
+        stale = [college_id for college_id in self.documents if college_id not in seen]
+        return changed, stale
+
+    def apply(self, changed: List[Dict[str, Any]], stale: List[str]) -> None:
+        """Apply the result of `diff`: upsert the changed colleges and drop the stale ones."""
+        for entry in changed:
+            self.upsert(entry["id"], entry)
+        for college_id in stale:
+            self.remove(college_id)
+
+    def suggest(self, text: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """The `limit` most popular colleges with a key starting with `text`."""
+        prefix = normalize(text)
+        if not prefix:
+            return []
+
+        memo_key = (prefix, limit)
+        cached = self.memo.get(memo_key)
+        if cached is not None:
+            return cached
+
+        start = bisect_left(self.entries, (prefix,))
+        end = bisect_left(self.entries, (prefix + "\uffff",), start)
+        if (end - start) ** 2 > limit * len(self.ranked):
+            # Broad prefix: most colleges match, so walking them from the most
+            # popular down finds `limit` hits sooner than scanning the key range
+            best = []
+            for _, college_id in self.ranked:
+                if any(key.startswith(prefix) for key in self.keys[college_id]):
+                    best.append(college_id)
+                    if len(best) == limit:
+                        break
+        else:
+            matched = {college_id for _, college_id in self.entries[start:end]}
+            best = nsmallest(limit, matched, key=self.popularity.__getitem__)
+        suggestions = [self.documents[college_id] for college_id in best]
+
+        if end - start > MEMO_RANGE_SIZE:
+            if len(self.memo) >= MEMO_MAX_ENTRIES:
+                self.memo.pop(next(iter(self.memo)))
+            self.memo[memo_key] = suggestions
+        return suggestions
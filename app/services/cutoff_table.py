@@ -0,0 +1,352 @@
+from typing import Optional, List, Dict, Tuple, Any
+import numpy as np
+from app.models.junction import Quota
+from app.models.scholarship import Category, Gender
+
+# Chance of admission, by the student's rank over the seat's closing rank
+SAFE = "safe"
+TARGET = "target"
+REACH = "reach"
+CHANCES = [SAFE, TARGET, REACH]
+SAFE_RATIO = 0.8  # well inside last year's closing rank
+TARGET_RATIO = 1.05  # around it
+REACH_RATIO = 1.3  # past it, but within the usual year-to-year drift
+
+# Enum fields are stored as codes: the index of the value in its enum
+CATEGORIES = [category.value for category in Category]
+GENDERS = [gender.value for gender in Gender]
+QUOTAS = [quota.value for quota in Quota]
+CATEGORY_CODES = {value: code for code, value in enumerate(CATEGORIES)}
+GENDER_CODES = {value: code for code, value in enumerate(GENDERS)}
+QUOTA_CODES = {value: code for code, value in enumerate(QUOTAS)}
+
+# One NumPy column per cutoff field, rows sorted by (exam, year, branch, round descending)
+CUTOFF_COLUMNS = {
+    "branch": np.int32,
+    "round": np.int16,
+    "category": np.int8,
+    "gender": np.int8,
+    "quota": np.int8,
+    "opening": np.int32,
+    "closing": np.int32,
+}
+
+# Per-branch and per-row arrays besides the columns, and the plain attributes that
+# complete a table; together they can be handed to another process
+TABLE_ARRAYS = ["branch_state", "branch_stream", "branch_fees", "years"]
+TABLE_META = ["size", "rows", "exams", "slices", "state_codes", "stream_codes"]
+
+
+def exam_key(exam: str) -> str:
+    """Exam names compare case- and spacing-insensitively, e.g. 'jee  main' == 'JEE Main'."""
+    return " ".join(exam.split()).upper()
+
+
+def state_key(state: Optional[str]) -> str:
+    return " ".join((state or "").split()).lower()
+
+
+class CutoffTable:
+    """
+    Immutable, array-backed view of every branch cutoff.
+
+    Each cutoff row (one round of one seat type of one branch) is a position in
+    the NumPy columns of CUTOFF_COLUMNS, sorted by exam and year so a prediction
+    only scans the rows of one exam's year, and within it by branch and latest
+    round so each branch's seat is picked without sorting. Branch attributes used
+    as filters (college state, stream, fees) are per-branch columns indexed by the
+    row's branch, and the enum fields are small integer codes, so a prediction is
+    a few vectorized comparisons and reductions.
+    """
+
+    def __init__(self, docs: List[dict]):
+        self.branches = [doc["row"] for doc in docs]
+        self.size = len(self.branches)
+
+        self.state_codes: Dict[str, int] = {}
+        self.stream_codes: Dict[str, int] = {}
+        self.branch_state = np.fromiter(
+            (self.state_codes.setdefault(state_key(doc.get("state")), len(self.state_codes)) for doc in docs),
+            dtype=np.int32,
+            count=self.size
+        )
+        self.branch_stream = np.fromiter(
+            (self.stream_codes.setdefault(doc["stream_id"], len(self.stream_codes)) for doc in docs),
+            dtype=np.int32,
+            count=self.size
+        )
+        self.branch_fees = np.array([doc.get("fees", np.nan) for doc in docs], dtype=np.float64)
+
+        exams: Dict[str, int] = {}
+        values: Dict[str, List[int]] = {"exam": [], "year": [], **{name: [] for name in CUTOFF_COLUMNS}}
+        for branch, doc in enumerate(docs):
+            for cutoff in doc["cutoffs"]:
+                values["exam"].append(exams.setdefault(exam_key(cutoff["exam"]), len(exams)))
+                values["year"].append(cutoff["year"])
+                values["branch"].append(branch)
+                values["round"].append(cutoff.get("round") or 1)
+                values["category"].append(CATEGORY_CODES[cutoff.get("category") or Category.GENERAL.value])
+                values["gender"].append(GENDER_CODES[cutoff.get("gender") or Gender.ANY.value])
+                values["quota"].append(QUOTA_CODES[cutoff.get("quota") or Quota.ALL_INDIA.value])
+                values["opening"].append(cutoff["opening_rank"])
+                values["closing"].append(cutoff["closing_rank"])
+
+        exam = np.array(values["exam"], dtype=np.int32)
+        year = np.array(values["year"], dtype=np.int32)
+        # Within an exam's year, rows are grouped by branch with its latest round first
+        round_desc = -np.array(values["round"], dtype=np.int32)
+        order = np.lexsort((round_desc, np.array(values["branch"], dtype=np.int32), year, exam))
+        self.columns = {
+            name: np.array(values[name], dtype=dtype)[order] for name, dtype in CUTOFF_COLUMNS.items()
+        }
+        self.rows = int(order.size)
+        self.exams = list(exams)
+        self.years = year[order]
+
+        # exam -> year -> (start, end) of its rows
+        self.slices: Dict[str, Dict[int, Tuple[int, int]]] = {name: {} for name in self.exams}
+        keys = exam[order].astype(np.int64) * 10000 + self.years
+        starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]]) if self.rows else np.array([], dtype=np.intp)
+        ends = np.r_[starts[1:], self.rows]
+        for start, end in zip(starts.tolist(), ends.tolist()):
+            self.slices[self.exams[int(keys[start] // 10000)]][int(self.years[start])] = (start, end)
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        """Every array a prediction reads, by name."""
+        arrays = {f"column.{name}": column for name, column in self.columns.items()}
+        arrays.update({name: getattr(self, name) for name in TABLE_ARRAYS})
+        return arrays
+
+    def meta(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in TABLE_META}
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray], meta: Dict[str, Any]) -> "CutoffTable":
+        """
+        A table over existing arrays, e.g. mapped from shared memory by a worker
+        process. It predicts like the original but carries no branch payloads.
+        """
+        table = cls.__new__(cls)
+        table.__dict__.update(meta)
+        table.branches = []
+        table.columns = {name: arrays[f"column.{name}"] for name in CUTOFF_COLUMNS}
+        for name in TABLE_ARRAYS:
+            setattr(table, name, arrays[name])
+        return table
+
+    def latest_year(self, exam: str) -> Optional[int]:
+        years = self.slices.get(exam_key(exam))
+        return max(years) if years else None
+
+    def cutoff(self, row: int) -> Dict[str, Any]:
+        """The cutoff fields of one row, decoded."""
+        columns = self.columns
+        return {
+            "year": int(self.years[row]),
+            "round": int(columns["round"][row]),
+            "category": CATEGORIES[columns["category"][row]],
+            "gender": GENDERS[columns["gender"][row]],
+            "quota": QUOTAS[columns["quota"][row]],
+            "opening_rank": int(columns["opening"][row]),
+            "closing_rank": int(columns["closing"][row]),
+        }
+
+    def profile(
+        self,
+        exam: str,
+        category: str = Category.GENERAL.value,
+        gender: str = Gender.ANY.value,
+        home_state: Optional[str] = None,
+        year: Optional[int] = None,
+        round: Optional[int] = None,
+        stream_id: Optional[str] = None,
+        max_fees: Optional[float] = None
+    ) -> Optional["SeatProfile"]:
+        """
+        The seats open to a student profile, none of which depends on the rank: per
+        branch, the most lenient open (general) seat and the most lenient seat of
+        their reserved category, among gender-neutral seats and their gender's,
+        all-India seats and the home- or other-state quota matching `home_state`.
+        Without `round`, each branch's last round of the year is used. None when the
+        exam has no cutoffs for the year.
+        """
+        years = self.slices.get(exam_key(exam))
+        if not years:
+            return None
+        span = years.get(year if year is not None else max(years))
+        if span is None:
+            return None
+
+        start, end = span
+        columns = {name: column[start:end] for name, column in self.columns.items()}
+        branch = columns["branch"]
+
+        # Seats open to every category are stored as general or as "any"
+        open_seat = np.isin(
+            columns["category"],
+            [CATEGORY_CODES[Category.GENERAL.value], CATEGORY_CODES[Category.ANY.value]]
+        )
+        mask = open_seat | (columns["category"] == CATEGORY_CODES[category])
+        mask &= (columns["gender"] == GENDER_CODES[Gender.ANY.value]) | (columns["gender"] == GENDER_CODES[gender])
+
+        quota = columns["quota"]
+        quota_mask = quota == QUOTA_CODES[Quota.ALL_INDIA.value]
+        if home_state:
+            home = self.state_codes.get(state_key(home_state), -1)
+            in_state = self.branch_state[branch] == home
+            quota_mask |= (quota == QUOTA_CODES[Quota.HOME_STATE.value]) & in_state
+            quota_mask |= (quota == QUOTA_CODES[Quota.OTHER_STATE.value]) & ~in_state
+        mask &= quota_mask
+
+        if round is not None:
+            mask &= columns["round"] == round
+        if stream_id is not None:
+            mask &= self.branch_stream[branch] == self.stream_codes.get(stream_id, -1)
+        if max_fees is not None:
+            mask &= self.branch_fees[branch] <= max_fees
+
+        rows = np.flatnonzero(mask)
+        if rows.size:
+            # Rows come grouped by branch, latest round first: keep each branch's
+            # latest matching round
+            branch_rows = branch[rows]
+            starts = np.flatnonzero(np.r_[True, branch_rows[1:] != branch_rows[:-1]])
+            group = np.repeat(np.arange(starts.size), np.diff(np.r_[starts, rows.size]))
+            rounds = columns["round"][rows]
+            latest = rounds == rounds[starts][group]
+            rows, group = rows[latest], group[latest]
+        else:
+            group = rows
+
+        closing = columns["closing"][rows]
+        reserved = ~open_seat[rows]
+        open_row, open_closing = most_lenient(rows, group, np.where(reserved, 0, closing))
+        reserved_row, reserved_closing = most_lenient(rows, group, np.where(reserved, closing, 0))
+        return SeatProfile(
+            year=int(self.years[start]),
+            closing=self.columns["closing"],
+            open_row=np.where(open_row >= 0, open_row + start, -1),
+            open_closing=open_closing,
+            reserved_row=np.where(reserved_row >= 0, reserved_row + start, -1),
+            reserved_closing=reserved_closing
+        )
+
+    def predict(
+        self,
+        rank: int,
+        exam: str,
+        category: str = Category.GENERAL.value,
+        gender: str = Gender.ANY.value,
+        category_rank: Optional[int] = None,
+        home_state: Optional[str] = None,
+        year: Optional[int] = None,
+        round: Optional[int] = None,
+        stream_id: Optional[str] = None,
+        max_fees: Optional[float] = None,
+        limit: int = 50
+    ) -> Dict[str, np.ndarray]:
+        """
+        Cutoff rows of the branches a student can expect, per chance, most
+        competitive first and at most `limit` each. See `profile` for the seats
+        considered; reserved seats are compared against `category_rank` when given.
+        """
+        profile = self.profile(exam, category, gender, home_state, year, round, stream_id, max_fees)
+        if profile is None:
+            return {chance: np.array([], dtype=np.intp) for chance in CHANCES}
+        return profile.predict(rank, category_rank, limit)
+
+
+def most_lenient(rows: np.ndarray, group: np.ndarray, closing: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Per group, the row with the highest closing rank among those with a nonzero
+    one, and that closing rank; -1 and 0 for groups with none. Groups are runs.
+    """
+    groups = int(group[-1]) + 1 if group.size else 0
+    best_closing = np.zeros(groups, dtype=np.int64)
+    best_row = np.full(groups, -1, dtype=np.int64)
+    if not groups:
+        return best_row, best_closing
+    starts = np.flatnonzero(np.r_[True, group[1:] != group[:-1]])
+    best_closing[:] = np.maximum.reduceat(closing, starts)
+    is_best = (closing == best_closing[group]) & (closing > 0)
+    found = np.flatnonzero(is_best)
+    first = found[np.r_[True, group[found][1:] != group[found][:-1]]] if found.size else found
+    best_row[group[first]] = rows[first]
+    return best_row, best_closing
+
+
+class SeatProfile:
+    """Per branch, the best open and reserved seat of one student profile; see CutoffTable.profile."""
+
+    def __init__(
+        self,
+        year: int,
+        closing: np.ndarray,
+        open_row: np.ndarray,
+        open_closing: np.ndarray,
+        reserved_row: np.ndarray,
+        reserved_closing: np.ndarray
+    ):
+        self.year = year
+        self.closing = closing  # closing rank column of the table, by row
+        self.open_row = open_row
+        self.reserved_row = reserved_row
+        # Reciprocal closing ranks, so a rank's ratio to each seat is one multiply;
+        # infinite where the branch has no such seat
+        with np.errstate(divide="ignore"):
+            self.open_scale = 1.0 / open_closing
+            self.reserved_scale = 1.0 / reserved_closing
+        self.has_reserved = bool(np.any(reserved_closing))
+
+    def predict(self, rank: int, category_rank: Optional[int] = None, limit: int = 50) -> Dict[str, np.ndarray]:
+        """Rows of the seats a rank can expect, per chance, by closing rank and at most `limit` each."""
+        ratio = rank * self.open_scale
+        row = self.open_row
+        if self.has_reserved:
+            reserved_ratio = (category_rank or rank) * self.reserved_scale
+            use_reserved = reserved_ratio < ratio
+            ratio = np.where(use_reserved, reserved_ratio, ratio)
+            row = np.where(use_reserved, self.reserved_row, row)
+
+        chances = {
+            SAFE: ratio <= SAFE_RATIO,
+            TARGET: (ratio > SAFE_RATIO) & (ratio <= TARGET_RATIO),
+            REACH: (ratio > TARGET_RATIO) & (ratio <= REACH_RATIO),
+        }
+        result = {}
+        for chance, selected in chances.items():
+            picked = row[selected]
+            closing = self.closing[picked]
+            if picked.size > limit:
+                keep = np.argpartition(closing, limit - 1)[:limit]
+                picked, closing = picked[keep], closing[keep]
+            result[chance] = picked[np.argsort(closing, kind="stable")]
+        return result
+
+
+class CutoffIndex:
+    """Holds the current cutoff table; refreshes swap in a fully built table in one assignment."""
+
+    def __init__(self):
+        self._table: Optional[CutoffTable] = None
+        self.generation = 0
+        self.docs: Dict[str, dict] = {}  # branch_id -> doc the current table was built from
+
+    @property
+    def table(self) -> Optional[CutoffTable]:
+        return self._table
+
+    def replace(self, table: CutoffTable, docs: List[dict]) -> None:
+        self._table = table
+        self.docs = {doc["row"]["branch_id"]: doc for doc in docs}
+        self.generation += 1
+
+    def apply(self, upserts: List[dict], removed: List[str]) -> Tuple[CutoffTable, List[dict]]:
+        """Build a table with some branches replaced, added or dropped, without reloading the rest."""
+        docs = dict(self.docs)
+        for branch_id in removed:
+            docs.pop(branch_id, None)
+        for doc in upserts:
+            docs[doc["row"]["branch_id"]] = doc
+        merged = list(docs.values())
+        return CutoffTable(merged), merged
@@ -0,0 +1,143 @@
+import asyncio
+from bson import ObjectId
+from datetime import date
+from typing import List, Optional
+import numpy as np
+from app.models.exam import ExamDistribution
+from app.schemas.exam import (
+    ExamDistributionCreate,
+    ExamDistributionSummary,
+    ConversionRequest,
+    ConversionResponse,
+    ConvertedValues,
+)
+from app.services.change_feed import change_feed, ChangeEvent, EXAM, UPSERT, DELETE
+from app.services.cutoff_table import exam_key
+from app.services.score_distribution import ScoreDistribution, DistributionIndex
+
+distribution_index = DistributionIndex()
+
+# Serializes full loads and change deltas
+distribution_lock = asyncio.Lock()
+
+
+class ExamDistributionsUnavailableError(Exception):
+    pass
+
+
+class ExamService:
+    @staticmethod
+    def to_distribution(doc: ExamDistribution) -> ScoreDistribution:
+        return ScoreDistribution(doc.exam, doc.year, doc.total_candidates, doc.scores, doc.ranks)
+
+    @staticmethod
+    async def refresh() -> int:
+        """Load every distribution into the index; returns how many were loaded."""
+        async with distribution_lock:
+            docs = await ExamDistribution.find_all().to_list()
+            fresh = DistributionIndex()
+            for doc in docs:
+                fresh.put(str(doc.id), ExamService.to_distribution(doc))
+            distribution_index.distributions, distribution_index.keys = fresh.distributions, fresh.keys
+            distribution_index.loaded = True
+            return len(docs)
+
+    @staticmethod
+    async def apply_changes(ids: List[str]) -> None:
+        """Re-read written distributions; ids no longer found are dropped."""
+        docs = await ExamDistribution.find({"_id": {"$in": [ObjectId(i) for i in ids if ObjectId.is_valid(i)]}}).to_list()
+        async with distribution_lock:
+            found = set()
+            for doc in docs:
+                found.add(str(doc.id))
+                distribution_index.put(str(doc.id), ExamService.to_distribution(doc))
+            for doc_id in set(ids) - found:
+                distribution_index.remove(doc_id)
+
+    @staticmethod
+    async def on_change(event: ChangeEvent) -> None:
+        """Change-feed consumer for exam distributions."""
+        await ExamService.apply_changes(event.ids)
+
+    @staticmethod
+    def to_summary(doc: ExamDistribution) -> ExamDistributionSummary:
+        return ExamDistributionSummary(
+            id=str(doc.id),
+            exam=doc.exam,
+            year=doc.year,
+            total_candidates=doc.total_candidates,
+            points=len(doc.scores),
+            min_score=doc.scores[0],
+            max_score=doc.scores[-1],
+            updated_at=doc.updated_at
+        )
+
+    @staticmethod
+    async def list_distributions(exam: Optional[str] = None) -> List[ExamDistributionSummary]:
+        query = {"exam_key": exam_key(exam)} if exam else {}
+        docs = await ExamDistribution.find(query).sort([("exam_key", 1), ("year", -1)]).to_list()
+        return [ExamService.to_summary(doc) for doc in docs]
+
+    @staticmethod
+    async def upsert(exam: str, year: int, data: ExamDistributionCreate) -> ExamDistributionSummary:
+        """Store the distribution of an exam and year, replacing any earlier one."""
+        values = {
+            "exam": " ".join(exam.split()),
+            "exam_key": exam_key(exam),
+            "year": year,
+            **data.model_dump(),
+            "updated_at": date.today(),
+        }
+        doc = await ExamDistribution.find_one({"exam_key": values["exam_key"], "year": year})
+        if doc:
+            await doc.set(values)
+        else:
+            doc = ExamDistribution(**values)
+            await doc.create()
+        await change_feed.publish(EXAM, UPSERT, [doc.id])
+        return ExamService.to_summary(doc)
+
+    @staticmethod
+    async def delete(exam: str, year: int) -> bool:
+        doc = await ExamDistribution.find_one({"exam_key": exam_key(exam), "year": year})
+        if not doc:
+            return False
+        await doc.delete()
+        await change_feed.publish(EXAM, DELETE, [doc.id])
+        return True
+
+    @staticmethod
+    def convert(exam: str, request: ConversionRequest) -> Optional[ConversionResponse]:
+        """
+        Convert every given score, rank and percentile to the other two, against
+        the exam's distribution for the year; None when there is none.
+        """
+        if not distribution_index.loaded:
+            raise ExamDistributionsUnavailableError("Score distributions are not loaded yet")
+        distribution = distribution_index.get(exam, request.year)
+        if distribution is None:
+            return None
+
+        def converted(scores: np.ndarray, ranks: np.ndarray, percentiles: np.ndarray) -> ConvertedValues:
+            return ConvertedValues(
+                scores=np.round(scores, 2).tolist(),
+                ranks=ranks.tolist(),
+                percentiles=np.round(percentiles, 7).tolist()
+            )
+
+        response = ConversionResponse(exam=distribution.exam, year=distribution.year, total_candidates=distribution.total)
+        if request.scores:
+            scores = np.asarray(request.scores, dtype=np.float64)
+            ranks = distribution.score_to_rank(scores)
+            response.from_scores = converted(scores, ranks, distribution.rank_to_percentile(ranks))
+        if request.ranks:
+            ranks = np.clip(np.asarray(request.ranks, dtype=np.int64), 1, distribution.total)
+            response.from_ranks = converted(distribution.rank_to_score(ranks), ranks, distribution.rank_to_percentile(ranks))
+        if request.percentiles:
+            percentiles = np.asarray(request.percentiles, dtype=np.float64)
+            ranks = distribution.percentile_to_rank(percentiles)
+            response.from_percentiles = converted(distribution.rank_to_score(ranks), ranks, percentiles)
+        return response
+
+
+change_feed.subscribe(EXAM, ExamService.on_change)
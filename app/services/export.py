@@ -0,0 +1,222 @@
+import csv
+import io
+import json
+import zlib
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, AsyncIterator, Dict, List, NamedTuple, Optional, Tuple
+from bson import DBRef, ObjectId
+from bson.decimal128 import Decimal128
+from app.db.mongo import mongodb
+from app.models.college import College
+from app.models.junction import CollegeJunction
+from app.models.scholarship import Scholarship
+
+# Documents fetched per cursor round trip
+EXPORT_BATCH_SIZE = 500
+
+# Serialized bytes buffered before a chunk is handed to the response
+EXPORT_CHUNK_BYTES = 64 * 1024
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+# Public catalogue fields of a college; SEO metadata, verification and status flags
+# stay out of partner dumps
+COLLEGE_EXPORT_PROJECTION = {
+    field: 1
+    for field in (
+        "name", "short_name", "alias", "description", "established_year",
+        "type", "category", "sub_category", "address", "contact",
+        "ratings", "rankings", "featured", "tags", "academics", "fees", "placement",
+        "infrastructure", "images", "social_media", "alumni_network", "clubs", "events",
+        "scholarships", "nearby_places", "news", "startups", "funding",
+        "accreditations", "affiliation", "admission_process", "entrance_exams",
+        "slug", "created_at", "updated_at",
+    )
+}
+
+
+class ExportDataset(NamedTuple):
+    collection: str
+    match: dict
+    projection: Optional[dict]  # for NDJSON; None exports whole documents
+    columns: List[Tuple[str, str]]  # CSV (header, dotted path)
+
+
+EXPORT_DATASETS: Dict[str, ExportDataset] = {
+    "colleges": ExportDataset(
+        collection=College.Settings.name,
+        match={"is_active": True, "is_deleted": {"$ne": True}},
+        projection=COLLEGE_EXPORT_PROJECTION,
+        columns=[
+            ("id", "_id"),
+            ("name", "name"),
+            ("short_name", "short_name"),
+            ("slug", "slug"),
+            ("type", "type"),
+            ("category", "category"),
+            ("sub_category", "sub_category"),
+            ("established_year", "established_year"),
+            ("city", "address.city"),
+            ("state", "address.state"),
+            ("pincode", "address.pincode"),
+            ("lat", "address.coordinates.lat"),
+            ("lng", "address.coordinates.lng"),
+            ("website", "contact.website"),
+            ("rating", "ratings.overall"),
+            ("total_reviews", "ratings.total_reviews"),
+            ("fees_total", "fees.total"),
+            ("average_package", "placement.average_package"),
+            ("highest_package", "placement.highest_package"),
+            ("placement_rate", "placement.placement_rate"),
+            ("entrance_exams", "entrance_exams"),
+            ("featured", "featured"),
+            ("updated_at", "updated_at"),
+        ],
+    ),
+    "branches": ExportDataset(
+        collection=CollegeJunction.Settings.name,
+        match={},
+        projection={"revision_id": 0},
+        columns=[
+            ("id", "_id"),
+            ("college_id", "college"),
+            ("academic_stream_id", "academic_stream"),
+            ("academic_level", "academic_level"),
+            ("degree_type", "degree_type"),
+            ("teaching_mode", "teaching_mode"),
+            ("fees", "fees"),
+            ("faculty_ids", "faculties"),
+            ("hostel_available", "hostel_facility.available"),
+        ],
+    ),
+    "scholarships": ExportDataset(
+        collection=Scholarship.Settings.name,
+        match={},
+        projection={"revision_id": 0},
+        columns=[
+            ("id", "_id"),
+            ("title", "title"),
+            ("college_id", "college"),
+            ("scholarship_type", "scholarship_type"),
+            ("amount", "amount"),
+            ("amount_range", "amount_range"),
+            ("benefit", "benefit"),
+            ("eligible_genders", "eligible_genders"),
+            ("eligible_categories", "eligible_categories"),
+            ("eligible_stream_ids", "eligible_streams"),
+            ("min_percentage", "min_percentage"),
+            ("min_cgpa", "min_cgpa"),
+            ("max_family_income", "max_family_income"),
+            ("deadline", "deadline"),
+            ("active", "active"),
+            ("url", "url"),
+        ],
+    ),
+}
+
+
+def encode_value(value: Any) -> Any:
+    """JSON form of BSON values: ids and links as id strings, dates as ISO 8601."""
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, DBRef):
+        return str(value.id)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal128):
+        return float(value.to_decimal())
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def get_path(doc: dict, path: str) -> Any:
+    value: Any = doc
+    for segment in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(segment)
+    return value
+
+
+def csv_cell(value: Any) -> Any:
+    """Flatten a value into one CSV cell; lists are joined with '|'."""
+    if value is None:
+        return ""
+    if isinstance(value, list):
+        return "|".join(str(csv_cell(item)) for item in value)
+    if isinstance(value, dict):
+        return json.dumps(value, default=encode_value, separators=(",", ":"))
+    if isinstance(value, (ObjectId, DBRef, datetime, date, Decimal128, Decimal)):
+        return encode_value(value)
+    return value
+
+
+class ExportService:
+    @staticmethod
+    async def iter_documents(dataset: ExportDataset) -> AsyncIterator[dict]:
+        """
+        Documents of a dataset in _id order. The Motor cursor fetches one batch per
+        round trip, and the next batch is only requested once this one is consumed.
+        """
+        cursor = mongodb.db[dataset.collection].find(
+            dataset.match,
+            dataset.projection,
+            batch_size=EXPORT_BATCH_SIZE
+        ).sort("_id", 1)
+        try:
+            async for doc in cursor:
+                yield doc
+        finally:
+            await cursor.close()
+
+    @staticmethod
+    async def iter_ndjson(dataset: ExportDataset) -> AsyncIterator[str]:
+        async for doc in ExportService.iter_documents(dataset):
+            yield json.dumps(doc, default=encode_value, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+    @staticmethod
+    async def iter_csv(dataset: ExportDataset) -> AsyncIterator[str]:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow([header for header, _ in dataset.columns])
+        async for doc in ExportService.iter_documents(dataset):
+            writer.writerow([csv_cell(get_path(doc, path)) for _, path in dataset.columns])
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        yield buffer.getvalue()
+
+    @staticmethod
+    async def stream_export(name: str, format: str, compress: bool = False) -> AsyncIterator[bytes]:
+        """
+        Encoded export of a dataset, in chunks of about EXPORT_CHUNK_BYTES. Nothing is
+        read ahead of the response: each chunk is produced when the server is ready to
+        send it, so memory stays flat and a slow client slows the cursor down.
+        """
+        dataset = EXPORT_DATASETS[name]
+        rows = ExportService.iter_csv(dataset) if format == "csv" else ExportService.iter_ndjson(dataset)
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None  # wbits 31: gzip container
+
+        pending: List[bytes] = []
+        size = 0
+        async for row in rows:
+            data = row.encode()
+            if compressor:
+                data = compressor.compress(data)
+            if data:
+                pending.append(data)
+                size += len(data)
+            if size >= EXPORT_CHUNK_BYTES:
+                yield b"".join(pending)
+                pending = []
+                size = 0
+
+        if compressor:
+            pending.append(compressor.flush())
+        if pending:
+            yield b"".join(pending)
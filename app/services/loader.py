@@ -0,0 +1,75 @@
+import asyncio
+from typing import Dict, Generic, List, Optional, Type, TypeVar
+from beanie import Document, PydanticObjectId
+
+DocumentType = TypeVar("DocumentType", bound=Document)
+
+
+class ModelLoader(Generic[DocumentType]):
+    """
+    Batches get-by-id lookups of one Document model. Ids requested during the same
+    event-loop tick are deduplicated and fetched with a single $in query; every id
+    is fetched at most once per loader.
+    """
+
+    def __init__(self, model: Type[DocumentType]):
+        self.model = model
+        self.results: Dict[PydanticObjectId, asyncio.Future] = {}
+        self.queue: List[PydanticObjectId] = []
+        self.queries = 0  # $in queries issued, for tests and logging
+
+    def load(self, document_id: PydanticObjectId) -> "asyncio.Future[Optional[DocumentType]]":
+        """Future for the document with this id; resolves to None if there is none."""
+        future = self.results.get(document_id)
+        if future is not None:
+            return future
+
+        loop = asyncio.get_running_loop()
+        future = self.results[document_id] = loop.create_future()
+        if not self.queue:
+            # First id of this tick: fetch once the rest of the tick has queued theirs
+            loop.call_soon(lambda: asyncio.ensure_future(self.dispatch()))
+        self.queue.append(document_id)
+        return future
+
+    async def load_many(self, document_ids: List[PydanticObjectId]) -> List[Optional[DocumentType]]:
+        """Documents for the ids, in order, with None where there is none; one query."""
+        return list(await asyncio.gather(*(self.load(document_id) for document_id in document_ids)))
+
+    async def dispatch(self) -> None:
+        document_ids, self.queue = self.queue, []
+        self.queries += 1
+        try:
+            documents = await self.model.find({"_id": {"$in": document_ids}}).to_list()
+        except Exception as e:
+            for document_id in document_ids:
+                self.results.pop(document_id).set_exception(e)
+            return
+
+        by_id = {document.id: document for document in documents}
+        for document_id in document_ids:
+            self.results[document_id].set_result(by_id.get(document_id))
+
+
+class Loaders:
+    """Per-request loaders, one per model, created lazily."""
+
+    def __init__(self):
+        self.loaders: Dict[Type[Document], ModelLoader] = {}
+
+    def of(self, model: Type[DocumentType]) -> ModelLoader[DocumentType]:
+        loader = self.loaders.get(model)
+        if loader is None:
+            loader = self.loaders[model] = ModelLoader(model)
+        return loader
+
+    def load(self, model: Type[DocumentType], document_id: PydanticObjectId) -> "asyncio.Future[Optional[DocumentType]]":
+        return self.of(model).load(document_id)
+
+    async def load_many(self, model: Type[DocumentType], document_ids: List[PydanticObjectId]) -> List[Optional[DocumentType]]:
+        return await self.of(model).load_many(document_ids)
+
+
+def get_loaders() -> Loaders:
+    """FastAPI dependency: fresh loaders for each request, so nothing is cached across requests."""
+    return Loaders()
@@ -0,0 +1,148 @@
+import asyncio
+from bson import ObjectId
+from typing import List, Optional
+import numpy as np
+from app.models.college import College
+from app.models.academics import AcademicStream
+from app.models.junction import CollegeJunction
+from app.models.scholarship import Category, Gender
+from app.schemas.net_cost import NetCostResponse, BranchNetCost, NetCostScholarship
+from app.services.scholarship_index import get_table
+
+# Hostel fees are per semester; costs are yearly
+SEMESTERS_PER_YEAR = 2
+
+# Branches of listed colleges, with the fields a cost is made of
+NET_COST_SOURCE_PIPELINE = [
+    {"$lookup": {
+        "from": College.Settings.name,
+        "localField": "college.$id",
+        "foreignField": "_id",
+        "pipeline": [{"$project": {
+            "name": 1,
+            "slug": 1,
+            "listed": {"$and": [{"$ne": ["$is_deleted", True]}, {"$eq": ["$is_active", True]}]},
+        }}],
+        "as": "college",
+    }},
+    {"$lookup": {
+        "from": AcademicStream.Settings.name,
+        "localField": "academic_stream.$id",
+        "foreignField": "_id",
+        "pipeline": [{"$project": {"title": 1}}],
+        "as": "academic_stream",
+    }},
+    {"$project": {
+        "college": {"$first": "$college"},
+        "academic_stream": {"$first": "$academic_stream"},
+        "academic_level": 1,
+        "degree_type": 1,
+        "fees": 1,
+        "hostel_available": "$hostel_facility.available",
+        "hostel_fee": "$hostel_facility.fee_per_semester",
+    }},
+    {"$match": {"college.listed": True, "academic_stream": {"$ne": None}}},
+]
+
+
+class NetCostService:
+    @staticmethod
+    async def load_branches(college_ids: List[str], stream_ids: List[str]) -> List[dict]:
+        match = {}
+        if college_ids:
+            match["college.$id"] = {"$in": [ObjectId(i) for i in college_ids]}
+        if stream_ids:
+            match["academic_stream.$id"] = {"$in": [ObjectId(i) for i in stream_ids]}
+        return await CollegeJunction.aggregate([{"$match": match}] + NET_COST_SOURCE_PIPELINE).to_list()
+
+    @staticmethod
+    def compute(
+        branches: List[dict],
+        gender: Gender,
+        category: Category,
+        percentage: Optional[float],
+        cgpa: Optional[float],
+        family_income: Optional[float],
+        hostel: bool,
+        max_net_cost: Optional[float],
+        limit: int
+    ) -> NetCostResponse:
+        """
+        Net yearly cost of every branch for one student. The student's eligibility is
+        checked against every scholarship once, and each branch's best award is then
+        looked up in the scholarship table's (college, stream) groups together.
+        """
+        table = get_table()
+        college_ids = [str(doc["college"]["_id"]) for doc in branches]
+        stream_ids = [str(doc["academic_stream"]["_id"]) for doc in branches]
+
+        tuition = np.array([doc["fees"] for doc in branches], dtype=np.float64)
+        hostel_available = np.array([bool(doc.get("hostel_available")) for doc in branches], dtype=bool)
+        hostel_fee = np.array([doc.get("hostel_fee") or 0 for doc in branches], dtype=np.float64)
+        hostel_cost = np.where(hostel & hostel_available, hostel_fee * SEMESTERS_PER_YEAR, 0.0)
+
+        eligible = table.eligible(gender, category, percentage=percentage, cgpa=cgpa, family_income=family_income)
+        best = table.best_awards(eligible, college_ids, stream_ids)
+        award = np.where(best >= 0, table.amount[best], 0.0)
+        net_cost = np.maximum(tuition + hostel_cost - award, 0.0)
+
+        selected = np.flatnonzero(net_cost <= max_net_cost) if max_net_cost is not None else np.arange(len(branches))
+        selected = selected[np.argsort(net_cost[selected], kind="stable")]
+
+        results = []
+        for i in selected[:limit].tolist():
+            doc = branches[i]
+            scholarship = None
+            if best[i] >= 0:
+                awarded = table.docs[best[i]]
+                scholarship = NetCostScholarship(
+                    scholarship_id=awarded["scholarship_id"],
+                    title=awarded["title"],
+                    amount=awarded["amount"],
+                    amount_range=awarded["amount_range"]
+                )
+            results.append(BranchNetCost(
+                branch_id=str(doc["_id"]),
+                college_id=college_ids[i],
+                college_name=doc["college"]["name"],
+                college_slug=doc["college"].get("slug"),
+                stream_id=stream_ids[i],
+                stream_title=doc["academic_stream"].get("title"),
+                academic_level=doc["academic_level"],
+                degree_type=doc["degree_type"],
+                tuition=float(tuition[i]),
+                hostel=float(hostel_cost[i]),
+                hostel_available=bool(hostel_available[i]),
+                scholarship=scholarship,
+                net_cost=float(net_cost[i])
+            ))
+        return NetCostResponse(total=int(selected.size), branches=results)
+
+    @staticmethod
+    async def net_costs(
+        college_ids: List[str],
+        stream_ids: List[str],
+        gender: Gender = Gender.ANY,
+        category: Category = Category.GENERAL,
+        percentage: Optional[float] = None,
+        cgpa: Optional[float] = None,
+        family_income: Optional[float] = None,
+        hostel: bool = True,
+        max_net_cost: Optional[float] = None,
+        limit: int = 50
+    ) -> NetCostResponse:
+        """Net yearly cost of the branches of the given colleges and/or streams, cheapest first."""
+        get_table()  # fail before querying when scholarships aren't loaded
+        branches = await NetCostService.load_branches(college_ids, stream_ids)
+        return await asyncio.to_thread(
+            NetCostService.compute,
+            branches,
+            gender,
+            category,
+            percentage,
+            cgpa,
+            family_income,
+            hostel,
+            max_net_cost,
+            limit
+        )
@@ -0,0 +1,185 @@
+import base64
+import json
+from typing import Any, List, NamedTuple, Optional, Tuple, Type, TypeVar
+from beanie import Document
+from beanie.odm.utils.parsing import parse_obj
+from bson import ObjectId
+
+DocumentType = TypeVar("DocumentType", bound=Document)
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+class Page(NamedTuple):
+    items: list
+    total: Optional[int]  # not counted in cursor mode
+    next_cursor: Optional[str]
+
+
+def encode_cursor(sort_by: Optional[str], value: Any, last_id: Any) -> str:
+    """Encode the last sort key and _id of a page into an opaque cursor."""
+    payload = json.dumps({"s": sort_by, "v": value, "id": str(last_id)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_by: Optional[str]) -> Tuple[Any, ObjectId]:
+    """Decode a cursor produced by `encode_cursor`, checking it belongs to the same sort."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        last_id = ObjectId(payload["id"])
+        cursor_sort = payload.get("s")
+        value = payload.get("v")
+    except Exception as e:
+        raise InvalidCursorError("Invalid cursor") from e
+
+    if cursor_sort != sort_by:
+        raise InvalidCursorError("Cursor does not match the requested sort order")
+    if value is not None and not isinstance(value, (int, float, str)):
+        raise InvalidCursorError("Invalid cursor")
+    return value, last_id
+
+
+def keyset_match(
+    field: Optional[str],
+    direction: int,
+    value: Any,
+    last_id: ObjectId,
+    id_field: str = "_id"
+) -> dict:
+    """
+    Filter selecting the rows strictly after (value, last_id) in (field, id_field) order.
+    Nulls sort lowest in MongoDB, so they come first ascending and last descending.
+    """
+    op = "$gt" if direction == 1 else "$lt"
+    if field is None:
+        return {id_field: {op: last_id}}
+
+    tie = {field: value, id_field: {op: last_id}}
+    if value is None:
+        if direction == 1:
+            return {"$or": [tie, {field: {"$ne": None}}]}
+        return tie
+
+    branches = [{field: {op: value}}, tie]
+    if direction == -1:
+        branches.append({field: None})
+    return {"$or": branches}
+
+
+def facet_page_stage(
+    skip: int,
+    limit: int,
+    item_stages: Optional[List[dict]] = None
+) -> dict:
+    """Build a $facet stage that returns one page of items and the total match count together."""
+    return {
+        "$facet": {
+            "items": [{"$skip": skip}, {"$limit": limit}] + (item_stages or []),
+            "total": [{"$count": "count"}],
+        }
+    }
+
+
+def unpack_facet_page(result: List[dict]) -> Tuple[List[dict], int]:
+    """Split the single document produced by `facet_page_stage` into (items, total)."""
+    if not result:
+        return [], 0
+
+    facet = result[0]
+    total = facet["total"][0]["count"] if facet.get("total") else 0
+    return facet.get("items", []), total
+
+
+async def find_page(
+    model: Type[DocumentType],
+    query_filter: dict,
+    skip: int,
+    limit: int
+) -> Tuple[List[DocumentType], int]:
+    """
+    Fetch one page of `model` documents and the total count in a single round trip,
+    instead of a separate `.count()` followed by `.find().skip().limit()`.
+    """
+    pipeline = [{"$sort": {"_id": 1}}, facet_page_stage(skip, limit)]
+    result = await model.find(query_filter).aggregate(pipeline).to_list()
+    items, total = unpack_facet_page(result)
+    return [parse_obj(model, item) for item in items], total
+
+
+async def find_page_after(
+    model: Type[DocumentType],
+    query_filter: dict,
+    cursor: Optional[str],
+    limit: int
+) -> Tuple[List[DocumentType], Optional[str]]:
+    """
+    Fetch the page following `cursor` in _id order with a range seek on the _id index.
+    One extra row is read to tell whether another page exists.
+    """
+    if cursor:
+        _, last_id = decode_cursor(cursor, None)
+        query_filter = {"$and": [query_filter, keyset_match(None, 1, None, last_id)]}
+
+    docs = await model.find(query_filter).sort([("_id", 1)]).limit(limit + 1).to_list()
+    next_cursor = encode_cursor(None, None, docs[limit - 1].id) if len(docs) > limit else None
+    return docs[:limit], next_cursor
+
+
+async def paginate(
+    model: Type[DocumentType],
+    query_filter: dict,
+    page: int,
+    size: int,
+    cursor: Optional[str] = None
+) -> Page:
+    """
+    Paginate `model` documents by page number, or by keyset when a cursor is given.
+    Both modes walk the same _id order, so a `next_cursor` from an offset page can
+    be followed in cursor mode.
+    """
+    if cursor:
+        items, next_cursor = await find_page_after(model, query_filter, cursor, size)
+        return Page(items=items, total=None, next_cursor=next_cursor)
+
+    skip = (page - 1) * size
+    items, total = await find_page(model, query_filter, skip, size)
+    next_cursor = None
+    if items and skip + len(items) < total:
+        next_cursor = encode_cursor(None, None, items[-1].id)
+    return Page(items=items, total=total, next_cursor=next_cursor)
+
+
+async def aggregate_page(
+    model: Type[DocumentType],
+    query_filter: dict,
+    page: int,
+    size: int,
+    cursor: Optional[str] = None,
+    item_stages: Optional[List[dict]] = None
+) -> Page:
+    """
+    `paginate` as one aggregation returning raw documents, with `item_stages`
+    (e.g. $lookup joins) run on the page's rows only, after skip/limit.
+    """
+    if cursor:
+        _, last_id = decode_cursor(cursor, None)
+        query_filter = {"$and": [query_filter, keyset_match(None, 1, None, last_id)]}
+        pipeline = [
+            {"$match": query_filter},
+            {"$sort": {"_id": 1}},
+            {"$limit": size + 1},
+        ] + (item_stages or [])
+        docs = await model.aggregate(pipeline).to_list()
+        next_cursor = encode_cursor(None, None, docs[size - 1]["_id"]) if len(docs) > size else None
+        return Page(items=docs[:size], total=None, next_cursor=next_cursor)
+
+    skip = (page - 1) * size
+    pipeline = [{"$match": query_filter}, {"$sort": {"_id": 1}}, facet_page_stage(skip, size, item_stages)]
+    items, total = unpack_facet_page(await model.aggregate(pipeline).to_list())
+    next_cursor = None
+    if items and skip + len(items) < total:
+        next_cursor = encode_cursor(None, None, items[-1]["_id"])
+    return Page(items=items, total=total, next_cursor=next_cursor)
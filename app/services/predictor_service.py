@@ -0,0 +1,217 @@
+import asyncio
+from bson import ObjectId
+from typing import Optional, List, Set
+from app.core.config import settings
+from app.models.college import College
+from app.models.academics import AcademicStream
+from app.models.junction import CollegeJunction
+from app.models.scholarship import Category, Gender
+from app.schemas.predictor import PredictionResponse, PredictedBranch
+from app.services.change_feed import change_feed, ChangeEvent, BRANCH, COLLEGE
+from app.services.cutoff_table import CutoffIndex, CutoffTable, CHANCES, exam_key
+
+# Branches with cutoffs, with the college and stream fields a prediction shows.
+# Colleges are read from their own collection, so a rename or move reaches here
+# with the college's change event
+CUTOFF_SOURCE_PIPELINE = [
+    {"$match": {"cutoffs.0": {"$exists": True}}},
+    {"$lookup": {
+        "from": College.Settings.name,
+        "localField": "college.$id",
+        "foreignField": "_id",
+        "pipeline": [{"$project": {
+            "name": 1,
+            "short_name": 1,
+            "slug": 1,
+            "location": "$address.city",
+            "state": "$address.state",
+            "logo": "$images.logo",
+            "listed": {"$and": [{"$ne": ["$is_deleted", True]}, {"$eq": ["$is_active", True]}]},
+        }}],
+        "as": "college",
+    }},
+    {"$lookup": {
+        "from": AcademicStream.Settings.name,
+        "localField": "academic_stream.$id",
+        "foreignField": "_id",
+        "pipeline": [{"$project": {"title": 1}}],
+        "as": "academic_stream",
+    }},
+    {"$project": {
+        "college": {"$first": "$college"},
+        "academic_stream": {"$first": "$academic_stream"},
+        "academic_level": 1,
+        "degree_type": 1,
+        "teaching_mode": 1,
+        "fees": 1,
+        "cutoffs": 1,
+    }},
+]
+
+cutoff_index = CutoffIndex()
+
+# Branches and colleges written since the last delta was applied
+pending_branch_ids: Set[str] = set()
+pending_college_ids: Set[str] = set()
+pending_flush: Optional[asyncio.Task] = None
+
+# Serializes table swaps between full loads and change deltas
+cutoff_lock = asyncio.Lock()
+
+
+class PredictorUnavailableError(Exception):
+    pass
+
+
+class PredictorService:
+    @staticmethod
+    def to_table_doc(doc: dict) -> Optional[dict]:
+        """Shape a branch from CUTOFF_SOURCE_PIPELINE for CutoffTable; None if its college isn't listed."""
+        college = doc.get("college")
+        stream = doc.get("academic_stream")
+        if not college or not college.get("listed") or not stream:
+            return None
+        row = {
+            "branch_id": str(doc["_id"]),
+            "college_id": str(college["_id"]),
+            "college_name": college["name"],
+            "college_short_name": college.get("short_name"),
+            "college_slug": college.get("slug"),
+            "location": college.get("location"),
+            "state": college.get("state"),
+            "logo": college.get("logo"),
+            "stream_id": str(stream["_id"]),
+            "stream_title": stream.get("title"),
+            "academic_level": doc["academic_level"],
+            "degree_type": doc["degree_type"],
+            "teaching_mode": doc["teaching_mode"],
+            "fees": doc["fees"],
+        }
+        return {
+            "row": row,
+            "state": row["state"],
+            "stream_id": row["stream_id"],
+            "fees": row["fees"],
+            "cutoffs": doc["cutoffs"],
+        }
+
+    @staticmethod
+    async def load_branches(match: Optional[dict] = None) -> List[dict]:
+        pipeline = ([{"$match": match}] if match else []) + CUTOFF_SOURCE_PIPELINE
+        docs = await CollegeJunction.aggregate(pipeline).to_list()
+        return [table_doc for table_doc in map(PredictorService.to_table_doc, docs) if table_doc]
+
+    @staticmethod
+    async def refresh() -> CutoffTable:
+        """Load every branch cutoff and atomically swap in a freshly built table."""
+        async with cutoff_lock:
+            docs = await PredictorService.load_branches()
+            table = await asyncio.to_thread(CutoffTable, docs)
+            cutoff_index.replace(table, docs)
+            return table
+
+    @staticmethod
+    async def apply_changes(branch_ids: List[str], college_ids: List[str]) -> None:
+        """
+        Fold written branches, and the branches of written colleges, into the table
+        by re-reading only those. Branches no longer found (deleted, cutoffs removed,
+        college unlisted) are dropped.
+        """
+        def object_ids(ids: List[str]) -> List[ObjectId]:
+            return [ObjectId(i) for i in ids if ObjectId.is_valid(i)]
+
+        upserts = await PredictorService.load_branches({"$or": [
+            {"_id": {"$in": object_ids(branch_ids)}},
+            {"college.$id": {"$in": object_ids(college_ids)}},
+        ]})
+        found = {doc["row"]["branch_id"] for doc in upserts}
+
+        async with cutoff_lock:
+            if cutoff_index.table is None:
+                return
+            changed_colleges = set(college_ids)
+            stale = set(branch_ids) | {
+                branch_id for branch_id, doc in cutoff_index.docs.items()
+                if doc["row"]["college_id"] in changed_colleges
+            }
+            table, docs = await asyncio.to_thread(cutoff_index.apply, upserts, list(stale - found))
+            cutoff_index.replace(table, docs)
+
+    @staticmethod
+    async def flush_changes() -> None:
+        """Apply the pending changes once writes pause for the debounce interval."""
+        global pending_flush
+        try:
+            while pending_branch_ids or pending_college_ids:
+                await asyncio.sleep(settings.CHANGE_FEED_DEBOUNCE_SECONDS)
+                branch_ids, college_ids = list(pending_branch_ids), list(pending_college_ids)
+                pending_branch_ids.clear()
+                pending_college_ids.clear()
+                try:
+                    await PredictorService.apply_changes(branch_ids, college_ids)
+                except Exception as e:
+                    print(f"❌ Cutoff changes not applied: {e}")
+        finally:
+            pending_flush = None
+
+    @staticmethod
+    async def on_change(event: ChangeEvent) -> None:
+        """Change-feed consumer for branches and colleges."""
+        global pending_flush
+        pending = pending_branch_ids if event.entity == BRANCH else pending_college_ids
+        pending.update(event.ids)
+        if pending_flush is None:
+            pending_flush = asyncio.create_task(PredictorService.flush_changes())
+
+    @staticmethod
+    def predict(
+        rank: int,
+        exam: str,
+        category: Category = Category.GENERAL,
+        gender: Gender = Gender.ANY,
+        category_rank: Optional[int] = None,
+        home_state: Optional[str] = None,
+        year: Optional[int] = None,
+        round: Optional[int] = None,
+        stream_id: Optional[str] = None,
+        max_fees: Optional[float] = None,
+        limit: int = 50
+    ) -> Optional[PredictionResponse]:
+        """Safe, target and reach branches for a rank; None when the exam has no cutoffs for the year."""
+        table = cutoff_index.table
+        if table is None:
+            raise PredictorUnavailableError("Cutoffs are not loaded yet")
+
+        year = year if year is not None else table.latest_year(exam)
+        if year is None or year not in table.slices.get(exam_key(exam), {}):
+            return None
+
+        result = table.predict(
+            rank,
+            exam,
+            category=category.value,
+            gender=gender.value,
+            category_rank=category_rank,
+            home_state=home_state,
+            year=year,
+            round=round,
+            stream_id=stream_id,
+            max_fees=max_fees,
+            limit=limit
+        )
+
+        def to_item(row: int) -> PredictedBranch:
+            cutoff = table.cutoff(row)
+            return PredictedBranch(**table.branches[table.columns["branch"][row]], **cutoff)
+
+        return PredictionResponse(
+            exam=exam,
+            year=year,
+            rank=rank,
+            category=category,
+            **{chance: [to_item(row) for row in result[chance].tolist()] for chance in CHANCES}
+        )
+
+
+change_feed.subscribe(BRANCH, PredictorService.on_change)
+change_feed.subscribe(COLLEGE, PredictorService.on_change)
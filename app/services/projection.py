@@ -0,0 +1,123 @@
+import types
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, List, Optional, Type, Union, get_args, get_origin
+from pydantic import BaseModel, Field, create_model
+
+# Upper bound on paths per request, to keep projections and cached models small
+MAX_FIELDS = 50
+
+# Document internals that can't be requested
+HIDDEN_FIELDS = {"revision_id"}
+
+
+class InvalidFieldsError(ValueError):
+    pass
+
+
+def parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """Split a `fields=` query value into distinct dotted paths; None when not given."""
+    if fields is None:
+        return None
+    paths = list(dict.fromkeys(path.strip() for path in fields.split(",") if path.strip()))
+    if not paths:
+        raise InvalidFieldsError("fields must name at least one field")
+    if len(paths) > MAX_FIELDS:
+        raise InvalidFieldsError(f"At most {MAX_FIELDS} fields can be requested")
+    return paths
+
+
+def submodel(annotation: Any) -> Optional[Type[BaseModel]]:
+    """The pydantic model inside an annotation such as Optional[List[Model]], if any."""
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation
+    for arg in get_args(annotation):
+        model = submodel(arg)
+        if model is not None:
+            return model
+    return None
+
+
+def replace_submodel(annotation: Any, old: Type[BaseModel], new: Type[BaseModel]) -> Any:
+    """Rebuild `annotation` with `old` swapped for `new`, keeping Optional/List wrappers."""
+    if annotation is old:
+        return new
+    origin = get_origin(annotation)
+    args = tuple(replace_submodel(arg, old, new) for arg in get_args(annotation))
+    if origin in (Union, types.UnionType):
+        return Union[args]
+    if origin is list:
+        return List[args[0]]
+    return annotation
+
+
+def path_tree(model: Type[BaseModel], paths: FrozenSet[str]) -> Dict[str, dict]:
+    """
+    Nest dotted paths into a tree, checking every segment against `model`. An empty
+    subtree means the whole field; a parent requested whole absorbs its children.
+    """
+    tree: Dict[str, dict] = {}
+    for path in sorted(paths, key=lambda p: p.count(".")):
+        node, current = tree, model
+        segments = path.split(".")
+        for depth, segment in enumerate(segments):
+            if current is None or segment not in current.model_fields:
+                raise InvalidFieldsError(f"Unknown field: {path}")
+            if segment in node and not node[segment]:
+                break  # an ancestor is already selected whole
+            is_leaf = depth == len(segments) - 1
+            node = node.setdefault(segment, {})
+            if is_leaf:
+                node.clear()
+            current = submodel(current.model_fields[segment].annotation)
+    return tree
+
+
+def build_model(model: Type[BaseModel], tree: Dict[str, dict], **extra_fields: Any) -> Type[BaseModel]:
+    fields = dict(extra_fields)
+    for name, subtree in tree.items():
+        annotation = model.model_fields[name].annotation
+        if subtree:
+            nested = submodel(annotation)
+            annotation = replace_submodel(annotation, nested, build_model(nested, subtree))
+        fields[name] = (Optional[annotation], None)
+    return create_model(f"{model.__name__}Projection", **fields)
+
+
+def document_tree(model: Type[BaseModel], paths: FrozenSet[str]) -> Dict[str, dict]:
+    """`path_tree` for a Beanie document; its id is always returned and not selectable."""
+    for path in paths:
+        if path.split(".")[0] in HIDDEN_FIELDS:
+            raise InvalidFieldsError(f"Unknown field: {path}")
+    tree = path_tree(model, paths)
+    tree.pop("id", None)
+    return tree
+
+
+@lru_cache(maxsize=256)
+def projection_model(model: Type[BaseModel], paths: FrozenSet[str]) -> Type[BaseModel]:
+    """
+    Lightweight model holding only the requested paths of a document, every field
+    optional, plus its id. Cached per (model, paths), so each field set is built once.
+    """
+    return build_model(
+        model,
+        document_tree(model, paths),
+        id=(Optional[str], Field(None, alias="_id")),
+    )
+
+
+def mongo_projection(model: Type[BaseModel], paths: FrozenSet[str]) -> Dict[str, int]:
+    """MongoDB projection selecting exactly the requested paths (and _id)."""
+    projection = {}
+
+    def walk(tree: Dict[str, dict], prefix: str) -> None:
+        for name, subtree in tree.items():
+            path = f"{prefix}{name}"
+            if subtree:
+                walk(subtree, f"{path}.")
+            else:
+                projection[path] = 1
+
+    walk(document_tree(model, paths), "")
+    projection["_id"] = 1
+    return projection
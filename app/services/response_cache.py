@@ -0,0 +1,216 @@
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from app.db.redis import redis
+
+# Every cache by namespace, for the stats endpoint
+caches: Dict[str, "ResponseCache"] = {}
+
+
+class ResponseCache:
+    """
+    Two-tier cache for JSON-serializable responses.
+
+    The first tier is an in-process LRU bounded to `max_entries`; the second is
+    Redis, shared by all workers. Entries expire after a per-entry TTL in both
+    tiers. Concurrent misses for the same key wait on a single computation
+    instead of each hitting the backend. Redis errors degrade to a miss.
+    """
+
+    def __init__(self, namespace: str, max_entries: int, ttl_seconds: int):
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.local: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()  # key -> (expires_at, value)
+        self.inflight: Dict[str, asyncio.Future] = {}
+        self.stats = {
+            "hits": 0,
+            "redis_hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "redis_errors": 0,
+        }
+        caches[namespace] = self
+
+    def redis_key(self, key: str) -> str:
+        return f"cache:{self.namespace}:{key}"
+
+    def get_local(self, key: str) -> Optional[Any]:
+        entry = self.local.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.time():
+            del self.local[key]
+            return None
+        self.local.move_to_end(key)
+        return entry[1]
+
+    def set_local(self, key: str, value: Any, expires_at: float) -> None:
+        self.local[key] = (expires_at, value)
+        self.local.move_to_end(key)
+        while len(self.local) > self.max_entries:
+            self.local.popitem(last=False)
+
+    async def get_redis(self, key: str) -> Optional[Tuple[float, Any]]:
+        try:
+            cached = await redis.get(self.redis_key(key))
+        except Exception:
+            self.stats["redis_errors"] += 1
+            return None
+        if not cached:
+            return None
+        entry = json.loads(cached)
+        return entry["expires_at"], entry["value"]
+
+    async def set_redis(self, key: str, value: Any, expires_at: float, ttl: int) -> None:
+        try:
+            await redis.set(
+                self.redis_key(key),
+                json.dumps({"expires_at": expires_at, "value": value}, default=str),
+                ex=ttl
+            )
+        except Exception:
+            self.stats["redis_errors"] += 1
+
+    async def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        ttl: Optional[int] = None
+    ) -> Any:
+        """Return the cached value for `key`, computing and storing it on a miss."""
+        value = self.get_local(key)
+        if value is not None:
+            self.stats["hits"] += 1
+            return value
+
+        pending = self.inflight.get(key)
+        if pending is not None:
+            self.stats["coalesced"] += 1
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self.inflight[key] = future
+        try:
+            value = await self.fill(key, compute, ttl or self.ttl_seconds)
+            future.set_result(value)
+            return value
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # waiters re-raise it; don't log it as unretrieved
+            raise
+        finally:
+            del self.inflight[key]
+
+    async def fill(self, key: str, compute: Callable[[], Awaitable[Any]], ttl: int) -> Any:
+        cached = await self.get_redis(key)
+        if cached is not None and cached[0] > time.time():
+            self.stats["redis_hits"] += 1
+            self.set_local(key, cached[1], cached[0])
+            return cached[1]
+
+        self.stats["misses"] += 1
+        value = await compute()
+        expires_at = time.time() + ttl
+        self.set_local(key, value, expires_at)
+        await self.set_redis(key, value, expires_at, ttl)
+        return value
+
+    async def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """
+        Cached values for several keys without computing misses: local hits first,
+        the rest in one Redis MGET. Missing keys are left out.
+        """
+        found = {}
+        remote = []
+        for key in keys:
+            value = self.get_local(key)
+            if value is not None:
+                self.stats["hits"] += 1
+                found[key] = value
+            else:
+                remote.append(key)
+        if not remote:
+            return found
+
+        try:
+            cached = await redis.mget([self.redis_key(key) for key in remote])
+        except Exception:
+            self.stats["redis_errors"] += 1
+            cached = [None] * len(remote)
+
+        now = time.time()
+        for key, raw in zip(remote, cached):
+            entry = json.loads(raw) if raw else None
+            if entry and entry["expires_at"] > now:
+                self.stats["redis_hits"] += 1
+                self.set_local(key, entry["value"], entry["expires_at"])
+                found[key] = entry["value"]
+            else:
+                self.stats["misses"] += 1
+        return found
+
+    async def set_many(self, values: Dict[str, Any], ttl: Optional[int] = None) -> None:
+        """Store several values in both tiers, writing to Redis in one pipeline."""
+        ttl = ttl or self.ttl_seconds
+        expires_at = time.time() + ttl
+        for key, value in values.items():
+            self.set_local(key, value, expires_at)
+        if not values:
+            return
+        try:
+            pipe = redis.pipeline(transaction=False)
+            for key, value in values.items():
+                pipe.set(
+                    self.redis_key(key),
+                    json.dumps({"expires_at": expires_at, "value": value}, default=str),
+                    ex=ttl
+                )
+            await pipe.execute()
+        except Exception:
+            self.stats["redis_errors"] += 1
+
+    def local_keys(self, prefix: str) -> List[str]:
+        """Keys held in process that start with `prefix`."""
+        return [key for key in self.local if key.startswith(prefix)]
+
+    async def delete(self, keys: List[str]) -> None:
+        """Drop specific entries, locally and in Redis."""
+        for key in keys:
+            self.local.pop(key, None)
+        if not keys:
+            return
+        try:
+            await redis.delete(*[self.redis_key(key) for key in keys])
+        except Exception:
+            self.stats["redis_errors"] += 1
+
+    async def invalidate(self) -> None:
+        """Drop every entry of this cache, locally and in Redis."""
+        self.local.clear()
+        try:
+            keys = [key async for key in redis.scan_iter(match=self.redis_key("*"), count=500)]
+            if keys:
+                await redis.delete(*keys)
+        except Exception:
+            self.stats["redis_errors"] += 1
+
+    def get_stats(self) -> dict:
+        lookups = self.stats["hits"] + self.stats["redis_hits"] + self.stats["misses"] + self.stats["coalesced"]
+        served = lookups - self.stats["misses"]
+        return {
+            **self.stats,
+            "size": len(self.local),
+            "max_entries": self.max_entries,
+            "hit_ratio": round(served / lookups, 4) if lookups else None,
+        }
+
+
+def cache_stats() -> Dict[str, dict]:
+    """Stats of every response cache, by namespace."""
+    return {namespace: cache.get_stats() for namespace, cache in caches.items()}
@@ -0,0 +1,316 @@
+import asyncio
+from bson import ObjectId
+from datetime import date
+from typing import Dict, List, Optional, Set
+import numpy as np
+from app.core.config import settings
+from app.models.scholarship import Scholarship, Category, Gender
+from app.services.change_feed import change_feed, ChangeEvent, SCHOLARSHIP
+
+# Active scholarships with the fields eligibility and awards depend on
+SCHOLARSHIP_SOURCE_PIPELINE = [
+    {"$match": {"active": True}},
+    {"$project": {
+        "title": 1,
+        "amount": 1,
+        "amount_range": 1,
+        "eligible_genders": 1,
+        "eligible_categories": 1,
+        "min_percentage": 1,
+        "min_cgpa": 1,
+        "max_family_income": 1,
+        "eligible_streams": 1,
+        "deadline": 1,
+        "college": 1,
+    }},
+]
+
+GENDER_BITS = {gender.value: 1 << i for i, gender in enumerate(Gender)}
+CATEGORY_BITS = {category.value: 1 << i for i, category in enumerate(Category)}
+
+NO_DEADLINE = np.iinfo(np.int32).max
+
+
+def enum_mask(values: Optional[List[str]], bits: Dict[str, int], any_value: str) -> int:
+    """Bits of the values a scholarship accepts; all of them when it accepts ANY."""
+    values = values or [any_value]
+    if any_value in values:
+        return sum(bits.values())
+    return sum(bits[value] for value in values if value in bits)
+
+
+def expected_amount(doc: dict) -> Optional[float]:
+    """The amount a scholarship awards, or the middle of its range; None if it names no amount."""
+    if doc.get("amount") is not None:
+        return float(doc["amount"])
+    amount_range = doc.get("amount_range")
+    if amount_range and len(amount_range) == 2:
+        return (float(amount_range[0]) + float(amount_range[1])) / 2
+    return None
+
+
+def to_index_doc(doc: dict) -> dict:
+    """Shape a scholarship from SCHOLARSHIP_SOURCE_PIPELINE for ScholarshipTable."""
+    deadline = doc.get("deadline")
+    return {
+        "scholarship_id": str(doc["_id"]),
+        "title": doc["title"],
+        "college_id": str(doc["college"].id),
+        "stream_ids": [str(stream.id) for stream in doc.get("eligible_streams") or []],
+        "amount": expected_amount(doc),
+        "amount_range": doc.get("amount_range"),
+        "genders": enum_mask(doc.get("eligible_genders"), GENDER_BITS, Gender.ANY.value),
+        "categories": enum_mask(doc.get("eligible_categories"), CATEGORY_BITS, Category.ANY.value),
+        "min_percentage": doc.get("min_percentage"),
+        "min_cgpa": doc.get("min_cgpa"),
+        "max_family_income": doc.get("max_family_income"),
+        "deadline": deadline.toordinal() if deadline else None,
+    }
+
+
+def sorted_with_positions(values: np.ndarray):
+    """`values` in ascending order, and the position each value took in it."""
+    order = np.argsort(values, kind="stable")
+    positions = np.empty(values.size, dtype=np.int64)
+    positions[order] = np.arange(values.size)
+    return values[order], positions
+
+
+class ScholarshipTable:
+    """
+    Active scholarships as arrays, for matching a student against all of them at
+    once through inverted indexes and sorted thresholds.
+
+    Awards are looked up per (college, stream) group: a scholarship open to every
+    stream of its college sits in the college's group, one limited to some streams
+    in each of those streams' groups. Rows are sorted by group and, within a group,
+    by amount descending, so a student's best award in a group is its first
+    eligible row.
+    """
+
+    def __init__(self, docs: List[dict]):
+        self.docs = docs
+        self.size = len(docs)
+
+        self.college_ids = sorted({doc["college_id"] for doc in docs})
+        self.college_index = {college_id: i for i, college_id in enumerate(self.college_ids)}
+        self.stream_ids = sorted({stream_id for doc in docs for stream_id in doc["stream_ids"]})
+        self.stream_index = {stream_id: i for i, stream_id in enumerate(self.stream_ids)}
+
+        def column(name: str, missing: float) -> np.ndarray:
+            return np.array([missing if doc[name] is None else doc[name] for doc in docs], dtype=np.float64)
+
+        self.amount = column("amount", 0.0)
+        self.genders = np.array([doc["genders"] for doc in docs], dtype=np.int64)
+        self.categories = np.array([doc["categories"] for doc in docs], dtype=np.int64)
+        self.min_percentage = column("min_percentage", -np.inf)
+        self.min_cgpa = column("min_cgpa", -np.inf)
+        self.max_family_income = column("max_family_income", np.inf)
+        self.deadline = np.array([NO_DEADLINE if doc["deadline"] is None else doc["deadline"] for doc in docs], dtype=np.int64)
+
+        # Inverted indexes: the scholarships accepting each gender, category and
+        # stream, as ascending positions
+        self.gender_postings = {value: np.flatnonzero(self.genders & bit) for value, bit in GENDER_BITS.items()}
+        self.category_postings = {value: np.flatnonzero(self.categories & bit) for value, bit in CATEGORY_BITS.items()}
+        self.all_streams = np.array([i for i, doc in enumerate(docs) if not doc["stream_ids"]], dtype=np.int64)
+        stream_postings: List[List[int]] = [[] for _ in self.stream_ids]
+        for i, doc in enumerate(docs):
+            for stream_id in doc["stream_ids"]:
+                stream_postings[self.stream_index[stream_id]].append(i)
+        self.stream_postings = [np.array(sorted(set(postings)), dtype=np.int64) for postings in stream_postings]
+
+        # Thresholds in ascending order, with each scholarship's position in that
+        # order: a student's value cuts each order in two with one binary search
+        self.percentage_sorted, self.percentage_position = sorted_with_positions(self.min_percentage)
+        self.cgpa_sorted, self.cgpa_position = sorted_with_positions(self.min_cgpa)
+        self.income_sorted, self.income_position = sorted_with_positions(self.max_family_income)
+
+        # Group rows: (group key, scholarship), only for scholarships with an amount
+        group_keys, scholarships = [], []
+        for i, doc in enumerate(docs):
+            if doc["amount"] is None:
+                continue
+            college = self.college_index[doc["college_id"]]
+            streams = [self.stream_index[stream_id] for stream_id in doc["stream_ids"]] or [-1]
+            for stream in streams:
+                group_keys.append(self.group_key(college, stream))
+                scholarships.append(i)
+        group_keys = np.array(group_keys, dtype=np.int64)
+        scholarships = np.array(scholarships, dtype=np.int64)
+        order = np.lexsort((-self.amount[scholarships], group_keys))
+        self.row_group_keys = group_keys[order]
+        self.row_scholarships = scholarships[order]
+
+    def group_key(self, college, stream):
+        """Key of a (college, stream) group; stream -1 is the college-wide group."""
+        return np.asarray(college, dtype=np.int64) * (len(self.stream_ids) + 1) + np.asarray(stream, dtype=np.int64) + 1
+
+    def match(
+        self,
+        gender: Gender,
+        category: Category,
+        percentage: Optional[float] = None,
+        cgpa: Optional[float] = None,
+        family_income: Optional[float] = None,
+        stream_id: Optional[str] = None,
+        on: Optional[date] = None
+    ) -> np.ndarray:
+        """
+        Positions of the scholarships a student can claim on a date (today by
+        default), highest amount first. Candidates come from intersecting the
+        gender, category and stream postings, and are then kept when they sit below
+        the student's cut in each threshold order. A threshold the student gave no
+        value for excludes the scholarships that set it; without a stream, streams
+        are not checked.
+        """
+        on = on or date.today()
+        candidates = np.intersect1d(
+            self.gender_postings[gender.value],
+            self.category_postings[category.value],
+            assume_unique=True
+        )
+        if stream_id is not None:
+            stream = self.stream_index.get(stream_id)
+            postings = self.all_streams if stream is None else np.union1d(self.all_streams, self.stream_postings[stream])
+            candidates = np.intersect1d(candidates, postings, assume_unique=True)
+
+        percentage_cut = np.searchsorted(self.percentage_sorted, -np.inf if percentage is None else percentage, side="right")
+        cgpa_cut = np.searchsorted(self.cgpa_sorted, -np.inf if cgpa is None else cgpa, side="right")
+        income_cut = np.searchsorted(self.income_sorted, np.inf if family_income is None else family_income, side="left")
+        candidates = candidates[
+            (self.percentage_position[candidates] < percentage_cut)
+            & (self.cgpa_position[candidates] < cgpa_cut)
+            & (self.income_position[candidates] >= income_cut)
+            & (self.deadline[candidates] >= on.toordinal())
+        ]
+        return candidates[np.argsort(-self.amount[candidates], kind="stable")]
+
+    def eligible(
+        self,
+        gender: Gender,
+        category: Category,
+        percentage: Optional[float] = None,
+        cgpa: Optional[float] = None,
+        family_income: Optional[float] = None,
+        on: Optional[date] = None
+    ) -> np.ndarray:
+        """Per scholarship, whether a student can claim it, in any stream."""
+        mask = np.zeros(self.size, dtype=bool)
+        mask[self.match(gender, category, percentage, cgpa, family_income, on=on)] = True
+        return mask
+
+    def best_awards(self, eligible: np.ndarray, college_ids: List[str], stream_ids: List[str]) -> np.ndarray:
+        """
+        For each (college, stream) pair, the eligible scholarship with the highest
+        amount, college-wide or for that stream; -1 where there is none.
+        """
+        rows = np.flatnonzero(eligible[self.row_scholarships])
+        keys = self.row_group_keys[rows]
+        # Rows are grouped, best first: the first eligible row of each group wins
+        group_keys, first = np.unique(keys, return_index=True)
+        group_best = self.row_scholarships[rows[first]]
+
+        college = np.array([self.college_index.get(college_id, -1) for college_id in college_ids], dtype=np.int64)
+        stream = np.array([self.stream_index.get(stream_id, -1) for stream_id in stream_ids], dtype=np.int64)
+
+        def lookup(keys: np.ndarray) -> np.ndarray:
+            found = np.full(keys.size, -1, dtype=np.int64)
+            if not group_keys.size:
+                return found
+            at = np.minimum(np.searchsorted(group_keys, keys), group_keys.size - 1)
+            hit = (group_keys[at] == keys) & (college >= 0)
+            found[hit] = group_best[at[hit]]
+            return found
+
+        college_wide = lookup(self.group_key(college, -1))
+        by_stream = np.where(stream >= 0, lookup(self.group_key(college, np.maximum(stream, 0))), -1)
+        # The better of the two; -1 (the appended -inf) only when both are missing
+        amount = np.append(self.amount, -np.inf)
+        return np.where(amount[by_stream] > amount[college_wide], by_stream, college_wide)
+
+
+class ScholarshipIndex:
+    """The current ScholarshipTable and the docs it was built from, by scholarship id."""
+
+    def __init__(self):
+        self.table: Optional[ScholarshipTable] = None
+        self.docs: Dict[str, dict] = {}
+
+    def replace(self, docs: Dict[str, dict]) -> ScholarshipTable:
+        self.docs = docs
+        self.table = ScholarshipTable(list(docs.values()))
+        return self.table
+
+
+scholarship_index = ScholarshipIndex()
+
+# Scholarships written since the last delta was applied
+pending_scholarship_ids: Set[str] = set()
+pending_flush: Optional[asyncio.Task] = None
+
+# Serializes table swaps between full loads and change deltas
+scholarship_lock = asyncio.Lock()
+
+
+class ScholarshipIndexUnavailableError(Exception):
+    pass
+
+
+async def load_scholarships(match: Optional[dict] = None) -> List[dict]:
+    pipeline = ([{"$match": match}] if match else []) + SCHOLARSHIP_SOURCE_PIPELINE
+    docs = await Scholarship.aggregate(pipeline).to_list()
+    return [to_index_doc(doc) for doc in docs]
+
+
+async def refresh() -> ScholarshipTable:
+    """Load every active scholarship and atomically swap in a freshly built table."""
+    async with scholarship_lock:
+        docs = await load_scholarships()
+        docs = {doc["scholarship_id"]: doc for doc in docs}
+        return await asyncio.to_thread(scholarship_index.replace, docs)
+
+
+async def apply_changes(ids: List[str]) -> None:
+    """Re-read written scholarships; those no longer found or active are dropped."""
+    upserts = await load_scholarships({"_id": {"$in": [ObjectId(i) for i in ids if ObjectId.is_valid(i)]}})
+    async with scholarship_lock:
+        if scholarship_index.table is None:
+            return
+        written = set(ids)
+        docs = {key: doc for key, doc in scholarship_index.docs.items() if key not in written}
+        docs.update((doc["scholarship_id"], doc) for doc in upserts)
+        await asyncio.to_thread(scholarship_index.replace, docs)
+
+
+async def flush_changes() -> None:
+    """Apply the pending changes once writes pause for the debounce interval."""
+    global pending_flush
+    try:
+        while pending_scholarship_ids:
+            await asyncio.sleep(settings.CHANGE_FEED_DEBOUNCE_SECONDS)
+            ids = list(pending_scholarship_ids)
+            pending_scholarship_ids.clear()
+            try:
+                await apply_changes(ids)
+            except Exception as e:
+                print(f"❌ Scholarship changes not applied: {e}")
+    finally:
+        pending_flush = None
+
+
+async def on_change(event: ChangeEvent) -> None:
+    """Change-feed consumer for scholarships."""
+    global pending_flush
+    pending_scholarship_ids.update(event.ids)
+    if pending_flush is None:
+        pending_flush = asyncio.create_task(flush_changes())
+
+
+def get_table() -> ScholarshipTable:
+    table = scholarship_index.table
+    if table is None:
+        raise ScholarshipIndexUnavailableError("Scholarships are not loaded yet")
+    return table
+
+
+change_feed.subscribe(SCHOLARSHIP, on_change)
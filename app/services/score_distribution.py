@@ -0,0 +1,81 @@
+from typing import Dict, List, Optional
+import numpy as np
+from app.services.cutoff_table import exam_key
+
+
+class ScoreDistribution:
+    """
+    One exam sitting's score distribution as arrays, converting between scores,
+    ranks and percentiles. Conversions are vectorized: np.interp binary-searches
+    the breakpoints and interpolates linearly between them.
+
+    Percentiles follow the NTA definition, the share of candidates scoring at or
+    below a candidate, so the topper is at 100.
+    """
+
+    def __init__(self, exam: str, year: int, total_candidates: int, scores: List[float], ranks: List[int]):
+        self.exam = exam
+        self.year = year
+        self.total = total_candidates
+
+        order = np.argsort(scores, kind="stable")
+        self.scores = np.asarray(scores, dtype=np.float64)[order]
+        self.ranks = np.asarray(ranks, dtype=np.float64)[order]
+
+        # For rank -> score, ranks ascending with the lowest score reaching each one;
+        # scores without candidates in between share a rank
+        distinct, first = np.unique(self.ranks, return_index=True)
+        self.rank_points = distinct
+        self.rank_scores = self.scores[first]
+
+    @property
+    def points(self) -> int:
+        return int(self.scores.size)
+
+    def clip_ranks(self, ranks: np.ndarray) -> np.ndarray:
+        return np.clip(np.rint(ranks), 1, self.total).astype(np.int64)
+
+    def score_to_rank(self, scores: np.ndarray) -> np.ndarray:
+        """Rank of a candidate scoring each score; beyond the breakpoints, the end ranks."""
+        return self.clip_ranks(np.interp(scores, self.scores, self.ranks))
+
+    def rank_to_score(self, ranks: np.ndarray) -> np.ndarray:
+        """Score needed for each rank."""
+        return np.interp(ranks, self.rank_points, self.rank_scores)
+
+    def rank_to_percentile(self, ranks: np.ndarray) -> np.ndarray:
+        return 100.0 * (self.total - np.asarray(ranks, dtype=np.float64) + 1) / self.total
+
+    def percentile_to_rank(self, percentiles: np.ndarray) -> np.ndarray:
+        return self.clip_ranks(self.total + 1 - np.asarray(percentiles, dtype=np.float64) * self.total / 100.0)
+
+
+class DistributionIndex:
+    """Every loaded distribution, by exam key and year."""
+
+    def __init__(self):
+        self.distributions: Dict[str, Dict[int, ScoreDistribution]] = {}
+        self.keys: Dict[str, tuple] = {}  # document id -> (exam key, year)
+        self.loaded = False
+
+    def get(self, exam: str, year: Optional[int] = None) -> Optional[ScoreDistribution]:
+        """The distribution of an exam for a year, or for its latest year."""
+        years = self.distributions.get(exam_key(exam))
+        if not years:
+            return None
+        return years.get(year if year is not None else max(years))
+
+    def put(self, doc_id: str, distribution: ScoreDistribution) -> None:
+        self.remove(doc_id)
+        key = exam_key(distribution.exam)
+        self.distributions.setdefault(key, {})[distribution.year] = distribution
+        self.keys[doc_id] = (key, distribution.year)
+
+    def remove(self, doc_id: str) -> None:
+        key = self.keys.pop(doc_id, None)
+        if key is None:
+            return
+        years = self.distributions.get(key[0], {})
+        years.pop(key[1], None)
+        if not years:
+            self.distributions.pop(key[0], None)
@@ -0,0 +1,266 @@
+import hashlib
+from typing import Dict, List, NamedTuple, Optional
+import numpy as np
+from app.models.scholarship import Category, Gender
+from app.services.cutoff_table import CATEGORIES, GENDERS, CATEGORY_CODES, GENDER_CODES
+
+GENERAL = CATEGORY_CODES[Category.GENERAL.value]
+ANY_GENDER = GENDER_CODES[Gender.ANY.value]
+
+# Seat types are (category, gender) pairs, coded category * len(GENDERS) + gender
+SEAT_TYPES = len(CATEGORIES) * len(GENDERS)
+
+# Share of each category in a synthetic applicant pool
+SYNTHETIC_CATEGORY_SHARES = {
+    Category.GENERAL.value: 0.40,
+    Category.OBC.value: 0.27,
+    Category.SC.value: 0.15,
+    Category.ST.value: 0.075,
+    Category.EWS.value: 0.105,
+}
+
+# Skew of synthetic choices towards popular branches (Zipf exponent)
+SYNTHETIC_POPULARITY_EXPONENT = 0.8
+
+# Applicants whose choice lists are expanded into programs at a time, to bound memory
+EXPANSION_BLOCK = 200_000
+
+
+def seat_type(category: np.ndarray, gender: np.ndarray) -> np.ndarray:
+    return category.astype(np.int32) * len(GENDERS) + gender
+
+
+class SeatMatrix:
+    """
+    Seats of one exam's counselling as arrays. Every (branch, category, gender)
+    entry with seats is a program with a capacity, and `programs` maps a branch
+    and seat type to its program (-1 where the branch has none).
+    """
+
+    def __init__(self, branch_ids: List[str], college_ids: List[str], entries: List[dict]):
+        self.branch_ids = branch_ids
+        self.college_ids = college_ids
+        self.branch_index = {branch_id: i for i, branch_id in enumerate(branch_ids)}
+
+        # Seats of the same type listed twice for a branch add up
+        seats: Dict[tuple, int] = {}
+        for entry in entries:
+            key = (entry["branch"], CATEGORY_CODES[entry["category"]], GENDER_CODES[entry["gender"]])
+            seats[key] = seats.get(key, 0) + entry["seats"]
+        keys = sorted(key for key, count in seats.items() if count > 0)
+
+        self.size = len(keys)
+        self.branch = np.array([key[0] for key in keys], dtype=np.int32)
+        self.category = np.array([key[1] for key in keys], dtype=np.int8)
+        self.gender = np.array([key[2] for key in keys], dtype=np.int8)
+        self.capacity = np.array([seats[key] for key in keys], dtype=np.int64)
+
+        self.programs = np.full((len(branch_ids), SEAT_TYPES), -1, dtype=np.int32)
+        self.programs[self.branch, seat_type(self.category, self.gender)] = np.arange(self.size, dtype=np.int32)
+
+        digest = hashlib.blake2b(digest_size=12)
+        digest.update("\n".join(branch_ids).encode())
+        for array in (self.branch, self.category, self.gender, self.capacity):
+            digest.update(array.tobytes())
+        self.version = digest.hexdigest()  # equal across workers holding the same seats
+
+
+class ApplicantPool:
+    """
+    Applicants as arrays: CRL rank, category and gender codes, and choice lists in
+    CSR form (the choices of applicant i are branches[offsets[i]:offsets[i + 1]]).
+    """
+
+    def __init__(self, rank: np.ndarray, category: np.ndarray, gender: np.ndarray, offsets: np.ndarray, branches: np.ndarray):
+        self.size = int(rank.size)
+        self.rank = rank.astype(np.int64)
+        self.category = category.astype(np.int8)
+        self.gender = gender.astype(np.int8)
+        self.offsets = offsets.astype(np.int64)
+        self.branches = branches.astype(np.int32)
+
+        # Merit position in the common rank list, ties broken by pool order. Category
+        # ranks follow the same order within a category, so it ranks every program
+        self.merit = np.empty(self.size, dtype=np.int64)
+        self.merit[np.lexsort((np.arange(self.size), self.rank))] = np.arange(self.size)
+
+    @classmethod
+    def from_lists(
+        cls,
+        ranks: List[int],
+        categories: np.ndarray,
+        genders: np.ndarray,
+        choices: List[List[int]]
+    ) -> "ApplicantPool":
+        """A pool from per-applicant values, with choices as branch positions."""
+        lengths = np.array([len(branches) for branches in choices], dtype=np.int64)
+        branches = np.fromiter((branch for branches in choices for branch in branches), dtype=np.int32, count=int(lengths.sum()))
+        return cls(np.array(ranks, dtype=np.int64), categories, genders, np.r_[0, np.cumsum(lengths)], branches)
+
+    def extend(self, other: "ApplicantPool") -> "ApplicantPool":
+        """This pool followed by the applicants of `other`."""
+        return ApplicantPool(
+            np.r_[self.rank, other.rank],
+            np.r_[self.category, other.category],
+            np.r_[self.gender, other.gender],
+            np.r_[self.offsets, other.offsets[1:] + self.offsets[-1]],
+            np.r_[self.branches, other.branches]
+        )
+
+    @classmethod
+    def synthetic(
+        cls,
+        size: int,
+        branches: int,
+        choices: int,
+        female_share: float = 0.2,
+        seed: int = 0
+    ) -> "ApplicantPool":
+        """
+        A random pool with ranks 1..size, categories in SYNTHETIC_CATEGORY_SHARES and
+        `choices` picks per applicant skewed towards popular branches. A branch can
+        be picked twice; the repeat is simply rejected again.
+        """
+        rng = np.random.default_rng(seed)
+        shares = np.array(list(SYNTHETIC_CATEGORY_SHARES.values()))
+        category = np.array([CATEGORY_CODES[value] for value in SYNTHETIC_CATEGORY_SHARES], dtype=np.int8)[
+            rng.choice(len(shares), size=size, p=shares / shares.sum())
+        ]
+        gender = np.where(
+            rng.random(size) < female_share,
+            GENDER_CODES[Gender.FEMALE.value],
+            GENDER_CODES[Gender.MALE.value]
+        ).astype(np.int8)
+
+        popularity = np.arange(1, branches + 1, dtype=np.float64) ** -SYNTHETIC_POPULARITY_EXPONENT
+        cumulative = np.cumsum(popularity[rng.permutation(branches)])
+        picks = np.searchsorted(cumulative, rng.random(size * choices) * cumulative[-1], side="right")
+        picks = np.minimum(picks, branches - 1)
+
+        rank = np.arange(1, size + 1, dtype=np.int64)
+        offsets = np.arange(0, size * choices + 1, choices, dtype=np.int64)
+        return cls(rank, category, gender, offsets, picks)
+
+
+class Allocation(NamedTuple):
+    program: np.ndarray  # per applicant, the program allotted or -1
+    choice: np.ndarray  # per applicant, position of that program's branch in their list, or -1
+    rounds: int
+
+
+def expand_preferences(pool: ApplicantPool, matrix: SeatMatrix) -> Dict[str, np.ndarray]:
+    """
+    Turn each applicant's branch choices into the programs they can hold, in order.
+    Within a branch an applicant is considered for open seats before their category's,
+    and gender-neutral seats before their gender's, as in JoSAA.
+    """
+    program_chunks, choice_chunks, counts = [], [], []
+    for first in range(0, pool.size, EXPANSION_BLOCK):
+        last = min(first + EXPANSION_BLOCK, pool.size)
+        start, end = pool.offsets[first], pool.offsets[last]
+        lengths = np.diff(pool.offsets[first:last + 1])
+        applicant = np.repeat(np.arange(first, last), lengths)
+        branch = pool.branches[start:end]
+        position = np.arange(end - start) - np.repeat(pool.offsets[first:last] - start, lengths)
+
+        category = pool.category[applicant]
+        gender = pool.gender[applicant]
+        general = np.full(applicant.size, GENERAL, dtype=np.int8)
+        neutral = np.full(applicant.size, ANY_GENDER, dtype=np.int8)
+        candidates = np.stack([
+            seat_type(general, neutral),
+            np.where(gender != ANY_GENDER, seat_type(general, gender), -1),
+            np.where(category != GENERAL, seat_type(category, neutral), -1),
+            np.where((category != GENERAL) & (gender != ANY_GENDER), seat_type(category, gender), -1),
+        ], axis=1)
+        programs = np.where(candidates >= 0, matrix.programs[branch[:, None], np.maximum(candidates, 0)], -1)
+
+        valid = programs >= 0
+        program_chunks.append(programs[valid])
+        choice_chunks.append(np.broadcast_to(position[:, None], programs.shape)[valid])
+        counts.append(np.bincount(np.broadcast_to(applicant[:, None], programs.shape)[valid] - first, minlength=last - first))
+
+    count = np.concatenate(counts) if counts else np.zeros(0, dtype=np.int64)
+    return {
+        "programs": np.concatenate(program_chunks) if program_chunks else np.zeros(0, dtype=np.int32),
+        "choices": np.concatenate(choice_chunks) if choice_chunks else np.zeros(0, dtype=np.int64),
+        "offsets": np.r_[0, np.cumsum(count)].astype(np.int64),
+    }
+
+
+def deferred_acceptance(pool: ApplicantPool, matrix: SeatMatrix) -> Allocation:
+    """
+    Applicant-proposing deferred acceptance. Each round every applicant without a
+    seat proposes to their next program; each program keeps the best proposals by
+    merit up to its capacity, counting those it already holds, and rejects the
+    rest. Proposals worse than a full program's last held merit are rejected
+    before sorting, so after the first round only contested proposals are sorted.
+    """
+    preferences = expand_preferences(pool, matrix)
+    programs, offsets = preferences["programs"], preferences["offsets"]
+    capacity = matrix.capacity
+    merit = pool.merit
+    stride = np.int64(pool.size + 1)
+
+    pointer = offsets[:-1].copy()
+    end = offsets[1:]
+    threshold = np.full(matrix.size, np.iinfo(np.int64).max, dtype=np.int64)  # merit to beat, once full
+
+    held_applicant = np.zeros(0, dtype=np.int64)
+    held_program = np.zeros(0, dtype=np.int64)
+    free = np.flatnonzero(pointer < end)
+    rounds = 0
+    while free.size:
+        rounds += 1
+        proposed = programs[pointer[free]].astype(np.int64)
+        pointer[free] += 1
+
+        contested = merit[free] < threshold[proposed]
+        rejected = free[~contested]
+        applicant = np.concatenate([held_applicant, free[contested]])
+        program = np.concatenate([held_program, proposed[contested]])
+
+        order = np.argsort(program * stride + merit[applicant])
+        program = program[order]
+        applicant = applicant[order]
+        starts = np.flatnonzero(np.r_[True, program[1:] != program[:-1]]) if program.size else program
+        position = np.arange(program.size) - np.repeat(starts, np.diff(np.r_[starts, program.size]))
+        keep = position < capacity[program]
+
+        held_applicant, held_program = applicant[keep], program[keep]
+        rejected = np.concatenate([rejected, applicant[~keep]])
+
+        # A full program now only takes proposals better than its last held one
+        full = position == capacity[program] - 1
+        threshold[program[full]] = merit[applicant[full]]
+
+        free = rejected[pointer[rejected] < end[rejected]]
+
+    allotted = np.full(pool.size, -1, dtype=np.int64)
+    allotted[held_applicant] = held_program
+    choice = np.full(pool.size, -1, dtype=np.int64)
+    # The held program is the last one each allotted applicant proposed to
+    choice[held_applicant] = preferences["choices"][pointer[held_applicant] - 1]
+    return Allocation(program=allotted, choice=choice, rounds=rounds)
+
+
+def program_ranks(pool: ApplicantPool, matrix: SeatMatrix, allocation: Allocation) -> Dict[str, np.ndarray]:
+    """Per program: seats filled, and the opening and closing CRL rank of those allotted (0 if none)."""
+    allotted = np.flatnonzero(allocation.program >= 0)
+    program = allocation.program[allotted]
+    rank = pool.rank[allotted]
+    filled = np.bincount(program, minlength=matrix.size)
+    opening = np.full(matrix.size, np.iinfo(np.int64).max, dtype=np.int64)
+    closing = np.zeros(matrix.size, dtype=np.int64)
+    np.minimum.at(opening, program, rank)
+    np.maximum.at(closing, program, rank)
+    opening[filled == 0] = 0
+    return {"filled": filled, "opening": opening, "closing": closing}
+
+
+def category_codes(categories: List[Optional[str]]) -> np.ndarray:
+    return np.array([CATEGORY_CODES[value or Category.GENERAL.value] for value in categories], dtype=np.int8)
+
+
+def gender_codes(genders: List[Optional[str]]) -> np.ndarray:
+    return np.array([GENDER_CODES[value or Gender.ANY.value] for value in genders], dtype=np.int8)
@@ -0,0 +1,184 @@
+import asyncio
+import json
+from types import SimpleNamespace
+import pytest
+from bson import ObjectId
+from app.core.config import settings
+from app.services import change_feed as change_feed_module
+from app.services.change_feed import BRANCH, CHANNEL, COLLEGE, DELETE, EXAM, UPSERT, ChangeEvent, ChangeFeed
+
+
+class RecordingRedis:
+    def __init__(self, messages=(), fail=False):
+        self.published = []
+        self.messages = list(messages)
+        self.fail = fail
+
+    async def publish(self, channel, data):
+        if self.fail:
+            raise ConnectionError("redis is down")
+        self.published.append((channel, json.loads(data)))
+
+    def pubsub(self):
+        return FakePubSub(self.messages)
+
+
+class FakePubSub:
+    def __init__(self, messages):
+        self.messages = messages
+        self.closed = False
+
+    async def subscribe(self, channel):
+        assert channel == CHANNEL
+
+    async def listen(self):
+        for message in self.messages:
+            yield message
+        # Stop the listener once the queued messages are delivered
+        raise asyncio.CancelledError
+
+    async def aclose(self):
+        self.closed = True
+
+
+class FakeChangeStream:
+    def __init__(self, changes):
+        self.changes = changes
+        self.resume_token = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def __aiter__(self):
+        for position, change in enumerate(self.changes):
+            self.resume_token = {"_data": position}
+            yield change
+        raise asyncio.CancelledError
+
+
+def recorder(feed: ChangeFeed, entity: str) -> list:
+    events = []
+
+    async def handler(event):
+        events.append(event)
+
+    feed.subscribe(entity, handler)
+    return events
+
+
+@pytest.fixture
+def mode(monkeypatch):
+    def set_mode(value):
+        monkeypatch.setattr(settings, "CHANGE_FEED_MODE", value)
+    return set_mode
+
+
+def test_dispatch_reaches_the_entity_handlers_past_failures():
+    feed = ChangeFeed()
+    calls = []
+
+    async def failing(event):
+        calls.append("failing")
+        raise RuntimeError("handler bug")
+
+    feed.subscribe(COLLEGE, failing)
+    colleges = recorder(feed, COLLEGE)
+    branches = recorder(feed, BRANCH)
+
+    event = ChangeEvent(entity=COLLEGE, op=UPSERT, ids=["1"], origin="test")
+    asyncio.run(feed.dispatch(event))
+    asyncio.run(feed.dispatch(event._replace(entity=EXAM)))
+
+    assert calls == ["failing"]
+    assert colleges == [event]
+    assert branches == []
+    assert feed.stats["handler_errors"] == 1
+
+
+def test_local_publish_handles_the_write_in_process(mode, monkeypatch):
+    mode("local")
+    redis = RecordingRedis()
+    monkeypatch.setattr(change_feed_module, "redis", redis)
+    feed = ChangeFeed()
+    colleges = recorder(feed, COLLEGE)
+
+    college_id = ObjectId()
+    asyncio.run(feed.publish(COLLEGE, DELETE, [college_id]))
+    asyncio.run(feed.publish(COLLEGE, UPSERT, []))
+
+    assert colleges == [ChangeEvent(entity=COLLEGE, op=DELETE, ids=[str(college_id)], origin=feed.worker_id)]
+    assert feed.stats["published"] == 1
+    assert redis.published == []
+
+
+def test_redis_publish_fans_out_and_survives_redis_errors(mode, monkeypatch):
+    mode("redis")
+    redis = RecordingRedis()
+    monkeypatch.setattr(change_feed_module, "redis", redis)
+    feed = ChangeFeed()
+    colleges = recorder(feed, COLLEGE)
+
+    asyncio.run(feed.publish(COLLEGE, UPSERT, ["a", "b"]))
+    assert redis.published == [(CHANNEL, {"entity": COLLEGE, "op": UPSERT, "ids": ["a", "b"], "origin": feed.worker_id})]
+
+    redis.fail = True
+    asyncio.run(feed.publish(COLLEGE, UPSERT, ["c"]))
+    assert [event.ids for event in colleges] == [["a", "b"], ["c"]]
+    assert feed.stats["redis_errors"] == 1
+
+
+def test_change_stream_mode_leaves_delivery_to_the_stream(mode, monkeypatch):
+    mode("change_stream")
+    redis = RecordingRedis()
+    monkeypatch.setattr(change_feed_module, "redis", redis)
+    feed = ChangeFeed()
+    colleges = recorder(feed, COLLEGE)
+
+    asyncio.run(feed.publish(COLLEGE, UPSERT, ["a"]))
+    assert colleges == [] and redis.published == []
+    assert feed.stats["published"] == 0
+
+
+def test_redis_listener_skips_its_own_events(monkeypatch):
+    feed = ChangeFeed()
+    other = {"entity": BRANCH, "op": DELETE, "ids": ["b1"], "origin": "other-worker"}
+    own = {**other, "ids": ["b2"], "origin": feed.worker_id}
+    redis = RecordingRedis([
+        {"type": "subscribe", "data": 1},
+        {"type": "message", "data": json.dumps(own)},
+        {"type": "message", "data": json.dumps(other)},
+    ])
+    monkeypatch.setattr(change_feed_module, "redis", redis)
+    branches = recorder(feed, BRANCH)
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(feed.listen_redis())
+    assert branches == [ChangeEvent(**other)]
+    assert feed.stats["received"] == 1
+
+
+def test_change_stream_maps_collections_to_entities(monkeypatch):
+    card_id, branch_id = ObjectId(), ObjectId()
+    changes = [
+        {"ns": {"coll": "college_cards"}, "operationType": "update", "documentKey": {"_id": card_id}},
+        {"ns": {"coll": "college_junction"}, "operationType": "delete", "documentKey": {"_id": branch_id}},
+    ]
+    watched = []
+
+    def watch(pipeline, resume_after=None):
+        watched.append(pipeline[0]["$match"]["ns.coll"]["$in"])
+        return FakeChangeStream(changes)
+
+    monkeypatch.setattr(change_feed_module, "mongodb", SimpleNamespace(db=SimpleNamespace(watch=watch)))
+    feed = ChangeFeed()
+    colleges = recorder(feed, COLLEGE)
+    branches = recorder(feed, BRANCH)
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(feed.watch_change_stream())
+    assert "colleges" not in watched[0]
+    assert colleges == [ChangeEvent(entity=COLLEGE, op=UPSERT, ids=[str(card_id)], origin="mongodb")]
+    assert branches == [ChangeEvent(entity=BRANCH, op=DELETE, ids=[str(branch_id)], origin="mongodb")]
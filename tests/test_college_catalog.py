@@ -0,0 +1,220 @@
+import math
+import numpy as np
+import pytest
+from app.services.college_catalog import BITMAP_FIELDS, SORT_COLUMNS, CollegeCatalog, row_digest
+
+STATES = ["Karnataka", "Kerala", "Delhi", None]
+TYPES = ["government", "private"]
+CATEGORIES = ["engineering", "medical", "management"]
+
+
+def college_doc(index: int, rng: np.random.Generator) -> dict:
+    def sort_value():
+        # Few distinct values so ties are common; None and NaN are both missing
+        draw = rng.random()
+        if draw < 0.15:
+            return None
+        if draw < 0.25:
+            return math.nan
+        return float(rng.integers(1, 8))
+
+    row = {"id": f"{index * 7919 % 100003:024x}", "name": f"College {index}"}
+    return {
+        "row": row,
+        "version": f"v{index}",
+        "digest": row_digest(row),
+        **{field: sort_value() for field in SORT_COLUMNS},
+        "state": STATES[int(rng.integers(len(STATES)))],
+        "type": TYPES[int(rng.integers(len(TYPES)))],
+        "category": CATEGORIES[int(rng.integers(len(CATEGORIES)))],
+        "sub_category": None,
+        "featured": bool(rng.random() < 0.3),
+    }
+
+
+def random_docs(seed: int, size: int = 200) -> list:
+    rng = np.random.default_rng(seed)
+    return [college_doc(index, rng) for index in range(size)]
+
+
+def missing(value) -> bool:
+    return value is None or math.isnan(value)
+
+
+def brute_order(docs: list, sort_by, direction: int) -> list:
+    """Ids in MongoDB order for {sort_by: direction, _id: direction}; missing values sort lowest."""
+    if sort_by is None:
+        return sorted((doc["row"]["id"] for doc in docs), reverse=direction == -1)
+    key = lambda doc: (
+        not missing(doc[sort_by]),
+        0.0 if missing(doc[sort_by]) else doc[sort_by],
+        doc["row"]["id"],
+    )
+    return [doc["row"]["id"] for doc in sorted(docs, key=key, reverse=direction == -1)]
+
+
+def matches(doc: dict, filters: dict) -> bool:
+    return all(doc.get(field) == value for field, value in filters.items())
+
+
+FILTERS = [
+    {},
+    {"state": "Kerala"},
+    {"type": "private", "featured": True},
+    {"state": None, "category": "medical"},
+    {"state": "Goa"},
+]
+
+
+@pytest.mark.parametrize("seed", range(3))
+@pytest.mark.parametrize("sort_by", [None] + SORT_COLUMNS)
+@pytest.mark.parametrize("direction", [1, -1])
+@pytest.mark.parametrize("filters", FILTERS)
+def test_query_matches_brute_force(seed, sort_by, direction, filters):
+    docs = random_docs(seed)
+    snapshot = CollegeCatalog.build(docs)
+    by_id = {doc["row"]["id"]: doc for doc in docs}
+    expected = [college_id for college_id in brute_order(docs, sort_by, direction) if matches(by_id[college_id], filters)]
+
+    for offset in (0, 7, len(expected) - 3, len(expected) + 5):
+        offset = max(offset, 0)
+        page = snapshot.query(filters, sort_by, direction, offset, 10)
+        assert [row["id"] for row in page.rows] == expected[offset:offset + 10]
+        assert page.total == len(expected)
+        more = offset + 10 < len(expected)
+        assert page.next_row == (snapshot.row_index[expected[offset + 9]] if more else None)
+
+
+@pytest.mark.parametrize("seed", range(3))
+@pytest.mark.parametrize("sort_by", [None] + SORT_COLUMNS)
+@pytest.mark.parametrize("direction", [1, -1])
+def test_cursor_resumes_after_its_row(seed, sort_by, direction):
+    docs = random_docs(seed)
+    snapshot = CollegeCatalog.build(docs)
+    filters = {"type": "government"}
+    everything = brute_order(docs, sort_by, direction)
+    by_id = {doc["row"]["id"]: doc for doc in docs}
+
+    # Cursor rows need not match the filter themselves, e.g. after the row was edited
+    for cursor in everything[::17]:
+        after = everything[everything.index(cursor) + 1:]
+        expected = [college_id for college_id in after if matches(by_id[college_id], filters)]
+        page = snapshot.query(filters, sort_by, direction, 0, 10, after_id=cursor)
+        assert [row["id"] for row in page.rows] == expected[:10]
+
+
+def test_reversed_permutation_positions():
+    snapshot = CollegeCatalog.build(random_docs(0))
+    for sort_by in [None] + SORT_COLUMNS:
+        for direction in (1, -1):
+            perm, position = snapshot.permutation(sort_by, direction)
+            assert sorted(perm.tolist()) == list(range(snapshot.size))
+            assert (position[perm] == np.arange(snapshot.size)).all()
+        ascending, _ = snapshot.permutation(sort_by, 1)
+        descending, _ = snapshot.permutation(sort_by, -1)
+        assert ascending.tolist() == descending[::-1].tolist()
+
+
+def test_missing_values_sort_last_when_descending():
+    docs = random_docs(1)
+    snapshot = CollegeCatalog.build(docs)
+    page = snapshot.query({}, "rating", -1, 0, len(docs))
+    values = [snapshot.sort_value("rating", snapshot.row_index[row["id"]]) for row in page.rows]
+    present = [value for value in values if value is not None]
+    assert values == present + [None] * (len(values) - len(present))
+    assert present == sorted(present, reverse=True)
+
+
+def test_ranked_rows_keep_search_order():
+    docs = random_docs(2)
+    snapshot = CollegeCatalog.build(docs)
+    ranked = np.array([5, 40, 3, 120, 77, 9, 150], dtype=np.intp)
+    ranked_ids = [snapshot.ids[i] for i in ranked]
+
+    page = snapshot.query({}, None, 1, 0, 4, ranked_rows=ranked)
+    assert [row["id"] for row in page.rows] == ranked_ids[:4]
+    assert page.total == len(ranked)
+
+    page = snapshot.query({}, None, 1, 0, 10, after_id=ranked_ids[2], ranked_rows=ranked)
+    assert [row["id"] for row in page.rows] == ranked_ids[3:]
+    # A cursor row outside the hits cannot be resumed from
+    outside = next(college_id for college_id in snapshot.ids if college_id not in ranked_ids)
+    assert snapshot.query({}, None, 1, 0, 10, after_id=outside, ranked_rows=ranked) is None
+
+    page = snapshot.query({}, "fees", -1, 0, 10, ranked_rows=ranked)
+    by_id = {doc["row"]["id"]: doc for doc in docs}
+    expected = brute_order([by_id[college_id] for college_id in ranked_ids], "fees", -1)
+    assert [row["id"] for row in page.rows] == expected
+
+
+@pytest.mark.parametrize("filters", [{"city": "Mysore"}, {"state": {"$in": ["Kerala"]}}])
+def test_unsupported_filters_are_not_answered(filters):
+    snapshot = CollegeCatalog.build(random_docs(0, 20))
+    assert snapshot.query(filters, None, 1, 0, 10) is None
+
+
+def test_unknown_cursor_row_is_not_answered():
+    snapshot = CollegeCatalog.build(random_docs(0, 20))
+    assert snapshot.query({}, "ranking", -1, 0, 10, after_id="f" * 24) is None
+
+
+def test_version_is_an_order_independent_xor():
+    docs = random_docs(0, 50)
+    snapshot = CollegeCatalog.build(docs)
+    expected = 0
+    for doc in docs:
+        expected ^= row_digest(doc["row"])
+    assert snapshot.version == f"{expected:016x}"
+    assert CollegeCatalog.build(docs[::-1]).version == snapshot.version
+    assert CollegeCatalog.build([]).version == "0" * 16
+
+
+def test_apply_matches_a_full_rebuild():
+    docs = random_docs(3)
+    catalog = CollegeCatalog()
+    catalog.replace(CollegeCatalog.build(docs), docs)
+
+    rng = np.random.default_rng(99)
+    changed = dict(docs[10], row={**docs[10]["row"], "name": "Renamed"}, rating=None, state="Delhi")
+    changed["digest"] = row_digest(changed["row"])
+    added = college_doc(5000, rng)
+    removed = [docs[0]["row"]["id"], docs[50]["row"]["id"]]
+    snapshot, merged = catalog.apply([changed, added], removed)
+
+    expected_docs = [doc for doc in docs if doc["row"]["id"] not in removed]
+    expected_docs = [changed if doc["row"]["id"] == changed["row"]["id"] else doc for doc in expected_docs] + [added]
+    rebuilt = CollegeCatalog.build(expected_docs)
+    assert snapshot.version == rebuilt.version
+    assert snapshot.versions == rebuilt.versions
+    assert sorted(doc["row"]["id"] for doc in merged) == sorted(rebuilt.ids)
+    for sort_by in [None] + SORT_COLUMNS:
+        for filters in FILTERS:
+            ours = snapshot.query(filters, sort_by, -1, 0, 500)
+            theirs = rebuilt.query(filters, sort_by, -1, 0, 500)
+            assert [row["id"] for row in ours.rows] == [row["id"] for row in theirs.rows]
+
+
+def test_drop_version_leaves_the_previous_map_alone():
+    docs = random_docs(0, 10)
+    catalog = CollegeCatalog()
+    catalog.replace(CollegeCatalog.build(docs), docs)
+    college_id = docs[4]["row"]["id"]
+
+    before = catalog.versions
+    assert catalog.drop_version(college_id) == "v4"
+    assert before[college_id] == "v4"
+    assert college_id not in catalog.versions
+    assert catalog.drop_version(college_id) is None
+
+
+def test_facet_counts_skip_missing_values():
+    docs = random_docs(0)
+    snapshot = CollegeCatalog.build(docs)
+    mask = snapshot.mask({"type": "private"})
+    counts = snapshot.facet_counts(mask, BITMAP_FIELDS)
+    for field in BITMAP_FIELDS:
+        expected = {}
+        for doc in docs:
+            if doc["type"] == "private" and doc[field] is not None:
+                expected[doc[field]] = expected.get(doc[field], 0) + 1
+        assert counts[field] == expected
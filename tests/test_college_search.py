@@ -0,0 +1,134 @@
+import numpy as np
+import pytest
+from app.services import college_service
+from app.services.college_catalog import CollegeCatalog
+from app.services.college_search import FIELD_WEIGHTS, PREFIX_MATCH_FACTOR, CollegeSearchIndex, tokenize
+from app.services.college_service import CollegeService, TEXT_RELEVANCE
+from app.services.pagination import InvalidCursorError, decode_cursor, encode_cursor
+
+WORDS = ["indian", "institute", "technology", "tech", "national", "bombay", "bangalore", "delhi", "medical", "science"]
+
+
+def search_entry(index: int, rng: np.random.Generator) -> dict:
+    def words(count):
+        return " ".join(rng.choice(WORDS, size=count))
+
+    return {
+        "id": f"{index:024x}",
+        "name": words(3),
+        "short_name": words(1) if rng.random() < 0.5 else None,
+        "alias": words(2) if rng.random() < 0.3 else None,
+        "tags": [words(1) for _ in range(int(rng.integers(0, 3)))],
+    }
+
+
+def random_entries(seed: int, size: int = 150) -> list:
+    rng = np.random.default_rng(seed)
+    return [search_entry(index, rng) for index in range(size)]
+
+
+def brute_scores(entries: list, text: str) -> dict:
+    """Sum over query terms of the best field weight of a token the term starts, for colleges matching every term."""
+    terms = list(dict.fromkeys(tokenize(text)))
+    scores = {}
+    for entry in entries:
+        total = 0.0
+        for term in terms:
+            best = 0.0
+            for field, weight in FIELD_WEIGHTS.items():
+                value = entry.get(field)
+                for text_value in value if isinstance(value, list) else [value]:
+                    for token in tokenize(text_value):
+                        if token.startswith(term):
+                            best = max(best, weight if token == term else weight * PREFIX_MATCH_FACTOR)
+            if not best:
+                break
+            total += best
+        else:
+            if terms:
+                scores[entry["id"]] = total
+    return scores
+
+
+QUERIES = ["tech", "Indian Institute", "iNST tech", "b", "delhi medical science", "bom ban", "zzz", "  ", "tech-tech"]
+
+
+@pytest.mark.parametrize("seed", range(3))
+@pytest.mark.parametrize("text", QUERIES)
+def test_search_matches_brute_force(seed, text):
+    entries = random_entries(seed)
+    hits = CollegeSearchIndex.build(entries).search(text)
+
+    assert dict(hits) == pytest.approx(brute_scores(entries, text))
+    assert hits == sorted(hits, key=lambda hit: (-hit[1], hit[0]))
+
+
+def test_upserts_and_removals_match_a_rebuild():
+    entries = random_entries(0)
+    index = CollegeSearchIndex()
+    for entry in entries:
+        index.upsert(entry["id"], entry)
+
+    rng = np.random.default_rng(7)
+    for position in range(0, len(entries), 3):
+        entries[position] = {**search_entry(position, rng), "id": entries[position]["id"]}
+        index.upsert(entries[position]["id"], entries[position])
+    for entry in entries[::5]:
+        index.remove(entry["id"])
+    index.remove("f" * 24)
+
+    rebuilt = CollegeSearchIndex.build([entry for i, entry in enumerate(entries) if i % 5])
+    assert index.documents == rebuilt.documents
+    assert index.postings == rebuilt.postings
+    assert index.vocabulary == rebuilt.vocabulary
+
+
+def test_exact_tokens_outrank_prefixes_and_fields_are_weighted():
+    index = CollegeSearchIndex.build([
+        {"id": "a", "name": "Technology Institute"},
+        {"id": "b", "name": "Tech Institute"},
+        {"id": "c", "name": "Institute", "short_name": "tech"},
+        {"id": "d", "name": "Institute", "tags": ["tech"]},
+    ])
+    assert [college_id for college_id, _ in index.search("tech")] == ["c", "b", "a", "d"]
+
+
+@pytest.fixture
+def catalog_search(monkeypatch):
+    entries = random_entries(1, 60)
+    docs = [
+        {"row": {"_id": entry["id"], "name": entry["name"], "location": "City", "state": "State"}, "version": "v"}
+        for entry in entries
+    ]
+    for doc in docs:
+        doc["row"]["id"] = doc["row"]["_id"]
+    catalog = CollegeCatalog()
+    catalog.replace(CollegeCatalog.build(docs), docs)
+    monkeypatch.setattr(college_service, "catalog", catalog)
+    monkeypatch.setattr(college_service, "search_index", CollegeSearchIndex.build(entries))
+    return entries
+
+
+def test_relevance_cursors_page_through_the_catalog_hits(catalog_search):
+    expected = [college_id for college_id, _ in college_service.search_index.search("institute")]
+    assert len(expected) > 8
+
+    seen, cursor = [], None
+    while True:
+        page = CollegeService.get_colleges_from_catalog({"search": "institute"}, "relevance", -1, 1, 4, cursor)
+        seen.extend(college.id for college in page.colleges)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+    assert seen == expected
+
+
+def test_relevance_cursors_stay_with_the_index_that_issued_them(catalog_search):
+    page = CollegeService.get_colleges_from_catalog({"search": "institute"}, "relevance", -1, 1, 4, None)
+    # MongoDB's text index cannot resume from a catalog cursor
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(page.next_cursor, TEXT_RELEVANCE)
+
+    # and the catalog hands text-index cursors back to MongoDB
+    text_cursor = encode_cursor(TEXT_RELEVANCE, 1.5, catalog_search[0]["id"])
+    assert CollegeService.get_colleges_from_catalog({"search": "institute"}, "relevance", -1, 1, 4, text_cursor) is None
@@ -0,0 +1,109 @@
+import numpy as np
+import pytest
+from app.services.college_suggest import CollegeSuggestIndex, acronym, normalize, popularity_key, suggestion_keys
+
+WORDS = ["indian", "institute", "of", "technology", "national", "bombay", "bangalore", "delhi", "medical", "sciences"]
+
+
+def suggest_entry(index: int, rng: np.random.Generator) -> dict:
+    name = " ".join(rng.choice(WORDS, size=int(rng.integers(2, 5))))
+    return {
+        "id": f"{index:024x}",
+        # The number keeps names, and so popularity keys, distinct
+        "name": f"{name.title()} {index}",
+        "short_name": "".join(word[0] for word in name.split()).upper() if rng.random() < 0.4 else None,
+        "alias": None,
+        "slug": f"college-{index}",
+        "location": "City",
+        "state": "State",
+        "ranking": int(rng.integers(1, 300)) if rng.random() < 0.5 else None,
+        "reviews": int(rng.integers(0, 50)),
+        "rating": float(rng.integers(1, 5)),
+    }
+
+
+def random_entries(seed: int, size: int = 300) -> list:
+    rng = np.random.default_rng(seed)
+    return [suggest_entry(index, rng) for index in range(size)]
+
+
+def loaded(entries: list) -> CollegeSuggestIndex:
+    index = CollegeSuggestIndex()
+    index.load(entries)
+    return index
+
+
+def brute_suggest(entries: list, text: str, limit: int) -> list:
+    prefix = normalize(text)
+    if not prefix:
+        return []
+    found = [entry for entry in entries if any(key.startswith(prefix) for key in suggestion_keys(entry))]
+    return [entry["id"] for entry in sorted(found, key=popularity_key)[:limit]]
+
+
+def test_keys_cover_word_suffixes_and_acronyms():
+    entry = {"name": "Indian Institute of Technology, Bombay", "short_name": "IIT-B"}
+    assert acronym(normalize(entry["name"])) == "iitb"
+    assert suggestion_keys(entry) == sorted({
+        "indian institute of technology bombay",
+        "institute of technology bombay",
+        "of technology bombay",
+        "technology bombay",
+        "bombay",
+        "iitb",
+        "iit b",
+        "ib",
+    })
+
+
+# Broad one-letter prefixes walk the popularity order, narrow ones scan their key range
+@pytest.mark.parametrize("seed", range(3))
+@pytest.mark.parametrize("text", ["i", "B", "ban", "technology bom", "Delhi 1", "nit", "xyz", "  "])
+@pytest.mark.parametrize("limit", [1, 10])
+def test_suggest_matches_brute_force(seed, text, limit):
+    entries = random_entries(seed)
+    index = loaded(entries)
+    expected = brute_suggest(entries, text, limit)
+    assert [suggestion["id"] for suggestion in index.suggest(text, limit)] == expected
+    # A second lookup may come from the memo
+    assert [suggestion["id"] for suggestion in index.suggest(text, limit)] == expected
+
+
+def test_upserts_match_a_bulk_load():
+    entries = random_entries(0)
+    index = CollegeSuggestIndex()
+    for entry in entries:
+        index.upsert(entry["id"], entry)
+    fresh = loaded(entries)
+    assert index.entries == fresh.entries
+    assert index.ranked == fresh.ranked
+    assert index.documents == fresh.documents
+
+
+def test_diff_and_apply_catch_up_with_the_new_list():
+    # Enough colleges for the broad prefix to be memoized
+    entries = random_entries(1, 1500)
+    index = loaded(entries)
+    assert index.diff(entries) == ([], [])
+    broad = [suggestion["id"] for suggestion in index.suggest("i", 5)]
+
+    rng = np.random.default_rng(11)
+    updated = [dict(entry) for entry in entries[20:]]
+    updated[0]["name"] = "Zenith Institute"
+    updated[1].update(name="Ivy College", ranking=0)
+    updated[2]["slug"] = "renamed"
+    updated.append(suggest_entry(5000, rng))
+
+    changed, stale = index.diff(updated)
+    assert [entry["id"] for entry in changed] == [updated[0]["id"], updated[1]["id"], updated[2]["id"], updated[-1]["id"]]
+    assert sorted(stale) == sorted(entry["id"] for entry in entries[:20])
+
+    index.apply(changed, stale)
+    fresh = loaded(updated)
+    assert index.entries == fresh.entries
+    assert index.ranked == fresh.ranked
+    assert index.documents == fresh.documents
+    # Changes clear memoized broad prefixes
+    assert updated[1]["id"] not in broad
+    assert index.suggest("i", 5)[0]["id"] == updated[1]["id"]
+    assert index.suggest("zenith")[0]["id"] == updated[0]["id"]
@@ -0,0 +1,116 @@
+import numpy as np
+import pytest
+from app.services.cutoff_table import CutoffTable
+
+OPEN_CATEGORIES = ("general", "any")
+
+
+def branch_doc(index: int, cutoffs: list, state: str = "Karnataka") -> dict:
+    return {
+        "row": {"id": str(index)},
+        "stream_id": "engineering",
+        "state": state,
+        "fees": 100000.0,
+        "cutoffs": cutoffs,
+    }
+
+
+def cutoff(closing: int, category: str = "general", year: int = 2024, round: int = 1, **fields) -> dict:
+    return {"exam": "JEE Main", "year": year, "round": round, "category": category,
+            "opening_rank": 1, "closing_rank": closing, **fields}
+
+
+def profile_seats(table: CutoffTable, profile) -> dict:
+    """branch -> (open closing, reserved closing), 0 where the branch has no such seat."""
+    closing = table.columns["closing"]
+    seats = {}
+    for open_row, reserved_row in zip(profile.open_row.tolist(), profile.reserved_row.tolist()):
+        assert open_row >= 0 or reserved_row >= 0
+        branch = int(table.columns["branch"][open_row if open_row >= 0 else reserved_row])
+        seats[branch] = (
+            int(closing[open_row]) if open_row >= 0 else 0,
+            int(closing[reserved_row]) if reserved_row >= 0 else 0,
+        )
+    return seats
+
+
+def test_any_category_seats_count_as_open():
+    table = CutoffTable([
+        branch_doc(0, [cutoff(100), cutoff(400, category="any")]),
+        branch_doc(1, [cutoff(900, category="obc")]),
+    ])
+    profile = table.profile("JEE Main", category="obc")
+    assert profile_seats(table, profile) == {0: (400, 0), 1: (0, 900)}
+
+
+def test_missing_seat_stays_marked_in_a_later_year():
+    # The 2024 rows start after the 2023 ones, so row indices are offset
+    table = CutoffTable([
+        branch_doc(0, [cutoff(100, year=2023), cutoff(200)]),
+        branch_doc(1, [cutoff(300, year=2023), cutoff(800, category="sc")]),
+    ])
+    profile = table.profile("JEE Main", category="sc", year=2024)
+    assert list(profile.open_row >= 0) == [True, False]
+    assert list(profile.reserved_row >= 0) == [False, True]
+    assert profile_seats(table, profile) == {0: (200, 0), 1: (0, 800)}
+
+
+def test_latest_round_and_home_state_quota():
+    table = CutoffTable([
+        branch_doc(0, [
+            cutoff(500, round=1),
+            cutoff(300, round=2),
+            cutoff(2000, round=2, quota="home_state"),
+        ]),
+        branch_doc(1, [cutoff(700, quota="other_state")], state="Kerala"),
+    ])
+    assert profile_seats(table, table.profile("JEE Main")) == {0: (300, 0)}
+    assert profile_seats(table, table.profile("JEE Main", home_state="karnataka")) == {0: (2000, 0), 1: (700, 0)}
+    assert profile_seats(table, table.profile("JEE Main", round=1)) == {0: (500, 0)}
+
+
+def test_unknown_exam_or_year():
+    table = CutoffTable([branch_doc(0, [cutoff(100)])])
+    assert table.profile("NEET") is None
+    assert table.profile("JEE Main", year=2019) is None
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_profile_matches_brute_force(seed):
+    rng = np.random.default_rng(seed)
+    categories = ["general", "any", "obc", "sc"]
+    genders = ["any", "female", "male"]
+    docs = []
+    for branch in range(40):
+        cutoffs = [
+            cutoff(
+                int(rng.integers(1, 50000)),
+                category=str(rng.choice(categories)),
+                year=int(rng.choice([2023, 2024])),
+                round=int(rng.integers(1, 4)),
+                gender=str(rng.choice(genders)),
+            )
+            for _ in range(int(rng.integers(0, 8)))
+        ]
+        docs.append(branch_doc(branch, cutoffs))
+    table = CutoffTable(docs)
+
+    student_category, student_gender = "obc", "female"
+    expected = {}
+    for branch, doc in enumerate(docs):
+        rows = [
+            row for row in doc["cutoffs"]
+            if row["year"] == 2024
+            and row["category"] in OPEN_CATEGORIES + (student_category,)
+            and row["gender"] in ("any", student_gender)
+        ]
+        if not rows:
+            continue
+        latest = max(row["round"] for row in rows)
+        rows = [row for row in rows if row["round"] == latest]
+        open_seats = [row["closing_rank"] for row in rows if row["category"] in OPEN_CATEGORIES]
+        reserved_seats = [row["closing_rank"] for row in rows if row["category"] not in OPEN_CATEGORIES]
+        expected[branch] = (max(open_seats, default=0), max(reserved_seats, default=0))
+
+    profile = table.profile("JEE Main", category=student_category, gender=student_gender, year=2024)
+    assert profile_seats(table, profile) == expected
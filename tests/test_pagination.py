@@ -0,0 +1,81 @@
+import pytest
+from bson import ObjectId
+from app.services.pagination import InvalidCursorError, decode_cursor, encode_cursor, keyset_match
+
+
+def sort_key(value):
+    # MongoDB orders null below every number
+    return (0, 0) if value is None else (1, value)
+
+
+def matches(doc: dict, condition: dict) -> bool:
+    """Evaluate the subset of MongoDB query operators keyset_match produces."""
+    for key, expected in condition.items():
+        if key == "$or":
+            if not any(matches(doc, branch) for branch in expected):
+                return False
+        elif key == "$and":
+            if not all(matches(doc, branch) for branch in expected):
+                return False
+        elif isinstance(expected, dict):
+            value = doc.get(key)
+            for op, operand in expected.items():
+                if op == "$ne":
+                    if value == operand:
+                        return False
+                elif value is None or operand is None:
+                    return False  # comparisons never match across null and numbers
+                elif op == "$gt" and not value > operand:
+                    return False
+                elif op == "$lt" and not value < operand:
+                    return False
+        elif doc.get(key) != expected:
+            return False
+    return True
+
+
+def make_docs(id_field: str = "_id") -> list:
+    values = [3, None, 1, 3, 2, None, 1, 5, 3]
+    return [{id_field: ObjectId(), "value": value} for value in values]
+
+
+@pytest.mark.parametrize("direction", [1, -1])
+@pytest.mark.parametrize("id_field", ["_id", "college_id"])
+def test_keyset_match_resumes_after_each_row(direction, id_field):
+    docs = make_docs(id_field)
+    ordered = sorted(docs, key=lambda doc: (sort_key(doc["value"]), doc[id_field]), reverse=direction == -1)
+
+    for position, last in enumerate(ordered):
+        condition = keyset_match("value", direction, last["value"], last[id_field], id_field=id_field)
+        after = [doc for doc in ordered if matches(doc, condition)]
+        assert after == ordered[position + 1:]
+
+
+def test_keyset_match_without_sort_field_seeks_on_id():
+    docs = sorted(make_docs(), key=lambda doc: doc["_id"])
+    condition = keyset_match(None, 1, None, docs[2]["_id"])
+    assert [doc for doc in docs if matches(doc, condition)] == docs[3:]
+
+
+@pytest.mark.parametrize("value", [12, 4.5, "name", None])
+def test_cursor_round_trip(value):
+    last_id = ObjectId()
+    assert decode_cursor(encode_cursor("rating", value, last_id), "rating") == (value, last_id)
+
+
+def test_cursor_from_another_sort_is_rejected():
+    cursor = encode_cursor("rating", 4.5, ObjectId())
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor, "fees")
+
+
+@pytest.mark.parametrize("cursor", ["", "not-a-cursor", encode_cursor("rating", 1, "not-an-id")])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor, "rating")
+
+
+def test_cursor_value_must_be_a_scalar():
+    cursor = encode_cursor("rating", {"$gt": 1}, ObjectId())
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor, "rating")
@@ -0,0 +1,54 @@
+from typing import List, Optional
+import pytest
+from pydantic import BaseModel
+from app.services.projection import InvalidFieldsError, path_tree
+
+
+class Coordinates(BaseModel):
+    lat: float
+    lng: float
+
+
+class Address(BaseModel):
+    city: str
+    coordinates: Optional[Coordinates] = None
+
+
+class Course(BaseModel):
+    name: str
+    fees: Optional[float] = None
+
+
+class College(BaseModel):
+    name: str
+    address: Optional[Address] = None
+    courses: Optional[List[Course]] = []
+
+
+def test_nests_dotted_paths():
+    tree = path_tree(College, frozenset({"name", "address.city", "address.coordinates.lat", "courses.fees"}))
+    assert tree == {
+        "name": {},
+        "address": {"city": {}, "coordinates": {"lat": {}}},
+        "courses": {"fees": {}},
+    }
+
+
+@pytest.mark.parametrize("paths", [
+    {"address", "address.city"},
+    {"address.coordinates.lng", "address"},
+    {"address.city", "address.coordinates", "address"},
+])
+def test_whole_parent_absorbs_its_children(paths):
+    assert path_tree(College, frozenset(paths)) == {"address": {}}
+
+
+def test_selected_subtree_absorbs_deeper_paths():
+    tree = path_tree(College, frozenset({"address.coordinates", "address.coordinates.lat", "address.city"}))
+    assert tree == {"address": {"coordinates": {}, "city": {}}}
+
+
+@pytest.mark.parametrize("path", ["rating", "address.street", "name.first", "courses.name.x"])
+def test_unknown_paths_are_rejected(path):
+    with pytest.raises(InvalidFieldsError, match=path):
+        path_tree(College, frozenset({path}))
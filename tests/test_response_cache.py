@@ -0,0 +1,144 @@
+import asyncio
+import pytest
+from app.services import response_cache
+from app.services.response_cache import ResponseCache
+
+
+class MemoryRedis:
+    """The few Redis calls the cache makes, kept in a dict; TTLs are left to the entries."""
+
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+
+class DownRedis:
+    async def get(self, key):
+        raise ConnectionError("redis is down")
+
+    async def set(self, key, value, ex=None):
+        raise ConnectionError("redis is down")
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    memory = MemoryRedis()
+    monkeypatch.setattr(response_cache, "redis", memory)
+    monkeypatch.setattr(response_cache, "caches", {})
+    return memory
+
+
+def counting(value, gate=None):
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        if gate is not None:
+            await gate.wait()
+        return value
+
+    return compute, calls
+
+
+def test_concurrent_misses_compute_once(redis):
+    async def run():
+        cache = ResponseCache("test:single-flight", max_entries=10, ttl_seconds=60)
+        gate = asyncio.Event()
+        compute, calls = counting({"page": 1}, gate)
+        waiting = [asyncio.create_task(cache.get_or_compute("key", compute)) for _ in range(5)]
+        await asyncio.sleep(0)
+        gate.set()
+        results = await asyncio.gather(*waiting)
+        return cache, calls, results
+
+    cache, calls, results = asyncio.run(run())
+    assert len(calls) == 1
+    assert results == [{"page": 1}] * 5
+    assert cache.stats["misses"] == 1 and cache.stats["coalesced"] == 4
+    assert not cache.inflight
+
+
+def test_failures_reach_every_waiter_and_are_not_cached(redis):
+    async def run():
+        cache = ResponseCache("test:failure", max_entries=10, ttl_seconds=60)
+        gate = asyncio.Event()
+        calls = []
+
+        async def failing():
+            calls.append(1)
+            await gate.wait()
+            raise ValueError("backend failed")
+
+        waiting = [asyncio.create_task(cache.get_or_compute("key", failing)) for _ in range(3)]
+        await asyncio.sleep(0)
+        gate.set()
+        results = await asyncio.gather(*waiting, return_exceptions=True)
+
+        compute, retried = counting("fresh")
+        return cache, calls, results, await cache.get_or_compute("key", compute), retried
+
+    cache, calls, results, value, retried = asyncio.run(run())
+    assert len(calls) == 1
+    assert all(isinstance(result, ValueError) for result in results)
+    assert value == "fresh" and len(retried) == 1
+    assert not cache.inflight
+
+
+def test_hits_come_from_process_then_from_redis(redis):
+    async def run():
+        first = ResponseCache("test:tiers", max_entries=10, ttl_seconds=60)
+        compute, calls = counting([1, 2, 3])
+        await first.get_or_compute("key", compute)
+        await first.get_or_compute("key", compute)
+        # Another worker holding the same namespace finds it in Redis
+        second = ResponseCache("test:tiers", max_entries=10, ttl_seconds=60)
+        return first, second, await second.get_or_compute("key", compute), calls
+
+    first, second, value, calls = asyncio.run(run())
+    assert value == [1, 2, 3] and len(calls) == 1
+    assert first.stats["hits"] == 1
+    assert second.stats["redis_hits"] == 1
+
+
+def test_expired_and_evicted_entries_are_recomputed(redis, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(response_cache.time, "time", lambda: now[0])
+
+    async def run():
+        cache = ResponseCache("test:expiry", max_entries=2, ttl_seconds=60)
+        compute, calls = counting("value")
+        for key in ("a", "b", "c"):
+            await cache.get_or_compute(key, compute)
+        assert list(cache.local) == ["b", "c"]
+
+        redis.data.clear()
+        await cache.get_or_compute("a", compute)
+        assert len(calls) == 4
+        now[0] += 61
+        await cache.get_or_compute("c", compute)
+        return calls
+
+    assert len(asyncio.run(run())) == 5
+
+
+def test_redis_errors_degrade_to_a_miss(monkeypatch):
+    monkeypatch.setattr(response_cache, "redis", DownRedis())
+    monkeypatch.setattr(response_cache, "caches", {})
+
+    async def run():
+        cache = ResponseCache("test:down", max_entries=10, ttl_seconds=60)
+        compute, calls = counting("value")
+        return cache, await cache.get_or_compute("key", compute), calls
+
+    cache, value, calls = asyncio.run(run())
+    assert value == "value" and len(calls) == 1
+    assert cache.stats["redis_errors"] == 2
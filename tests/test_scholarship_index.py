@@ -0,0 +1,121 @@
+from datetime import date
+import numpy as np
+import pytest
+from app.models.scholarship import Category, Gender
+from app.services.scholarship_index import CATEGORY_BITS, GENDER_BITS, ScholarshipTable, enum_mask
+
+COLLEGES = [f"college{i}" for i in range(6)]
+STREAMS = [f"stream{i}" for i in range(4)]
+TODAY = date(2025, 6, 1)
+
+
+def scholarship_doc(index: int, rng: np.random.Generator) -> dict:
+    def maybe(value):
+        return value if rng.random() < 0.5 else None
+
+    streams = list(rng.choice(STREAMS, size=int(rng.integers(0, 3)), replace=False))
+    genders = list(rng.choice([gender.value for gender in Gender], size=int(rng.integers(0, 3)), replace=False))
+    categories = list(rng.choice([category.value for category in Category], size=int(rng.integers(0, 3)), replace=False))
+    return {
+        "scholarship_id": str(index),
+        "title": f"Scholarship {index}",
+        "college_id": str(rng.choice(COLLEGES)),
+        "stream_ids": [str(stream) for stream in streams],
+        "amount": maybe(float(rng.integers(1, 1000)) * 100 + index * 0.01),
+        "amount_range": None,
+        "genders": enum_mask(genders, GENDER_BITS, Gender.ANY.value),
+        "categories": enum_mask(categories, CATEGORY_BITS, Category.ANY.value),
+        "min_percentage": maybe(float(rng.integers(40, 95))),
+        "min_cgpa": maybe(float(rng.integers(5, 10))),
+        "max_family_income": maybe(float(rng.integers(1, 20)) * 100000),
+        "deadline": maybe((TODAY.toordinal() + int(rng.integers(-30, 30)))),
+    }
+
+
+def random_table(seed: int, size: int = 300) -> ScholarshipTable:
+    rng = np.random.default_rng(seed)
+    return ScholarshipTable([scholarship_doc(index, rng) for index in range(size)])
+
+
+def claimable(doc: dict, student: dict, stream_id=None) -> bool:
+    """Brute-force eligibility of one scholarship for a student."""
+    def meets_minimum(threshold, value):
+        return threshold is None or (value is not None and value >= threshold)
+
+    return bool(
+        doc["genders"] & GENDER_BITS[student["gender"].value]
+        and doc["categories"] & CATEGORY_BITS[student["category"].value]
+        and (stream_id is None or not doc["stream_ids"] or stream_id in doc["stream_ids"])
+        and meets_minimum(doc["min_percentage"], student.get("percentage"))
+        and meets_minimum(doc["min_cgpa"], student.get("cgpa"))
+        and (doc["max_family_income"] is None or (
+            student.get("family_income") is not None and student["family_income"] <= doc["max_family_income"]
+        ))
+        and (doc["deadline"] is None or doc["deadline"] >= TODAY.toordinal())
+    )
+
+
+STUDENTS = [
+    {"gender": Gender.FEMALE, "category": Category.OBC, "percentage": 85.0, "cgpa": 8.0, "family_income": 500000.0},
+    {"gender": Gender.MALE, "category": Category.GENERAL, "percentage": 60.0},
+    {"gender": Gender.ANY, "category": Category.SC, "cgpa": 9.5, "family_income": 2500000.0},
+    {"gender": Gender.MALE, "category": Category.EWS},
+]
+
+
+@pytest.mark.parametrize("seed", range(3))
+@pytest.mark.parametrize("student", STUDENTS)
+def test_best_awards_match_brute_force(seed, student):
+    table = random_table(seed)
+    eligible = table.eligible(**student, on=TODAY)
+    assert eligible.tolist() == [claimable(doc, student) for doc in table.docs]
+
+    pairs = [(college, stream) for college in COLLEGES + ["unknown"] for stream in STREAMS + ["unknown"]]
+    best = table.best_awards(eligible, [college for college, _ in pairs], [stream for _, stream in pairs])
+
+    for (college, stream), found in zip(pairs, best.tolist()):
+        amounts = [
+            doc["amount"] for i, doc in enumerate(table.docs)
+            if eligible[i] and doc["amount"] is not None and doc["college_id"] == college
+            and (not doc["stream_ids"] or stream in doc["stream_ids"])
+        ]
+        if not amounts:
+            assert found == -1
+        else:
+            assert table.docs[found]["amount"] == max(amounts)
+            assert table.docs[found]["college_id"] == college
+
+
+def test_best_awards_on_an_empty_table():
+    table = ScholarshipTable([])
+    eligible = table.eligible(Gender.FEMALE, Category.GENERAL, on=TODAY)
+    assert table.best_awards(eligible, ["college0"], ["stream0"]).tolist() == [-1]
+
+
+@pytest.mark.parametrize("seed", range(3))
+@pytest.mark.parametrize("student", STUDENTS)
+@pytest.mark.parametrize("stream_id", [None, "stream1", "unknown"])
+def test_match_matches_brute_force(seed, student, stream_id):
+    table = random_table(seed)
+    matched = table.match(**student, stream_id=stream_id, on=TODAY).tolist()
+
+    expected = [i for i, doc in enumerate(table.docs) if claimable(doc, student, stream_id)]
+    assert sorted(matched) == expected
+    amounts = [table.amount[i] for i in matched]
+    assert amounts == sorted(amounts, reverse=True)
+
+
+def test_match_excludes_past_deadlines_and_unmet_thresholds():
+    docs = [
+        {**scholarship_doc(0, np.random.default_rng(0)), "genders": enum_mask(None, GENDER_BITS, Gender.ANY.value),
+         "categories": enum_mask(None, CATEGORY_BITS, Category.ANY.value), "stream_ids": [],
+         "min_percentage": None, "min_cgpa": None, "max_family_income": None, "deadline": None, "amount": 100.0},
+    ]
+    docs.append({**docs[0], "scholarship_id": "1", "amount": 500.0, "deadline": TODAY.toordinal() - 1})
+    docs.append({**docs[0], "scholarship_id": "2", "amount": 300.0, "min_percentage": 90.0})
+    docs.append({**docs[0], "scholarship_id": "3", "amount": 200.0, "max_family_income": 100000.0})
+    table = ScholarshipTable(docs)
+
+    assert table.match(Gender.FEMALE, Category.GENERAL, on=TODAY).tolist() == [0]
+    assert table.match(Gender.FEMALE, Category.GENERAL, percentage=92.0, family_income=80000.0, on=TODAY).tolist() == [2, 3, 0]
+    assert table.match(Gender.FEMALE, Category.GENERAL, percentage=92.0, on=date(2000, 1, 1)).tolist() == [1, 2, 0]
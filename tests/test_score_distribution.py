@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+from app.services.score_distribution import DistributionIndex, ScoreDistribution
+
+
+def distribution() -> ScoreDistribution:
+    # Breakpoints out of order; scores 280 and 290 share rank 2 (nobody in between)
+    return ScoreDistribution(
+        exam="JEE Main",
+        year=2025,
+        total_candidates=1000,
+        scores=[300, 0, 200, 280, 290, 100],
+        ranks=[1, 1000, 50, 2, 2, 400],
+    )
+
+
+def test_score_to_rank_interpolates_between_breakpoints():
+    ranks = distribution().score_to_rank(np.array([300, 250, 150, 100, 50]))
+    assert ranks.tolist() == [1, 20, 225, 400, 700]
+
+
+def test_score_to_rank_clips_beyond_the_breakpoints():
+    assert distribution().score_to_rank(np.array([360, -5])).tolist() == [1, 1000]
+
+
+def test_rank_to_score_takes_the_lowest_score_of_a_shared_rank():
+    scores = distribution().rank_to_score(np.array([1, 2, 50, 225, 1000]))
+    assert scores.tolist() == [300, 280, 200, 150, 0]
+
+
+@pytest.mark.parametrize("rank", [1, 2, 37, 500, 999, 1000])
+def test_percentile_round_trip(rank):
+    dist = distribution()
+    percentile = dist.rank_to_percentile(np.array([rank]))
+    assert dist.percentile_to_rank(percentile).tolist() == [rank]
+
+
+def test_percentiles_put_the_topper_at_100():
+    dist = distribution()
+    assert dist.rank_to_percentile(np.array([1, 1000])).tolist() == [100.0, 0.1]
+    assert dist.percentile_to_rank(np.array([100.0, 0.0, -3.0])).tolist() == [1, 1000, 1000]
+
+
+def test_score_to_rank_is_monotone():
+    scores = np.linspace(-10, 310, 500)
+    ranks = distribution().score_to_rank(scores)
+    assert (np.diff(ranks) <= 0).all()
+
+
+def test_index_serves_latest_year_by_default():
+    index = DistributionIndex()
+    older = ScoreDistribution("JEE Main", 2024, 10, [0, 10], [10, 1])
+    newer = ScoreDistribution("JEE Main", 2025, 10, [0, 10], [10, 1])
+    index.put("a", older)
+    index.put("b", newer)
+    assert index.get("jee  main") is newer
+    assert index.get("JEE Main", 2024) is older
+
+    index.remove("b")
+    assert index.get("JEE Main") is older
+    index.remove("a")
+    assert index.get("JEE Main") is None
@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+from app.services.seat_allocation import (
+    ApplicantPool,
+    SeatMatrix,
+    deferred_acceptance,
+    expand_preferences,
+    program_ranks,
+    category_codes,
+    gender_codes,
+)
+
+
+def seat_matrix(branches: int, seed: int = 0) -> SeatMatrix:
+    rng = np.random.default_rng(seed)
+    entries = []
+    for branch in range(branches):
+        for category in ("general", "obc", "sc", "st", "ews"):
+            entries.append({"branch": branch, "category": category, "gender": "any", "seats": int(rng.integers(0, 4))})
+        entries.append({"branch": branch, "category": "general", "gender": "female", "seats": int(rng.integers(0, 2))})
+    return SeatMatrix([str(branch) for branch in range(branches)], ["college"] * branches, entries)
+
+
+def serial_dictatorship(pool: ApplicantPool, matrix: SeatMatrix) -> np.ndarray:
+    """
+    Every program ranks applicants by the same merit list, so the stable matching
+    is the one where applicants pick, best first, their first program with a seat left.
+    """
+    preferences = expand_preferences(pool, matrix)
+    capacity = matrix.capacity.copy()
+    allotted = np.full(pool.size, -1, dtype=np.int64)
+    for applicant in np.argsort(pool.merit):
+        for program in preferences["programs"][preferences["offsets"][applicant]:preferences["offsets"][applicant + 1]]:
+            if capacity[program]:
+                capacity[program] -= 1
+                allotted[applicant] = program
+                break
+    return allotted
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_matches_serial_dictatorship(seed):
+    matrix = seat_matrix(30, seed)
+    pool = ApplicantPool.synthetic(2000, 30, 6, seed=seed)
+    # Repeated ranks exercise the tie-break by pool order
+    rank = np.random.default_rng(seed).integers(1, 800, size=pool.size)
+    pool = ApplicantPool(rank, pool.category, pool.gender, pool.offsets, pool.branches)
+
+    allocation = deferred_acceptance(pool, matrix)
+    assert np.array_equal(allocation.program, serial_dictatorship(pool, matrix))
+
+    filled = np.bincount(allocation.program[allocation.program >= 0], minlength=matrix.size)
+    assert (filled <= matrix.capacity).all()
+
+
+def test_choice_is_the_position_of_the_allotted_branch():
+    matrix = seat_matrix(20, 1)
+    pool = ApplicantPool.synthetic(500, 20, 5, seed=1)
+    allocation = deferred_acceptance(pool, matrix)
+
+    allotted = np.flatnonzero(allocation.program >= 0)
+    assert allotted.size
+    for applicant in allotted:
+        branches = pool.branches[pool.offsets[applicant]:pool.offsets[applicant + 1]]
+        assert branches[allocation.choice[applicant]] == matrix.branch[allocation.program[applicant]]
+    assert (allocation.choice[allocation.program < 0] == -1).all()
+
+
+def test_reserved_seat_after_open_seats_fill():
+    matrix = SeatMatrix(["a", "b"], ["college", "college"], [
+        {"branch": 0, "category": "general", "gender": "any", "seats": 1},
+        {"branch": 0, "category": "obc", "gender": "any", "seats": 1},
+        {"branch": 1, "category": "general", "gender": "any", "seats": 2},
+    ])
+    pool = ApplicantPool.from_lists(
+        [1, 2, 3, 4],
+        category_codes(["general", "general", "obc", "obc"]),
+        gender_codes([None, None, None, None]),
+        [[0, 1], [0, 1], [0, 1], [0]]
+    )
+    allocation = deferred_acceptance(pool, matrix)
+    assert allocation.program.tolist() == [0, 2, 1, -1]
+    assert allocation.choice.tolist() == [0, 1, 0, -1]
+
+    ranks = program_ranks(pool, matrix, allocation)
+    assert ranks["filled"].tolist() == [1, 1, 1]
+    assert ranks["opening"].tolist() == [1, 3, 2]
+    assert ranks["closing"].tolist() == [1, 3, 2]